@@ -1,5 +1,6 @@
 import click
-from . import zoom, discourse, telegram, gcal, transcript
+from . import zoom, discourse, telegram, gcal, transcript, store, search_index
+from .transcript_archive import archive
 
 @click.group()
 def cli():
@@ -11,6 +12,10 @@ def cli():
       - send-telegram
       - create-calendar-event
       - publish-transcript
+      - index-transcript
+      - search
+      - speaker-report
+      - transcript-range
     """
     pass
 
@@ -99,5 +104,114 @@ def publish_transcript(meeting_id, category_id):
     topic_id = discourse_topic.get("topic_id")
     click.echo(f"Transcript posted to Discourse with topic_id={topic_id}")
 
+@cli.command()
+@click.option("--meeting-id", required=True, help="Zoom meeting ID (or recording instance UUID) to index")
+@click.option("--occurrence-id", default=None, help="Occurrence ID, for a meeting of a recurring series")
+def index_transcript(meeting_id, occurrence_id):
+    """
+    Add a past meeting's transcript and summary to the local search index.
+
+    Example usage:
+        python -m modules.cli index-transcript --meeting-id 123456789
+    """
+    recording_data = zoom.get_meeting_recording(meeting_id, raise_on_error=True)
+    summary_data = zoom.get_meeting_summary(meeting_uuid=recording_data.get("uuid", ""))
+    transcript_url = next(
+        (f["download_url"] for f in recording_data.get("recording_files", [])
+         if f.get("file_type") == "TRANSCRIPT"),
+        None
+    )
+    entry = store.get_meeting(meeting_id) or {}
+    transcript.index_transcript(
+        meeting_id,
+        transcript_url,
+        summary=transcript.format_summary(summary_data) if summary_data else None,
+        title=entry.get("issue_title") or recording_data.get("topic"),
+        start_time=recording_data.get("start_time"),
+        occurrence_id=occurrence_id
+    )
+
+@cli.command()
+@click.argument("query")
+@click.option("--limit", default=20, help="Maximum number of hits (default 20)")
+@click.option("--meeting-id", default=None, help="Only search this meeting")
+@click.option("--speaker", default=None, help="Only search what this speaker said")
+def search(query, limit, meeting_id, speaker):
+    """
+    Search indexed transcripts and summaries, best matches first.
+
+    Example usage:
+        python -m modules.cli search '"EIP-7702" AND delegation' --limit 10
+    """
+    hits = search_index.search(query, limit=limit, meeting_id=meeting_id, speaker=speaker)
+    if not hits:
+        click.echo("No matches.")
+        return
+    for hit in hits:
+        meeting = hit["meeting_id"] if not hit["occurrence_id"] else f"{hit['meeting_id']}/{hit['occurrence_id']}"
+        where = "summary" if hit["kind"] == "summary" else \
+            f"{search_index.format_timestamp(hit['start_ms'])} ({hit['start_ms']} ms)"
+        who = f" {hit['speaker']}:" if hit["speaker"] else ""
+        click.echo(f"{meeting} {where} [{hit['title'] or ''}]{who} {hit['snippet']}")
+
+@cli.command()
+@click.option("--meeting-id", default=None, help="Report a single meeting")
+@click.option("--since", default=None, help="Season start date (ISO 8601, inclusive)")
+@click.option("--until", default=None, help="Season end date (ISO 8601, exclusive)")
+def speaker_report(meeting_id, since, until):
+    """
+    Per-speaker talk time, turns and interruptions from the indexed transcripts,
+    for one meeting or summed over a season.
+
+    Example usage:
+        python -m modules.cli speaker-report --since 2025-01-01 --until 2026-01-01
+    """
+    from . import speaker_stats  # NumPy is only needed for this report
+
+    if meeting_id:
+        meetings = [m for m in search_index.indexed_meetings() if m["meeting_id"] == str(meeting_id)]
+    else:
+        meetings = search_index.indexed_meetings(since=since, until=until)
+    if not meetings:
+        click.echo("No indexed meetings found.")
+        return
+
+    cues = {}
+    for m in meetings:
+        key = m["meeting_id"] if not m["occurrence_id"] else f"{m['meeting_id']}/{m['occurrence_id']}"
+        if archive.has(m["meeting_id"], m["occurrence_id"]):
+            cues[key] = archive.load(m["meeting_id"], occurrence_id=m["occurrence_id"])
+        else:
+            cues[key] = search_index.load_cues(m["meeting_id"], occurrence_id=m["occurrence_id"])
+    stats = speaker_stats.compute(cues)
+
+    if meeting_id:
+        for m, key in zip(meetings, cues):
+            click.echo(f"{key} {m['start_time'] or ''} {m['title'] or ''}")
+            click.echo(speaker_stats.format_report(stats.meeting_report(key)))
+            click.echo("")
+    else:
+        click.echo(f"{len(meetings)} meetings")
+        click.echo(speaker_stats.format_report(stats.season_report()))
+
+@cli.command()
+@click.option("--meeting-id", required=True, help="Zoom meeting ID")
+@click.option("--occurrence-id", default=None, help="Occurrence ID, for a meeting of a recurring series")
+@click.option("--start-ms", default=0, help="Range start, in ms from the start of the recording")
+@click.option("--end-ms", default=2 ** 62, help="Range end (exclusive), in ms")
+def transcript_range(meeting_id, occurrence_id, start_ms, end_ms):
+    """
+    Print the archived transcript cues starting in a time range, e.g. around a search hit.
+
+    Example usage:
+        python -m modules.cli transcript-range --meeting-id 123456789 --start-ms 600000 --end-ms 720000
+    """
+    if not archive.has(meeting_id, occurrence_id):
+        click.echo(f"No archived transcript for meeting {meeting_id}", err=True)
+        return
+    for cue in archive.read_range(meeting_id, start_ms, end_ms, occurrence_id=occurrence_id):
+        who = f"{cue.speaker}: " if cue.speaker else ""
+        click.echo(f"{search_index.format_timestamp(cue.start_ms)} {who}{cue.text}")
+
 if __name__ == "__main__":
     cli()
@@ -1,6 +1,160 @@
 import os
+import re
 import json
-import requests
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from modules import http_client
+
+# Discourse's default admin API key limit is 60 requests per minute
+RATE_PER_MINUTE = float(os.environ.get("DISCOURSE_RATE_PER_MINUTE", "60"))
+RATE_BURST = int(os.environ.get("DISCOURSE_RATE_BURST", "10"))
+MAX_RATE_LIMIT_RETRIES = 5
+DEFAULT_RETRY_AFTER = 10
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. `rate` is in tokens per second; the rate can be
+    lowered at runtime when the server tells us we are going too fast, and it
+    slowly recovers towards its configured value afterwards. `clock` and
+    `sleep` can be swapped out, e.g. for a fake clock in tests.
+    """
+
+    def __init__(self, rate, capacity, clock=time.monotonic, sleep=time.sleep):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """
+        Takes a token, sleeping until one is available.
+
+        :return: Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                if now >= self._blocked_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = max(self._blocked_until - now, (1 - self._tokens) / self.rate)
+            self._sleep(delay)
+            waited += delay
+
+    def block(self, seconds):
+        """Pauses the bucket (Retry-After) and halves its rate."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens = 0.0
+            self._blocked_until = max(self._blocked_until, now + seconds)
+            self.rate = max(self.max_rate / 16, self.rate / 2)
+
+    def recover(self):
+        """Called after successful requests; creeps back to the configured rate."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+
+class RequestScheduler:
+    """
+    Sends every Discourse API call through a shared token bucket, since the
+    limit applies to the API key and not per endpoint. Writes are queued and
+    sent one at a time; reads are paced by the bucket and may run in
+    parallel. A 429 pauses the bucket for `Retry-After` seconds, lowers the
+    rate and retries the request.
+    """
+
+    def __init__(self, rate_per_minute=RATE_PER_MINUTE, burst=RATE_BURST, max_retries=MAX_RATE_LIMIT_RETRIES,
+                 bucket=None):
+        self.bucket = bucket or TokenBucket(rate_per_minute / 60.0, burst)
+        self.max_retries = max_retries
+        self._write_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._metrics = {"requests": 0, "queued": 0, "waited_ms": 0.0, "rate_limited": 0}
+
+    def metrics(self):
+        """Returns a copy of the counters: requests, queued, waited_ms, rate_limited (429s)."""
+        with self._metrics_lock:
+            return dict(self._metrics)
+
+    def _count(self, **deltas):
+        with self._metrics_lock:
+            for key, value in deltas.items():
+                self._metrics[key] += value
+
+    def request(self, method, url, **kwargs):
+        if method.upper() == "GET":
+            return self._send(method, url, **kwargs)
+        started = time.monotonic()
+        queued = not self._write_lock.acquire(blocking=False)
+        if queued:
+            self._write_lock.acquire()
+        try:
+            self._count(waited_ms=(time.monotonic() - started) * 1000)
+            return self._send(method, url, queued=queued, **kwargs)
+        finally:
+            self._write_lock.release()
+
+    def _send(self, method, url, queued=False, **kwargs):
+        for attempt in range(self.max_retries + 1):
+            waited = self.bucket.acquire()
+            queued = queued or waited > 0
+            self._count(requests=1, waited_ms=waited * 1000)
+            resp = http_client.request(method, url, **kwargs)
+            if resp.status_code != 429:
+                self.bucket.recover()
+                break
+            self._count(rate_limited=1)
+            if attempt == self.max_retries:
+                break
+            retry_after = _retry_after(resp)
+            print(f"Discourse rate limit hit on {method} {url}, retrying in {retry_after:.0f}s "
+                  f"(attempt {attempt + 1}/{self.max_retries})")
+            self.bucket.block(retry_after)
+        if queued:
+            self._count(queued=1)
+        return resp
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+
+def _retry_after(resp):
+    """Seconds to wait after a 429, from the Retry-After header or Discourse's `extras.wait_seconds`."""
+    value = resp.headers.get("Retry-After")
+    if value:
+        try:
+            return max(1.0, float(value))
+        except ValueError:
+            pass
+    try:
+        return max(1.0, float(resp.json()["extras"]["wait_seconds"]))
+    except (ValueError, KeyError, TypeError):
+        return DEFAULT_RETRY_AFTER
+
+
+scheduler = RequestScheduler()
 
 
 def create_topic(title: str, body: str, category_id=63):
@@ -22,7 +176,7 @@ def create_topic(title: str, body: str, category_id=63):
         "archetype": "regular"
     }
 
-    resp = requests.post(
+    resp = scheduler.post(
         f"{base_url}/posts.json",
         headers={
             "Api-Key": api_key,
@@ -38,24 +192,31 @@ def create_topic(title: str, body: str, category_id=63):
     return resp.json()
 
 
-def update_topic(topic_id: int, title: str = None, body: str = None, category_id: int = None):
+def update_topic(topic_id: int, title: str = None, body: str = None, category_id: int = None,
+                 first_post_id: int = None):
+    """
+    Updates a topic's title/category and/or the text of its first post.
+    The topic is only fetched when the body changes and `first_post_id` is
+    not already known; the returned dict carries it for the caller to cache.
+    """
     api_key = os.environ["DISCOURSE_API_KEY"]
     api_user = os.environ["DISCOURSE_API_USERNAME"]
     base_url = os.environ.get("DISCOURSE_BASE_URL", "https://ethereum-magicians.org")
 
     # 1. Fetch the topic details so we can retrieve the first post's ID.
-    resp_topic = requests.get(
-        f"{base_url}/t/{topic_id}.json",
-        headers={
-            "Api-Key": api_key,
-            "Api-Username": api_user
-        }
-    )
-    resp_topic.raise_for_status()
-    topic_json = resp_topic.json()
+    if body is not None and first_post_id is None:
+        resp_topic = scheduler.get(
+            f"{base_url}/t/{topic_id}.json",
+            headers={
+                "Api-Key": api_key,
+                "Api-Username": api_user
+            }
+        )
+        resp_topic.raise_for_status()
+        topic_json = resp_topic.json()
 
-    # The first post ID is usually the first object in the `post_stream["posts"]`.
-    first_post_id = topic_json["post_stream"]["posts"][0]["id"]
+        # The first post ID is usually the first object in the `post_stream["posts"]`.
+        first_post_id = topic_json["post_stream"]["posts"][0]["id"]
 
     # 2. If we have a new title or category, update the topic (PUT /t/<topic_id>.json).
     if title is not None or category_id is not None:
@@ -64,7 +225,7 @@ def update_topic(topic_id: int, title: str = None, body: str = None, category_id
             update_payload["title"] = title
         if category_id:
             update_payload["category_id"] = category_id
-        resp_update_topic = requests.put(
+        resp_update_topic = scheduler.put(
             f"{base_url}/t/{topic_id}.json",
             headers={
                 "Api-Key": api_key,
@@ -84,7 +245,7 @@ def update_topic(topic_id: int, title: str = None, body: str = None, category_id
                 "raw": body
             }
         }
-        resp_update_post = requests.put(
+        resp_update_post = scheduler.put(
             f"{base_url}/posts/{first_post_id}.json",
             headers={
                 "Api-Key": api_key,
@@ -97,7 +258,7 @@ def update_topic(topic_id: int, title: str = None, body: str = None, category_id
             print(resp_update_post.text)
             resp_update_post.raise_for_status()
 
-    return {"topic_id": topic_id, "updated_title": title, "updated_body": body}
+    return {"topic_id": topic_id, "updated_title": title, "updated_body": body, "first_post_id": first_post_id}
 
 
 def create_post(topic_id: int, body: str):
@@ -113,7 +274,7 @@ def create_post(topic_id: int, body: str):
         "raw": body
     }
 
-    resp = requests.post(
+    resp = scheduler.post(
         f"{base_url}/posts.json",
         headers={
             "Api-Key": api_key,
@@ -129,38 +290,153 @@ def create_post(topic_id: int, body: str):
     return resp.json()
 
 
-def get_posts_in_topic(topic_id: int):
+POSTS_BATCH_SIZE = 20
+POSTS_FETCH_WORKERS = 4
+
+
+class TopicCache:
     """
-    Retrieves all posts in a Discourse topic.
+    Cache of topic GET responses keyed by URL and query, revalidated with the
+    ETag / Last-Modified validators Discourse returns: a 304 reuses the stored
+    JSON instead of downloading it again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get_json(self, url, headers, params=None):
+        key = (url, tuple(params or ()))
+        with self._lock:
+            entry = self._entries.get(key)
+        headers = dict(headers)
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        resp = scheduler.get(url, headers=headers, params=params)
+        if resp.status_code == 304 and entry is not None:
+            return entry["data"]
+        if not resp.ok:
+            print(resp.text)
+            resp.raise_for_status()
+
+        data = resp.json()
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if etag or last_modified:
+            with self._lock:
+                self._entries[key] = {"etag": etag, "last_modified": last_modified, "data": data}
+        return data
+
+
+topic_cache = TopicCache()
+
+
+def iter_topic_posts(topic_id: int, batch_size: int = POSTS_BATCH_SIZE, workers: int = POSTS_FETCH_WORKERS):
+    """
+    Yields every post of a Discourse topic, in stream order.
+
+    `/t/{id}.json` only embeds the first ~20 posts together with the full
+    `post_stream.stream` of post IDs; the rest is fetched in batches from
+    `/t/{id}/posts.json?post_ids[]=...`, at most `workers` batches ahead of
+    the consumer. Posts are yielded lazily, so callers that stop early never
+    fetch the remaining batches.
     """
     api_key = os.environ["DISCOURSE_API_KEY"]
     api_user = os.environ["DISCOURSE_API_USERNAME"]
     base_url = os.environ.get("DISCOURSE_BASE_URL", "https://ethereum-magicians.org")
+    headers = {
+        "Api-Key": api_key,
+        "Api-Username": api_user,
+    }
+
+    topic = topic_cache.get_json(f"{base_url}/t/{topic_id}.json", headers)
+    post_stream = topic.get("post_stream", {})
+    loaded = post_stream.get("posts", [])
+    stream = post_stream.get("stream") or [post["id"] for post in loaded]
+
+    loaded_by_id = {post["id"]: post for post in loaded}
+    position = 0
+    while position < len(stream) and stream[position] in loaded_by_id:
+        yield loaded_by_id[stream[position]]
+        position += 1
+
+    remaining = stream[position:]
+    if not remaining:
+        return
+    batches = [remaining[i:i + batch_size] for i in range(0, len(remaining), batch_size)]
+
+    def fetch_batch(post_ids):
+        data = topic_cache.get_json(
+            f"{base_url}/t/{topic_id}/posts.json",
+            headers,
+            params=[("post_ids[]", post_id) for post_id in post_ids],
+        )
+        by_id = {post["id"]: post for post in data.get("post_stream", {}).get("posts", [])}
+        # Deleted or hidden posts are simply missing from the response
+        return [by_id[post_id] for post_id in post_ids if post_id in by_id]
+
+    executor = ThreadPoolExecutor(max_workers=max(1, workers))
+    pending = deque()
+    try:
+        next_batch = 0
+        while next_batch < len(batches) and len(pending) < max(1, workers):
+            pending.append(executor.submit(fetch_batch, batches[next_batch]))
+            next_batch += 1
+        while pending:
+            posts = pending.popleft().result()
+            if next_batch < len(batches):
+                pending.append(executor.submit(fetch_batch, batches[next_batch]))
+                next_batch += 1
+            yield from posts
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def get_posts_in_topic(topic_id: int):
+    """
+    Retrieves all posts in a Discourse topic.
+    """
+    return list(iter_topic_posts(topic_id))
+
+
+def transcript_marker(meeting_id, occurrence_id=None) -> str:
+    """
+    Line embedded in every transcript post. It is plain text so it reads the
+    same in the post's `raw` and `cooked` forms. Occurrences of a recurring
+    meeting share the meeting ID, so their marker also names the occurrence.
+    """
+    if occurrence_id is not None:
+        return f"Zoom Meeting ID: {meeting_id}, occurrence {occurrence_id}"
+    return f"Zoom Meeting ID: {meeting_id}"
 
-    resp = requests.get(
-        f"{base_url}/t/{topic_id}/posts.json",
-        headers={
-            "Api-Key": api_key,
-            "Api-Username": api_user,
-        },
-    )
-    if not resp.ok:
-        print(resp.text)
-        resp.raise_for_status()
 
-    return resp.json().get("post_stream", {}).get("posts", [])
+def find_transcript_post(topic_id: int, meeting_id: str, occurrence_id=None):
+    """
+    Scans a topic for the bot's transcript post of `meeting_id` (or one of
+    its occurrences) and returns it, or None. Stops at the first match.
+    """
+    # Don't let meeting 123 match the marker of meeting 1234, nor a meeting's
+    # marker match the ", occurrence ..." marker of one of its occurrences
+    marker = re.compile(re.escape(transcript_marker(meeting_id, occurrence_id)) + r"(?![\d,])")
+    for post in iter_topic_posts(topic_id):
+        if post.get("post_number") == 1:
+            continue  # the agenda copied from the issue
+        if marker.search(post.get("cooked", "")) or marker.search(post.get("raw", "")):
+            return post
+    return None
 
 
 def check_if_transcript_posted(topic_id: int, meeting_id: str):
     """
     Checks if the transcript for the given meeting_id has already been posted.
     """
-    posts = get_posts_in_topic(topic_id)
-    marker = f"transcript-{meeting_id}.txt"
-    for post in posts:
-        if marker in post.get("cooked", "") or marker in post.get("raw", ""):
-            return True
-    return False
+    return find_transcript_post(topic_id, meeting_id) is not None
 
 
 def upload_file(file_content: str, file_name: str):
@@ -173,7 +449,7 @@ def upload_file(file_content: str, file_name: str):
 
     files = {'file': (file_name, file_content, 'text/plain')}
     
-    resp = requests.post(
+    resp = scheduler.post(
         f"{base_url}/uploads.json",
         headers={
             "Api-Key": api_key,
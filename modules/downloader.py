@@ -0,0 +1,153 @@
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from modules import http_client
+
+SEGMENTS = 4
+# Files smaller than this are fetched by the probe request alone
+MIN_SEGMENT_SIZE = 8 * 1024 * 1024
+CHUNK_SIZE = 1024 * 1024
+SEGMENT_RETRIES = 3
+
+_CONTENT_RANGE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)")
+
+
+class RangeNotSatisfied(Exception):
+    """The server answered a ranged request with something other than 206."""
+
+
+if hasattr(os, "pwrite"):
+    def _write_at(fd, data, offset, lock):
+        while data:
+            written = os.pwrite(fd, data, offset)
+            data = data[written:]
+            offset += written
+else:  # pragma: no cover - platforms without positional writes
+    def _write_at(fd, data, offset, lock):
+        with lock:
+            os.lseek(fd, offset, os.SEEK_SET)
+            os.write(fd, data)
+
+
+def download_file(url, dest_path, headers=None, segments=SEGMENTS,
+                  min_segment_size=MIN_SEGMENT_SIZE, retries=SEGMENT_RETRIES):
+    """
+    Downloads `url` to `dest_path`, in parallel ranges when the server allows.
+
+    The first request asks for the first `min_segment_size` bytes. A 206 reply
+    reveals the total size; the file is preallocated and the remainder is split
+    into `segments` ranges fetched concurrently and written in place with
+    positional writes. Each range is retried on its own, resuming from the
+    last byte written. A 200 reply means ranges are unsupported and the body
+    is simply streamed to disk; so does a 416 to the probe, or a range
+    answered with anything but a 206, after which the whole file is fetched
+    again in a single stream.
+
+    :return: dest_path
+    """
+    headers = dict(headers or {})
+    headers.pop("Content-Type", None)
+    lock = threading.Lock()
+
+    probe_headers = dict(headers, Range=f"bytes=0-{min_segment_size - 1}")
+    with http_client.get(url, headers=probe_headers, stream=True) as response:
+        # 416: the server rejects the range (e.g. an empty file has no byte 0)
+        range_rejected = response.status_code == 416
+        if not range_rejected:
+            response.raise_for_status()
+            match = _CONTENT_RANGE.match(response.headers.get("Content-Range", ""))
+            if response.status_code != 206 or not match or match.group(3) == "*":
+                print("Server does not support ranged downloads, using a single stream")
+                _write_stream(response, dest_path)
+                return dest_path
+
+            total_size = int(match.group(3))
+            fd = os.open(dest_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.ftruncate(fd, total_size)
+                offset = 0
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    if chunk:
+                        _write_at(fd, chunk, offset, lock)
+                        offset += len(chunk)
+            except Exception:
+                os.close(fd)
+                raise
+    if range_rejected:
+        print("Server rejected the ranged request, using a single stream")
+        return _download_single(url, headers, dest_path)
+
+    try:
+        if offset < total_size:
+            ranges = _split(offset, total_size, segments)
+            print(f"Downloading {total_size} bytes in {len(ranges) + 1} ranges")
+            with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+                futures = [
+                    executor.submit(_fetch_range, url, headers, fd, start, end, retries, lock)
+                    for start, end in ranges
+                ]
+                for future in futures:
+                    future.result()
+    except RangeNotSatisfied as e:
+        print(f"{e}, downloading with a single stream instead")
+        os.close(fd)
+        return _download_single(url, headers, dest_path)
+    except BaseException:
+        os.close(fd)
+        raise
+    os.close(fd)
+    return dest_path
+
+
+def _write_stream(response, dest_path):
+    with open(dest_path, "wb") as f:
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            if chunk:
+                f.write(chunk)
+
+
+def _download_single(url, headers, dest_path):
+    with http_client.get(url, headers=headers, stream=True) as response:
+        response.raise_for_status()
+        _write_stream(response, dest_path)
+    return dest_path
+
+
+def _split(start, total_size, segments):
+    """Splits [start, total_size) into at most `segments` inclusive ranges."""
+    remaining = total_size - start
+    segment_size = -(-remaining // max(1, segments))
+    return [
+        (offset, min(offset + segment_size, total_size) - 1)
+        for offset in range(start, total_size, segment_size)
+    ]
+
+
+def _fetch_range(url, headers, fd, start, end, retries, lock):
+    position = start
+    attempt = 0
+    while position <= end:
+        try:
+            range_headers = dict(headers, Range=f"bytes={position}-{end}")
+            with http_client.get(url, headers=range_headers, stream=True) as response:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    raise RangeNotSatisfied(f"Expected 206 for bytes {position}-{end}, got {response.status_code}")
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    if chunk:
+                        chunk = chunk[:end - position + 1]
+                        _write_at(fd, chunk, position, lock)
+                        position += len(chunk)
+            if position <= end:
+                raise IOError(f"Range {start}-{end} ended early at byte {position}")
+        except RangeNotSatisfied:
+            raise
+        except Exception as e:
+            attempt += 1
+            if attempt > retries:
+                raise
+            print(f"Retrying range {position}-{end} after error: {e}")
+            time.sleep(2 ** attempt)
@@ -4,16 +4,17 @@ from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from datetime import datetime, timedelta
 import base64
+import threading
 import pytz
 
 SCOPES = ['https://www.googleapis.com/auth/calendar']
+# Requests per BatchHttpRequest (the Calendar API's recommended maximum)
+BATCH_SIZE = 50
 
-def create_event(summary: str, start_dt, duration_minutes: int, calendar_id: str, description=""):
-    """
-    Creates a Google Calendar event using the Google Calendar API.
-    Handles both datetime objects and ISO format strings for start_dt.
-    """
+_service = None
+_service_lock = threading.Lock()
 
+def _to_utc_datetime(start_dt):
     # Convert start_dt to datetime object if it's a string
     if isinstance(start_dt, str):
         start_dt = datetime.fromisoformat(start_dt.replace('Z', '+00:00'))
@@ -23,25 +24,152 @@ def create_event(summary: str, start_dt, duration_minutes: int, calendar_id: str
     # Ensure timezone awareness
     if not start_dt.tzinfo:
         start_dt = start_dt.replace(tzinfo=pytz.utc)
+    return start_dt
+
+
+def _get_service():
+    """
+    Returns the calendar service, built on first use. The discovery document
+    ships with google-api-python-client (static discovery), so building it
+    needs no network round trip.
+    """
+    global _service
+    with _service_lock:
+        if _service is None:
+            # Load service account info from environment variable
+            service_account_info = json.loads(os.environ['GCAL_SERVICE_ACCOUNT_KEY'])
+            credentials = service_account.Credentials.from_service_account_info(
+                service_account_info, scopes=SCOPES)
+
+            _service = build('calendar', 'v3', credentials=credentials,
+                             static_discovery=True, cache_discovery=False)
+        return _service
+
+
+def rrule(recurrence) -> str:
+    """RFC 5545 rule for a parsed recurrence spec (see issue_parser.parse_recurrence)."""
+    return (
+        f"RRULE:FREQ={recurrence['frequency'].upper()};"
+        f"INTERVAL={recurrence['interval']};COUNT={recurrence['count']}"
+    )
+
+
+def _event_body(summary, start_dt, duration_minutes, description=None, recurrence=None):
+    start_dt = _to_utc_datetime(start_dt)
     
     # Calculate end time using datetime math
     end_dt = start_dt + timedelta(minutes=duration_minutes)
     
     # Format for Google Calendar API
     event_body = {
-        'summary': summary,
-        'description': description,
         'start': {'dateTime': start_dt.isoformat()},
         'end': {'dateTime': end_dt.isoformat()},
     }
+    if summary is not None:
+        event_body['summary'] = summary
+    if description is not None:
+        event_body['description'] = description
+    if recurrence:
+        # Recurring events need an explicit time zone to expand the rule
+        event_body['start']['timeZone'] = 'UTC'
+        event_body['end']['timeZone'] = 'UTC'
+        event_body['recurrence'] = [rrule(recurrence)]
+    return event_body
+
+
+def _patch_body(summary=None, start_dt=None, duration_minutes=None, description=None, recurrence=None,
+                clear_recurrence=False):
+    if start_dt is None:
+        event_body = {}
+        if summary is not None:
+            event_body['summary'] = summary
+        if description is not None:
+            event_body['description'] = description
+    elif duration_minutes is None:
+        raise ValueError("duration_minutes is required when moving an event")
+    else:
+        event_body = _event_body(summary, start_dt, duration_minutes, description, recurrence)
+    if clear_recurrence and not recurrence:
+        # An omitted key keeps the old rule; an empty list removes it
+        event_body['recurrence'] = []
+    return event_body
+
+
+def insert_event(summary: str, start_dt, duration_minutes: int, calendar_id: str, description="",
+                 recurrence=None):
+    """
+    Creates a Google Calendar event and returns the full event resource
+    (its `id` is needed to update the event later). With `recurrence`, a
+    single recurring event is created for the whole series.
+    Handles both datetime objects and ISO format strings for start_dt.
+    """
+    event_body = _event_body(summary, start_dt, duration_minutes, description, recurrence)
 
-    # Load service account info from environment variable
-    service_account_info = json.loads(os.environ['GCAL_SERVICE_ACCOUNT_KEY'])
-    credentials = service_account.Credentials.from_service_account_info(
-        service_account_info, scopes=SCOPES)
+    service = _get_service()
+    return service.events().insert(calendarId=calendar_id, body=event_body).execute()
 
-    service = build('calendar', 'v3', credentials=credentials)
 
-    event = service.events().insert(calendarId=calendar_id, body=event_body).execute()
+def create_event(summary: str, start_dt, duration_minutes: int, calendar_id: str, description=""):
+    """
+    Creates a Google Calendar event using the Google Calendar API.
+    Handles both datetime objects and ISO format strings for start_dt.
+    """
+    event = insert_event(summary, start_dt, duration_minutes, calendar_id, description=description)
 
     return event.get('htmlLink')
+
+
+def update_event(event_id: str, calendar_id: str, summary: str = None, start_dt=None,
+                 duration_minutes: int = None, description: str = None, recurrence=None,
+                 clear_recurrence=False):
+    """
+    Patches an existing event; only the given fields are sent. Moving the
+    event requires both `start_dt` and `duration_minutes`. `clear_recurrence`
+    turns a recurring event back into a single one.
+    Returns the updated event resource.
+    """
+    event_body = _patch_body(summary, start_dt, duration_minutes, description, recurrence,
+                             clear_recurrence=clear_recurrence)
+
+    service = _get_service()
+    return service.events().patch(calendarId=calendar_id, eventId=event_id, body=event_body).execute()
+
+
+def batch_upsert_events(events, calendar_id: str, batch_size: int = BATCH_SIZE):
+    """
+    Creates or updates many events with one BatchHttpRequest per `batch_size`
+    events, e.g. to backfill a season of calls.
+
+    Each item of `events` is a dict with `summary`, `start_dt`,
+    `duration_minutes` and optionally `description` and `recurrence`; items with an
+    `event_id` patch that event instead of creating one.
+
+    :return: A list aligned with `events` holding the event resource, or the
+             HttpError raised for that event
+    """
+    service = _get_service()
+    results = [None] * len(events)
+
+    def callback(request_id, response, exception):
+        results[int(request_id)] = exception if exception is not None else response
+
+    for offset in range(0, len(events), batch_size):
+        batch = service.new_batch_http_request(callback=callback)
+        for index in range(offset, min(offset + batch_size, len(events))):
+            event = events[index]
+            if event.get('event_id'):
+                body = _patch_body(event.get('summary'), event.get('start_dt'),
+                                   event.get('duration_minutes'), event.get('description'),
+                                   event.get('recurrence'))
+                request = service.events().patch(calendarId=calendar_id, eventId=event['event_id'], body=body)
+            else:
+                body = _event_body(event['summary'], event['start_dt'], event['duration_minutes'],
+                                   event.get('description', ""), event.get('recurrence'))
+                request = service.events().insert(calendarId=calendar_id, body=body)
+            batch.add(request, request_id=str(index))
+        batch.execute()
+
+    failed = sum(1 for result in results if isinstance(result, Exception))
+    if failed:
+        print(f"{failed} of {len(events)} calendar event operations failed")
+    return results
@@ -0,0 +1,135 @@
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) timeout in seconds applied when a caller doesn't pass one
+DEFAULT_TIMEOUT = (10, 60)
+
+# Connection pool tuning. Each host gets its own session, so pool_maxsize is
+# the number of keep-alive connections kept open towards that host.
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 16
+
+# Transient failures retried by urllib3. POST is deliberately not retried as
+# the integrations' POSTs (topics, posts, messages, casts) are not idempotent.
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.5
+RETRY_STATUS_FORCELIST = (500, 502, 503, 504)
+
+
+class TimeoutSession(requests.Session):
+    """
+    requests.Session that applies a default timeout to every request.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+# Optional per-host caps on in-flight requests, see set_host_concurrency()
+_host_limits = {}
+
+
+def _host_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def build_session(timeout=DEFAULT_TIMEOUT, pool_connections=POOL_CONNECTIONS,
+                  pool_maxsize=POOL_MAXSIZE, retries=RETRY_TOTAL):
+    """
+    Creates a session with a tuned connection pool and retry adapter.
+    """
+    session = TimeoutSession(timeout=timeout)
+    retry = Retry(
+        total=retries,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUS_FORCELIST,
+        respect_retry_after_header=True,
+        raise_on_status=False,  # let callers inspect the final response
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session(url: str) -> requests.Session:
+    """
+    Returns the shared session for the host of `url`, creating it on first use.
+    Sessions are thread-safe for the way the bot uses them (independent
+    requests without shared cookie state).
+    """
+    key = _host_key(url)
+    session = _sessions.get(key)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = build_session()
+                _sessions[key] = session
+    return session
+
+
+def set_host_concurrency(url: str, limit):
+    """
+    Caps the number of concurrent requests towards the host of `url`.
+    Threads above the cap block until a slot frees up. Pass None to remove it.
+    """
+    key = _host_key(url)
+    with _sessions_lock:
+        if limit:
+            _host_limits[key] = threading.BoundedSemaphore(limit)
+        else:
+            _host_limits.pop(key, None)
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    limiter = _host_limits.get(_host_key(url))
+    if limiter is None:
+        return get_session(url).request(method, url, **kwargs)
+    with limiter:
+        return get_session(url).request(method, url, **kwargs)
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+
+def put(url: str, **kwargs) -> requests.Response:
+    return request("PUT", url, **kwargs)
+
+
+def patch(url: str, **kwargs) -> requests.Response:
+    return request("PATCH", url, **kwargs)
+
+
+def delete(url: str, **kwargs) -> requests.Response:
+    return request("DELETE", url, **kwargs)
+
+
+def close_all():
+    """Closes every pooled session (mainly useful for tests and benchmarks)."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
@@ -0,0 +1,207 @@
+import re
+import functools
+from datetime import datetime
+
+# A range whose end is earlier than its start is read as crossing midnight,
+# but only up to this length; anything longer is most likely a typo.
+MAX_MIDNIGHT_RANGE_MINUTES = 12 * 60
+
+PARSE_CACHE_SIZE = 256
+
+MONTHS = {
+    "jan": 1, "january": 1,
+    "feb": 2, "february": 2,
+    "mar": 3, "march": 3,
+    "apr": 4, "april": 4,
+    "may": 5,
+    "jun": 6, "june": 6,
+    "jul": 7, "july": 7,
+    "aug": 8, "august": 8,
+    "sep": 9, "sept": 9, "september": 9,
+    "oct": 10, "october": 10,
+    "nov": 11, "november": 11,
+    "dec": 12, "december": 12,
+}
+
+_WEEKDAY = r"(?:mon|tue|wed|thu|fri|sat|sun)[a-z]*\.?,?"
+
+# Date/time in one of the accepted shapes:
+#   - textual: `[Wed Jan 16, 2025, 14:00-15:30 UTC]`
+#   - ISO:     `2025-01-16T14:00Z`, `2025-01-16 14:00-15:30 UTC`
+_DATETIME_RE = re.compile(
+    rf"""
+    (?P<textual>
+        \[?\b                                      # Optional opening bracket
+        (?:{_WEEKDAY}\s+)?                         # Optional day of the week
+        (?P<month>[a-z]{{3,9}})\.?\s+              # Month name, checked against MONTHS
+        (?P<day>\d{{1,2}}),?\s+                    # Day of the month, comma optional
+        (?P<year>\d{{4}}),?\s+                     # Year, comma optional
+        (?P<hour>\d{{1,2}}):(?P<minute>\d{{2}})    # Start time HH:MM
+        (?:\s*-\s*(?P<end_hour>\d{{1,2}}):(?P<end_minute>\d{{2}}))?  # Optional end time HH:MM
+        \s*UTC                                     # UTC timezone
+        \]?                                        # Optional closing bracket
+    )
+    |
+    (?P<iso>
+        \b(?P<iso_year>\d{{4}})-(?P<iso_month>\d{{2}})-(?P<iso_day>\d{{2}})
+        [T\ ]
+        (?P<iso_hour>\d{{2}}):(?P<iso_minute>\d{{2}})(?::\d{{2}}(?:\.\d+)?)?
+        (?:\s*-\s*(?P<iso_end_hour>\d{{1,2}}):(?P<iso_end_minute>\d{{2}}))?
+        (?:Z|\+00:?00|\s*UTC)
+    )
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+# Cheap pre-check: a line can only hold a date/time if it has an HH:MM
+_TIME_HINT_RE = re.compile(r"\d:\d\d")
+
+# Duration at the start of a line (or right after the date/time), e.g.
+# `- Duration in minutes 90` or `- 90`
+_DURATION_RE = re.compile(
+    r"""
+    [ \t\-]*                                       # Optional spaces/dashes at the start
+    (?:Duration\s+in\s+minutes\s*)?                # Optional 'Duration in minutes'
+    [ \t\-]*                                       # Optional spaces/dashes
+    (\d+)                                          # The duration number
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+
+# Recurring series, e.g. `- Recurrence: every 2 weeks, 6 occurrences`.
+# The number of occurrences is required so prose like "calls happen every
+# week" is not mistaken for a series.
+_RECURRENCE_RE = re.compile(
+    r"""
+    \bevery\s+
+    (?:(?P<interval>\d{1,2})\s+)?                   # Optional interval, defaults to 1
+    (?P<unit>day|week|month)s?                     # Unit
+    \s*[,;]?\s*(?:for\s+)?
+    (?P<count>\d{1,3})\s+                           # Number of meetings in the series
+    (?:occurrences?|times|meetings|calls|sessions)\b
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+RECURRENCE_FREQUENCIES = {"day": "daily", "week": "weekly", "month": "monthly"}
+MAX_OCCURRENCES = 60  # Zoom's limit for `end_times`
+
+
+def parse_recurrence(issue_body: str):
+    """
+    Looks for a recurrence spec such as "every 2 weeks, 6 occurrences".
+
+    :return: {"frequency": "daily"|"weekly"|"monthly", "interval": int,
+              "count": int}, or None for a single meeting
+    """
+    match = _RECURRENCE_RE.search(issue_body)
+    if not match:
+        return None
+    interval = int(match.group("interval") or 1)
+    count = int(match.group("count"))
+    if interval < 1 or not 1 < count <= MAX_OCCURRENCES:
+        raise ValueError(f"Invalid recurrence: {match.group(0)!r} (2 to {MAX_OCCURRENCES} occurrences)")
+    return {
+        "frequency": RECURRENCE_FREQUENCIES[match.group("unit").lower()],
+        "interval": interval,
+        "count": count,
+    }
+
+
+def parse_issue_for_time(issue_body: str):
+    """
+    Parses the issue body to extract a start time and duration based on possible formats:
+
+    - Date/time line followed by a duration line (with or without "Duration in minutes" preceding it)
+    - Date/time with a start-end range, possibly crossing midnight
+    - Accepts both abbreviated and full month names, with an optional weekday
+    - ISO 8601 date/times in UTC (`2025-01-16T14:00:00Z`)
+
+    Results (including errors) are memoized per body.
+
+    :return: (start time as "YYYY-MM-DDTHH:MM:SSZ", duration in minutes)
+    """
+    result, error = _parse(issue_body)
+    if error is not None:
+        raise ValueError(error)
+    return result
+
+
+def clear_cache():
+    _parse.cache_clear()
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse(issue_body: str):
+    try:
+        return _parse_uncached(issue_body), None
+    except ValueError as e:
+        return None, str(e)
+
+
+def _parse_uncached(issue_body: str):
+    # Single pass over the lines: find the date/time, then the first duration after it
+    date_match = None
+    start_time_utc = None
+    for line in issue_body.splitlines():
+        if date_match is None:
+            if not _TIME_HINT_RE.search(line):
+                continue
+            for candidate in _DATETIME_RE.finditer(line):
+                if candidate.lastgroup == "iso" or candidate.group("month").lower() in MONTHS:
+                    date_match = candidate
+                    break
+            else:
+                continue
+
+            start_dt, end_time = _token_datetime(date_match)
+            start_time_utc = start_dt.isoformat() + "Z"
+            if end_time is not None:
+                return start_time_utc, _range_minutes(start_dt, end_time)
+            # Duration on the same line, right after the date/time
+            line = line[date_match.end():]
+
+        duration_match = _DURATION_RE.match(line)
+        if duration_match:
+            return start_time_utc, int(duration_match.group(1))
+
+    if date_match is None:
+        raise ValueError("Missing or invalid date/time format.")
+    raise ValueError(
+        "Missing or invalid duration format. Provide duration in minutes after the date/time."
+    )
+
+
+def _range_minutes(start_dt, end_time):
+    end_dt = start_dt.replace(hour=end_time[0], minute=end_time[1])
+    duration_minutes = int((end_dt - start_dt).total_seconds() // 60)
+    if duration_minutes <= 0:
+        # Crossing midnight
+        duration_minutes += 24 * 60
+        if duration_minutes >= 24 * 60 or duration_minutes > MAX_MIDNIGHT_RANGE_MINUTES:
+            raise ValueError("End time must be after start time.")
+    return duration_minutes
+
+
+def _token_datetime(token):
+    """Returns (start datetime, (end hour, end minute) or None) of a date/time token."""
+    if token.lastgroup == "textual":
+        year, month, day = token.group("year"), MONTHS[token.group("month").lower()], token.group("day")
+        hour, minute = token.group("hour"), token.group("minute")
+        end_hour, end_minute = token.group("end_hour"), token.group("end_minute")
+    else:
+        year, month, day = token.group("iso_year"), token.group("iso_month"), token.group("iso_day")
+        hour, minute = token.group("iso_hour"), token.group("iso_minute")
+        end_hour, end_minute = token.group("iso_end_hour"), token.group("iso_end_minute")
+
+    try:
+        start_dt = datetime(int(year), int(month), int(day), int(hour), int(minute))
+    except ValueError as e:
+        raise ValueError(f"Unable to parse the start time: {e}")
+
+    if end_hour is None:
+        return start_dt, None
+    if int(end_hour) > 23 or int(end_minute) > 59:
+        raise ValueError(f"Unable to parse the end time: {end_hour}:{end_minute}")
+    return start_dt, (int(end_hour), int(end_minute))
@@ -0,0 +1,209 @@
+import os
+import json
+import atexit
+import hashlib
+import threading
+
+from github import Github, GithubException, InputGitAuthor, UnknownObjectException
+
+from modules import store
+
+COMMIT_MESSAGE = "Update meeting-topic mapping"
+MAX_ATTEMPTS = 5
+
+
+def git_blob_sha(content: bytes) -> str:
+    """SHA git (and the contents API) assigns to a blob with this content."""
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+_MISSING = object()
+
+
+def _as_entry(entry):
+    if entry is _MISSING or isinstance(entry, dict):
+        return entry
+    # Legacy format: bare topic ID
+    return {"discourse_topic_id": entry}
+
+
+def merge_entries(base, remote, local):
+    """
+    Three-way merge of one meeting's entry; any argument may be _MISSING.
+    Fields changed only remotely are taken from the remote, fields changed
+    locally (set, changed or cleared) from the local entry.
+    """
+    base, remote, local = (_as_entry(e) for e in (base, remote, local))
+    if local == base:
+        return remote
+    if remote == base:
+        return local
+    if local is _MISSING or remote is _MISSING:
+        # Deleted on one side, changed on the other: keep the changes
+        return remote if local is _MISSING else local
+    base = {} if base is _MISSING else base
+    merged = {}
+    for key in set(base) | set(remote) | set(local):
+        local_value = local.get(key, _MISSING)
+        value = remote.get(key, _MISSING) if local_value == base.get(key, _MISSING) else local_value
+        if value is not _MISSING:
+            merged[key] = value
+    return merged
+
+
+def merge_snapshots(base: dict, remote: dict, local: dict) -> dict:
+    """
+    Merges our mapping with the remote one, relative to the snapshot both
+    started from. Only what changed locally overrides the remote, so values
+    set concurrently by another workflow (e.g. a YouTube video ID or sync
+    hashes) survive, and fields or meetings cleared locally stay cleared.
+    """
+    merged = {}
+    for meeting_id in set(base) | set(remote) | set(local):
+        entry = merge_entries(
+            base.get(meeting_id, _MISSING),
+            remote.get(meeting_id, _MISSING),
+            local.get(meeting_id, _MISSING),
+        )
+        if entry is not _MISSING:
+            merged[meeting_id] = entry
+    return merged
+
+
+class MappingCommitter:
+    """
+    Coalesces every mapping change made during a run into a single commit.
+
+    Callers record changes with request_commit(); flush() (called explicitly
+    at the end of a script, and at exit as a safety net) exports the store
+    and commits it on top of the snapshot the run started from. Only when
+    the branch moved in the meantime (409/422) is the remote file fetched,
+    merged three-way with our changes and the commit retried.
+    """
+
+    def __init__(self, path=store.MAPPING_FILE, max_attempts=MAX_ATTEMPTS):
+        self.path = path
+        self.max_attempts = max_attempts
+        self._reasons = []
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._base = _MISSING
+
+    def request_commit(self, reason=None):
+        with self._lock:
+            self._capture_base()
+            self._dirty = True
+            if reason and reason not in self._reasons:
+                self._reasons.append(reason)
+
+    def _capture_base(self):
+        # The checked-out snapshot, read before this run exports over it
+        if self._base is not _MISSING:
+            return
+        self._base = None
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as f:
+                self._base = f.read()
+
+    def _message(self):
+        if not self._reasons:
+            return COMMIT_MESSAGE
+        return COMMIT_MESSAGE + "\n\n" + "\n".join(f"- {reason}" for reason in self._reasons)
+
+    def flush(self):
+        """
+        Commits the pending changes, if any.
+
+        :return: The commit SHA, or None when nothing was committed
+        """
+        with self._lock:
+            if not self._dirty:
+                return None
+            self._capture_base()
+            token = os.environ.get("GITHUB_TOKEN")
+            repo_name = os.environ.get("GITHUB_REPOSITORY")
+            if not token or not repo_name:
+                store.export_json(self.path)
+                print("GITHUB_TOKEN/GITHUB_REPOSITORY not set, mapping saved locally only.")
+                self._dirty = False
+                return None
+            repo = Github(token).get_repo(repo_name)
+            sha = self._commit(repo, os.environ.get("GITHUB_REF_NAME", "main"))
+            self._dirty = False
+            self._reasons = []
+            return sha
+
+    def _commit(self, repo, branch):
+        author = InputGitAuthor(
+            name="GitHub Actions Bot",
+            email="actions@github.com"
+        )
+        for attempt in range(1, self.max_attempts + 1):
+            store.export_json(self.path)
+            with open(self.path, "rb") as f:
+                content = f.read()
+            if content == self._base:
+                print(f"{self.path} is unchanged, skipping commit.")
+                return None
+
+            try:
+                if self._base is None:
+                    print(f"Creating new file {self.path} as it doesn't exist in repo")
+                    result = repo.create_file(
+                        path=self.path,
+                        message=self._message(),
+                        content=content.decode("utf-8"),
+                        branch=branch,
+                        author=author,
+                    )
+                else:
+                    # Fails with 409 when the branch no longer has our base snapshot
+                    result = repo.update_file(
+                        path=self.path,
+                        message=self._message(),
+                        content=content.decode("utf-8"),
+                        sha=git_blob_sha(self._base),
+                        branch=branch,
+                        author=author,
+                    )
+                self._base = content
+                print(f"Successfully updated {self.path} in repository. Commit SHA: {result['commit'].sha}")
+                return result["commit"].sha
+            except GithubException as e:
+                # 409: SHA no longer matches the branch head; 422: file created concurrently
+                if e.status not in (409, 422) or attempt == self.max_attempts:
+                    print(f"Failed to commit mapping file: {e}")
+                    raise
+                print(f"Mapping commit conflicted (attempt {attempt}), merging remote changes and retrying")
+                self._merge_remote(repo, branch, content)
+        return None
+
+    def _merge_remote(self, repo, branch, content):
+        """Folds the remote changes into the store and makes the remote file our new base."""
+        try:
+            remote = repo.get_contents(self.path, ref=branch).decoded_content
+        except UnknownObjectException:
+            remote = None
+        base_mapping = json.loads(self._base) if self._base else {}
+        remote_mapping = json.loads(remote) if remote else {}
+        local_mapping = json.loads(content)
+        merged = merge_snapshots(base_mapping, remote_mapping, local_mapping)
+        for meeting_id in set(local_mapping) - set(merged):
+            store.delete_meeting(meeting_id)
+        for meeting_id, entry in merged.items():
+            if entry != local_mapping.get(meeting_id):
+                store.replace_meeting(meeting_id, **store.normalize_entry(entry))
+        self._base = remote
+
+
+committer = MappingCommitter()
+atexit.register(committer.flush)
+
+
+def request_commit(reason=None):
+    """Marks the mapping as changed; the commit happens once, on flush()."""
+    committer.request_commit(reason)
+
+
+def flush():
+    return committer.flush()
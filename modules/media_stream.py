@@ -0,0 +1,181 @@
+import json
+import queue
+import threading
+
+from googleapiclient.http import MediaUpload
+
+from modules import http_client
+
+# Resumable upload chunks must be a multiple of 256 KiB (except the last one)
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# Number of downloaded chunks buffered ahead of the uploader
+BUFFER_CHUNKS = 8
+
+_EOF = object()
+
+
+class DownloadPipe:
+    """
+    Streams an HTTP download on a background thread into a bounded queue.
+
+    The producer blocks once `max_chunks` chunks are waiting, so memory stays
+    at a few chunk sizes no matter how large the file is. Errors raised by the
+    download are re-raised in the reading thread.
+    """
+
+    def __init__(self, url, headers=None, chunk_size=DOWNLOAD_CHUNK_SIZE,
+                 max_chunks=BUFFER_CHUNKS, start=0):
+        self.url = url
+        self.headers = dict(headers or {})
+        self.start = start
+        if start:
+            self.headers["Range"] = f"bytes={start}-"
+        self.chunk_size = chunk_size
+        self._queue = queue.Queue(maxsize=max_chunks)
+        self._pending = b""
+        self._done = False
+        self._error = None
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._produce, daemon=True)
+        self._thread.start()
+
+    def _put(self, item):
+        # Re-check periodically so close() can stop a blocked producer
+        while not self._closed.is_set():
+            try:
+                self._queue.put(item, timeout=1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self):
+        try:
+            with http_client.get(self.url, headers=self.headers, stream=True) as response:
+                response.raise_for_status()
+                # The server ignored the Range header: skip up to the start offset
+                to_skip = self.start if response.status_code == 200 else 0
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    if to_skip:
+                        dropped = min(to_skip, len(chunk))
+                        chunk = chunk[dropped:]
+                        to_skip -= dropped
+                    if chunk and not self._put(chunk):
+                        return
+            self._put(_EOF)
+        except Exception as e:
+            self._put(e)
+
+    def read(self, size):
+        """Returns up to `size` bytes; fewer only at end of stream."""
+        if self._error is not None:
+            # Never let a failed download look like a short (complete) file
+            raise self._error
+        parts = [self._pending]
+        available = len(self._pending)
+        while available < size and not self._done:
+            item = self._queue.get()
+            if item is _EOF:
+                self._done = True
+            elif isinstance(item, Exception):
+                self._done = True
+                self._error = item
+                raise item
+            else:
+                parts.append(item)
+                available += len(item)
+        data = b"".join(parts)
+        self._pending = data[size:]
+        return data[:size]
+
+    def close(self):
+        self._closed.set()
+
+
+class StreamingMediaUpload(MediaUpload):
+    """
+    Resumable MediaUpload fed from a forward-only reader such as DownloadPipe.
+
+    googleapiclient asks for bytes by absolute offset. The current chunk is
+    retained until the upload progresses past it, so a chunk the server only
+    partially acknowledged can be re-sent without rewinding the source.
+    """
+
+    def __init__(self, reader, size=None, mimetype="video/mp4",
+                 chunksize=UPLOAD_CHUNK_SIZE, start=0):
+        super().__init__()
+        self._reader = reader
+        self._size = size
+        self._mimetype = mimetype
+        self._chunksize = chunksize
+        self._window = b""
+        # Absolute offset of the first byte the reader will return
+        self._window_start = start
+
+    def chunksize(self):
+        return self._chunksize
+
+    def mimetype(self):
+        return self._mimetype
+
+    def size(self):
+        return self._size
+
+    def resumable(self):
+        return True
+
+    def has_stream(self):
+        return False
+
+    def getbytes(self, begin, length):
+        if begin < self._window_start:
+            raise ValueError(
+                f"Cannot rewind streaming upload to byte {begin}; "
+                f"oldest retained byte is {self._window_start}"
+            )
+        # Drop what the server has acknowledged, then top the window up
+        skip = begin - self._window_start
+        if skip > len(self._window):
+            # The server holds more than we have read (resumed upload)
+            remaining = skip - len(self._window)
+            while remaining:
+                dropped = self._reader.read(min(remaining, DOWNLOAD_CHUNK_SIZE))
+                if not dropped:
+                    break
+                remaining -= len(dropped)
+            self._window = b""
+        else:
+            self._window = self._window[skip:]
+        self._window_start = begin
+        missing = length - len(self._window)
+        if missing > 0:
+            self._window += self._reader.read(missing)
+        return self._window[:length]
+
+    def close(self):
+        if hasattr(self._reader, "close"):
+            self._reader.close()
+
+    def to_json(self):
+        # Like MediaFileUpload drops its file handle: the reader and the
+        # retained bytes stay behind, the offset and upload settings are kept
+        return self._to_json(strip=["_reader", "_window"])
+
+    @classmethod
+    def from_json(cls, s, reader):
+        """Restores an upload serialized with to_json(), reading from `reader`."""
+        d = json.loads(s)
+        return cls(reader, size=d["_size"], mimetype=d["_mimetype"],
+                   chunksize=d["_chunksize"], start=d["_window_start"])
+
+
+def zoom_to_upload(download_url, headers, size=None, mimetype="video/mp4",
+                   chunksize=UPLOAD_CHUNK_SIZE, start=0):
+    """
+    Builds a StreamingMediaUpload whose bytes come straight from a Zoom
+    download, so download and upload overlap and nothing is staged on disk.
+    `start` resumes the download (and the upload) at that byte offset.
+    """
+    pipe = DownloadPipe(download_url, headers=headers, start=start)
+    return StreamingMediaUpload(pipe, size=size, mimetype=mimetype, chunksize=chunksize, start=start)
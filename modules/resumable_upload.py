@@ -0,0 +1,161 @@
+import os
+import json
+import time
+import random
+import threading
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+UPLOAD_STATE_FILE = os.environ.get("YOUTUBE_UPLOAD_STATE_FILE", "youtube_upload_state.json")
+
+# Resumable upload chunks must be a multiple of 256 KiB (except the last one)
+CHUNK_ALIGNMENT = 256 * 1024
+DEFAULT_CHUNK_SIZE = 32 * 1024 * 1024
+
+RETRIABLE_STATUS_CODES = (500, 502, 503, 504)
+# OSError covers ConnectionError, socket timeouts and broken pipes
+RETRIABLE_EXCEPTIONS = (httplib2.HttpLib2Error, OSError)
+# The resumable session no longer exists server-side
+EXPIRED_STATUS_CODES = (404, 410)
+
+
+def align_chunk_size(chunk_size):
+    """Rounds a chunk size down to a multiple of 256 KiB (at least 256 KiB)."""
+    return max(CHUNK_ALIGNMENT, (chunk_size // CHUNK_ALIGNMENT) * CHUNK_ALIGNMENT)
+
+
+class UploadCheckpoint:
+    """
+    Persists resumable upload sessions in a local JSON state file.
+
+    Entries are keyed by meeting ID and hold the resumable session URI, the
+    last byte offset acknowledged by the server and the total size, so that a
+    rerun for the same meeting can continue where the previous one stopped.
+    """
+
+    def __init__(self, path=UPLOAD_STATE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _read_all(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable upload state file: {e}")
+            return {}
+
+    def _write_all(self, state):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def load(self, key):
+        with self._lock:
+            return self._read_all().get(str(key))
+
+    def save(self, key, resumable_uri, progress, size=None):
+        with self._lock:
+            state = self._read_all()
+            state[str(key)] = {
+                "resumable_uri": resumable_uri,
+                "progress": progress,
+                "size": size,
+                "updated_at": int(time.time()),
+            }
+            self._write_all(state)
+
+    def clear(self, key):
+        with self._lock:
+            state = self._read_all()
+            if state.pop(str(key), None) is not None:
+                self._write_all(state)
+
+
+def query_progress(request, size=None):
+    """
+    Asks the server how many bytes of a resumable upload session it holds,
+    with an empty PUT carrying `Content-Range: bytes */<size>`.
+
+    :return: (offset, body) where body is the API response when the upload
+             had already completed, else None
+    """
+    headers = {"Content-Range": f"bytes */{size if size is not None else '*'}", "Content-Length": "0"}
+    resp, content = request.http.request(request.resumable_uri, "PUT", headers=headers)
+    if resp.status in (200, 201):
+        return size, request.postproc(resp, content)
+    if resp.status != 308:
+        raise HttpError(resp, content, uri=request.resumable_uri)
+    # 308 Resume Incomplete; no Range header means nothing was received yet
+    received = resp.get("range")
+    return (int(received.split("-")[1]) + 1 if received else 0), None
+
+
+def execute_resumable(request, checkpoint=None, key=None, max_retries=8,
+                      base_delay=1.0, max_delay=64.0):
+    """
+    Drives a resumable googleapiclient request chunk by chunk.
+
+    Transient failures (5xx, connection errors) are retried with exponential
+    backoff and jitter; before each retry the server is asked how many bytes
+    it already has, so only the missing part is re-sent. After every chunk the
+    session URI and offset are written to `checkpoint` under `key`. If a
+    checkpoint exists when starting, the upload resumes at the offset the
+    server reports for its session.
+
+    :return: The API response body once the upload completes
+    """
+    size = request.resumable.size()
+    retries = 0
+    response = None
+    if checkpoint is not None:
+        state = checkpoint.load(key)
+        if state and state.get("resumable_uri") and state.get("size") == size:
+            print(f"Resuming upload for {key} at byte {state['progress']}")
+            request.resumable_uri = state["resumable_uri"]
+            try:
+                request.resumable_progress, response = query_progress(request, size)
+            except HttpError as e:
+                if e.resp.status in EXPIRED_STATUS_CODES:
+                    print(f"Resumable upload session for {key} expired; it will restart from scratch next run")
+                    checkpoint.clear(key)
+                raise
+    while response is None:
+        try:
+            status, response = request.next_chunk()
+            retries = 0
+            if status is not None:
+                if size:
+                    print(f"Uploaded {status.resumable_progress}/{size} bytes ({int(status.progress() * 100)}%)")
+                if checkpoint is not None:
+                    checkpoint.save(key, request.resumable_uri, request.resumable_progress, size)
+        except HttpError as e:
+            if e.resp.status in EXPIRED_STATUS_CODES and request.resumable_uri:
+                print(f"Resumable upload session for {key} expired; it will restart from scratch next run")
+                if checkpoint is not None:
+                    checkpoint.clear(key)
+                raise
+            if e.resp.status not in RETRIABLE_STATUS_CODES or retries >= max_retries:
+                raise
+            retries += 1
+            _backoff(retries, base_delay, max_delay, f"HTTP {e.resp.status}")
+        except RETRIABLE_EXCEPTIONS as e:
+            if retries >= max_retries:
+                raise
+            retries += 1
+            # next_chunk() asks the server for its offset before re-sending
+            _backoff(retries, base_delay, max_delay, repr(e))
+
+    if checkpoint is not None:
+        checkpoint.clear(key)
+    return response
+
+
+def _backoff(attempt, base_delay, max_delay, reason):
+    delay = min(max_delay, base_delay * (2 ** (attempt - 1))) * (0.5 + random.random() / 2)
+    print(f"Upload chunk failed ({reason}); retry {attempt} in {delay:.1f}s")
+    time.sleep(delay)
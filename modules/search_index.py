@@ -0,0 +1,226 @@
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from modules import vtt
+
+# Derived data: can be rebuilt from the transcript archive at any time
+DB_FILE = os.environ.get("ACDBOT_SEARCH_DB_FILE", "acdbot_search.db")
+
+# Rows per executemany() call while indexing a meeting
+INSERT_BATCH_SIZE = 500
+
+SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS documents USING fts5(
+    text,
+    speaker,
+    meeting_id UNINDEXED,
+    occurrence_id UNINDEXED,
+    kind UNINDEXED,
+    start_ms UNINDEXED,
+    end_ms UNINDEXED,
+    tokenize = 'porter unicode61'
+);
+CREATE TABLE IF NOT EXISTS indexed_meetings (
+    meeting_id TEXT NOT NULL,
+    occurrence_id TEXT NOT NULL DEFAULT '',
+    title TEXT,
+    start_time TEXT,
+    cue_count INTEGER NOT NULL DEFAULT 0,
+    indexed_at TEXT NOT NULL,
+    PRIMARY KEY (meeting_id, occurrence_id)
+);
+CREATE INDEX IF NOT EXISTS idx_indexed_start ON indexed_meetings(start_time);
+"""
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = set()
+
+
+def connect(db_file=None):
+    """Returns this thread's connection to the search index, creating the schema once."""
+    db_file = db_file or DB_FILE
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(db_file)
+    if conn is None:
+        conn = sqlite3.connect(db_file, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        connections[db_file] = conn
+    with _init_lock:
+        if db_file not in _initialized:
+            conn.executescript(SCHEMA)
+            _initialized.add(db_file)
+    return conn
+
+
+def close():
+    """Closes this thread's connections."""
+    for conn in getattr(_local, "connections", {}).values():
+        conn.close()
+    _local.connections = {}
+
+
+def is_indexed(meeting_id, occurrence_id=None, conn=None):
+    conn = conn or connect()
+    row = conn.execute(
+        "SELECT 1 FROM indexed_meetings WHERE meeting_id = ? AND occurrence_id = ?",
+        (str(meeting_id), _occurrence_key(occurrence_id)),
+    ).fetchone()
+    return row is not None
+
+
+def index_meeting(meeting_id, cues=(), summary=None, title=None, start_time=None, occurrence_id=None,
+                  conn=None):
+    """
+    Replaces the indexed documents of one meeting (or occurrence) in a single
+    transaction: one document per transcript cue (modules.vtt.Cue, consumed
+    as they stream in) plus one for the Zoom summary.
+
+    :return: Number of cues indexed
+    """
+    conn = conn or connect()
+    meeting_id, occurrence_key = str(meeting_id), _occurrence_key(occurrence_id)
+    count = 0
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute(
+            "DELETE FROM documents WHERE meeting_id = ? AND occurrence_id = ?",
+            (meeting_id, occurrence_key),
+        )
+        batch = []
+        for cue in cues:
+            batch.append((cue.text, cue.speaker or "", meeting_id, occurrence_key, "cue",
+                          cue.start_ms, cue.end_ms))
+            if len(batch) >= INSERT_BATCH_SIZE:
+                _insert(conn, batch)
+                count += len(batch)
+                batch = []
+        _insert(conn, batch)
+        count += len(batch)
+        if summary:
+            _insert(conn, [(summary, "", meeting_id, occurrence_key, "summary", 0, 0)])
+        conn.execute(
+            "INSERT OR REPLACE INTO indexed_meetings "
+            "(meeting_id, occurrence_id, title, start_time, cue_count, indexed_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (meeting_id, occurrence_key, title, start_time, count,
+             datetime.now(timezone.utc).isoformat(timespec="seconds")),
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return count
+
+
+def _insert(conn, rows):
+    if rows:
+        conn.executemany(
+            "INSERT INTO documents (text, speaker, meeting_id, occurrence_id, kind, start_ms, end_ms) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+
+def indexed_meetings(since=None, until=None, conn=None):
+    """
+    Indexed meetings ordered by start time, optionally limited to those
+    starting in [since, until) (ISO 8601 strings, compared as text).
+    """
+    conn = conn or connect()
+    sql, params = "SELECT * FROM indexed_meetings WHERE 1 = 1", []
+    if since:
+        sql += " AND start_time >= ?"
+        params.append(since)
+    if until:
+        sql += " AND start_time < ?"
+        params.append(until)
+    rows = conn.execute(sql + " ORDER BY start_time, meeting_id, occurrence_id", params)
+    return [
+        dict(row, occurrence_id=row["occurrence_id"] or None)
+        for row in rows
+    ]
+
+
+def load_cues(meeting_id, occurrence_id=None, conn=None):
+    """Returns the indexed cues of a meeting as a modules.vtt.CueArray, in time order."""
+    conn = conn or connect()
+    rows = conn.execute(
+        "SELECT start_ms, end_ms, speaker, text FROM documents "
+        "WHERE meeting_id = ? AND occurrence_id = ? AND kind = 'cue'",
+        (str(meeting_id), _occurrence_key(occurrence_id)),
+    ).fetchall()
+    rows.sort(key=lambda row: int(row["start_ms"]))
+    return vtt.CueArray(
+        vtt.Cue(int(row["start_ms"]), int(row["end_ms"]), row["speaker"] or None, row["text"])
+        for row in rows
+    )
+
+
+def search(query, limit=20, meeting_id=None, speaker=None, conn=None):
+    """
+    Full-text search over cues and summaries, best matches (BM25) first.
+
+    `query` uses FTS5 syntax ("EIP-7702" AND blobs, NEAR(...), prefix*); text
+    that is not valid FTS5 syntax is searched as plain words instead.
+
+    :return: [{"meeting_id", "occurrence_id", "title", "kind", "start_ms",
+               "speaker", "snippet", "score"}]
+    """
+    conn = conn or connect()
+    try:
+        return _search(conn, query, limit, meeting_id, speaker)
+    except sqlite3.OperationalError:
+        return _search(conn, _plain_query(query), limit, meeting_id, speaker)
+
+
+def _search(conn, match, limit, meeting_id, speaker):
+    sql = (
+        "SELECT d.meeting_id, d.occurrence_id, d.kind, d.start_ms, d.speaker, "
+        "snippet(documents, 0, '[', ']', '…', 12) AS snippet, bm25(documents) AS score, m.title "
+        "FROM documents d "
+        "LEFT JOIN indexed_meetings m ON m.meeting_id = d.meeting_id AND m.occurrence_id = d.occurrence_id "
+        "WHERE documents MATCH ?"
+    )
+    params = [match]
+    if meeting_id is not None:
+        sql += " AND d.meeting_id = ?"
+        params.append(str(meeting_id))
+    if speaker:
+        sql += " AND d.speaker = ?"
+        params.append(speaker)
+    sql += " ORDER BY score LIMIT ?"
+    params.append(int(limit))
+    return [
+        {
+            "meeting_id": row["meeting_id"],
+            "occurrence_id": row["occurrence_id"] or None,
+            "title": row["title"],
+            "kind": row["kind"],
+            "start_ms": int(row["start_ms"]),
+            "speaker": row["speaker"] or None,
+            "snippet": row["snippet"],
+            "score": row["score"],
+        }
+        for row in conn.execute(sql, params)
+    ]
+
+
+def _plain_query(query):
+    # Quote every word so punctuation (e.g. the dash in EIP-4844) is not read as syntax
+    words = re.findall(r"[^\s\"]+", query)
+    return " ".join(f'"{word}"' for word in words) or '""'
+
+
+def _occurrence_key(occurrence_id):
+    return "" if occurrence_id is None else str(occurrence_id)
+
+
+def format_timestamp(ms):
+    seconds = ms // 1000
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
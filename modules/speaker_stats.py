@@ -0,0 +1,141 @@
+import numpy as np
+
+
+class SpeakerStats:
+    """
+    Per-meeting, per-speaker aggregates for a set of meetings, as
+    (meetings x speakers) arrays:
+
+    - talk_ms: total duration of the speaker's cues
+    - turns: runs of consecutive cues by the same speaker
+    - interruptions: turns started before the previous speaker's cue ended
+    - interrupted: times the speaker's cue was cut into by someone else
+    """
+
+    def __init__(self, meeting_ids, speakers, talk_ms, turns, interruptions, interrupted):
+        self.meeting_ids = meeting_ids
+        self.speakers = speakers
+        self.talk_ms = talk_ms
+        self.turns = turns
+        self.interruptions = interruptions
+        self.interrupted = interrupted
+
+    def meeting_report(self, meeting_id):
+        """Report rows for one meeting, most talk time first."""
+        i = self.meeting_ids.index(meeting_id)
+        return _report(self.speakers, self.talk_ms[i], self.turns[i], self.interruptions[i], self.interrupted[i])
+
+    def season_report(self):
+        """Report rows summed over all meetings, with the number of meetings each speaker spoke in."""
+        rows = _report(self.speakers, self.talk_ms.sum(axis=0), self.turns.sum(axis=0),
+                       self.interruptions.sum(axis=0), self.interrupted.sum(axis=0))
+        meetings = dict(zip(self.speakers, (self.turns > 0).sum(axis=0).tolist()))
+        for row in rows:
+            row["meetings"] = meetings[row["speaker"]]
+        return rows
+
+
+def columns(cues):
+    """Zero-copy NumPy views of a modules.vtt.CueArray: (speaker codes, starts, ends)."""
+    return (
+        np.frombuffer(cues.speaker_codes, dtype=np.int32),
+        np.frombuffer(cues.starts, dtype=np.int64),
+        np.frombuffer(cues.ends, dtype=np.int64),
+    )
+
+
+def compute(meetings):
+    """
+    Computes SpeakerStats for {meeting_id: CueArray} in one vectorized pass:
+    every meeting's cues are concatenated into flat columns with speaker
+    names mapped to shared codes, and each aggregate is a single bincount
+    over (meeting, speaker) cells. Cues without a speaker are ignored.
+    """
+    meeting_ids = list(meetings)
+    speakers, speaker_index = [], {}
+    codes, starts, ends, meeting_of = [], [], [], []
+    for m, cues in enumerate(meetings.values()):
+        local_codes, local_starts, local_ends = columns(cues)
+        # Local speaker code -> shared code; -1 (no speaker) stays -1
+        remap = np.empty(len(cues.speakers) + 1, dtype=np.int64)
+        remap[-1] = -1
+        for local, name in enumerate(cues.speakers):
+            if name not in speaker_index:
+                speaker_index[name] = len(speakers)
+                speakers.append(name)
+            remap[local] = speaker_index[name]
+        keep = local_codes >= 0
+        codes.append(remap[local_codes[keep]])
+        starts.append(local_starts[keep])
+        ends.append(local_ends[keep])
+        meeting_of.append(np.full(int(keep.sum()), m, dtype=np.int64))
+
+    shape = (len(meeting_ids), len(speakers))
+    if not speakers:
+        empty = np.zeros(shape, dtype=np.int64)
+        return SpeakerStats(meeting_ids, speakers, empty, empty.copy(), empty.copy(), empty.copy())
+
+    codes, starts, ends, meeting_of = (np.concatenate(c) for c in (codes, starts, ends, meeting_of))
+    cells = meeting_of * len(speakers) + codes
+    size = shape[0] * shape[1]
+
+    def count(mask, at=cells):
+        return np.bincount(at[mask], minlength=size).reshape(shape)
+
+    talk_ms = np.bincount(cells, weights=ends - starts, minlength=size).reshape(shape).astype(np.int64)
+
+    # A turn starts at every cue whose speaker or meeting differs from the previous cue's
+    same_meeting = meeting_of[1:] == meeting_of[:-1]
+    speaker_change = codes[1:] != codes[:-1]
+    new_turn = np.concatenate(([True], speaker_change | ~same_meeting))
+    turns = count(new_turn)
+
+    # Interruption: a new speaker starts before the previous cue has ended
+    overlap = same_meeting & speaker_change & (starts[1:] < ends[:-1])
+    interruptions = count(overlap, cells[1:])
+    interrupted = count(overlap, cells[:-1])
+
+    return SpeakerStats(meeting_ids, speakers, talk_ms, turns, interruptions, interrupted)
+
+
+def _report(speakers, talk_ms, turns, interruptions, interrupted):
+    total = talk_ms.sum()
+    rows = []
+    for i in np.argsort(-talk_ms, kind="stable"):
+        if not turns[i]:
+            continue
+        rows.append({
+            "speaker": speakers[i],
+            "talk_ms": int(talk_ms[i]),
+            "talk_share": float(talk_ms[i] / total) if total else 0.0,
+            "turns": int(turns[i]),
+            "interruptions": int(interruptions[i]),
+            "interrupted": int(interrupted[i]),
+            "interruption_rate": float(interruptions[i] / turns[i]),
+        })
+    return rows
+
+
+def format_report(rows):
+    """Renders report rows as a plain-text table."""
+    extra = ("meetings",) if rows and "meetings" in rows[0] else ()
+    header = ("Speaker", "Talk time", "Share", "Turns", "Interrupts", "Interrupted", "Rate") + \
+        tuple(c.capitalize() for c in extra)
+    lines = [header]
+    for row in rows:
+        minutes, seconds = divmod(row["talk_ms"] // 1000, 60)
+        lines.append((
+            row["speaker"],
+            f"{minutes}m{seconds:02d}s",
+            f"{row['talk_share']:.1%}",
+            str(row["turns"]),
+            str(row["interruptions"]),
+            str(row["interrupted"]),
+            f"{row['interruption_rate']:.2f}",
+        ) + tuple(str(row[c]) for c in extra))
+    widths = [max(len(line[i]) for line in lines) for i in range(len(header))]
+    return "\n".join(
+        "  ".join(value.ljust(width) if i == 0 else value.rjust(width)
+                  for i, (value, width) in enumerate(zip(line, widths)))
+        for line in lines
+    )
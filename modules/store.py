@@ -0,0 +1,354 @@
+import os
+import json
+import sqlite3
+import hashlib
+import threading
+
+DB_FILE = os.environ.get("ACDBOT_DB_FILE", "acdbot_state.db")
+# Git-committed JSON snapshot of the meetings table (the legacy mapping file)
+MAPPING_FILE = "meeting_topic_mapping.json"
+
+# Fields stored in their own (indexed) columns; everything else goes to `data`
+COLUMNS = ("discourse_topic_id", "issue_number", "repo", "issue_title", "youtube_video_id")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    meeting_id TEXT PRIMARY KEY,
+    discourse_topic_id INTEGER,
+    issue_number INTEGER,
+    repo TEXT,
+    issue_title TEXT,
+    youtube_video_id TEXT,
+    data TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_meetings_topic ON meetings(discourse_topic_id);
+CREATE INDEX IF NOT EXISTS idx_meetings_issue ON meetings(issue_number, repo);
+CREATE INDEX IF NOT EXISTS idx_meetings_video ON meetings(youtube_video_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = set()
+
+
+def connect(db_file=None, mapping_file=None):
+    """
+    Returns this thread's connection to the state database.
+
+    The first connection in a process creates the schema (WAL mode) and, when
+    the JSON snapshot changed since it was last imported or exported,
+    imports it so the database always reflects the committed mapping.
+    """
+    db_file = db_file or DB_FILE
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(db_file)
+    if conn is None:
+        conn = sqlite3.connect(db_file, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        connections[db_file] = conn
+    with _init_lock:
+        if db_file not in _initialized:
+            conn.executescript(SCHEMA)
+            _sync_from_snapshot(conn, mapping_file or MAPPING_FILE)
+            _initialized.add(db_file)
+    return conn
+
+
+def close():
+    """Closes this thread's connections."""
+    for conn in getattr(_local, "connections", {}).values():
+        conn.close()
+    _local.connections = {}
+
+
+def _row_to_dict(row):
+    if row is None:
+        return None
+    entry = json.loads(row["data"] or "{}")
+    for column in COLUMNS:
+        entry[column] = row[column]
+    entry["meeting_id"] = row["meeting_id"]
+    return entry
+
+
+def _normalize_video_id(video_id):
+    if video_id is None or str(video_id).lower() in ("none", "null", ""):
+        return None
+    return str(video_id)
+
+
+def get_meeting(meeting_id, conn=None):
+    """Returns the stored entry for a Zoom meeting ID, or None."""
+    conn = conn or connect()
+    row = conn.execute("SELECT * FROM meetings WHERE meeting_id = ?", (str(meeting_id),)).fetchone()
+    return _row_to_dict(row)
+
+
+def find_by_topic(topic_id, conn=None):
+    conn = conn or connect()
+    rows = conn.execute("SELECT * FROM meetings WHERE discourse_topic_id = ?", (int(topic_id),))
+    return [_row_to_dict(row) for row in rows]
+
+
+def find_by_issue(issue_number, repo=None, conn=None):
+    conn = conn or connect()
+    if repo is None:
+        rows = conn.execute("SELECT * FROM meetings WHERE issue_number = ?", (int(issue_number),))
+    else:
+        rows = conn.execute(
+            "SELECT * FROM meetings WHERE issue_number = ? AND repo = ?", (int(issue_number), repo)
+        )
+    return [_row_to_dict(row) for row in rows]
+
+
+def find_by_video(video_id, conn=None):
+    conn = conn or connect()
+    row = conn.execute("SELECT * FROM meetings WHERE youtube_video_id = ?", (str(video_id),)).fetchone()
+    return _row_to_dict(row)
+
+
+def all_meetings(conn=None):
+    conn = conn or connect()
+    rows = conn.execute("SELECT * FROM meetings ORDER BY meeting_id")
+    return {row["meeting_id"]: _row_to_dict(row) for row in rows}
+
+
+def upsert_meeting(meeting_id, conn=None, **fields):
+    """
+    Inserts or updates a single meeting atomically. Only the given fields are
+    changed; fields outside the indexed columns are merged into `data`.
+
+    :return: The entry as stored
+    """
+    conn = conn or connect()
+    if "youtube_video_id" in fields:
+        fields["youtube_video_id"] = _normalize_video_id(fields["youtube_video_id"])
+    column_fields = {k: v for k, v in fields.items() if k in COLUMNS}
+    data_fields = {k: v for k, v in fields.items() if k not in COLUMNS and k != "meeting_id"}
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute("SELECT * FROM meetings WHERE meeting_id = ?", (str(meeting_id),)).fetchone()
+        if row is None:
+            data = data_fields
+            values = {column: column_fields.get(column) for column in COLUMNS}
+            conn.execute(
+                f"INSERT INTO meetings (meeting_id, {', '.join(COLUMNS)}, data) "
+                f"VALUES (?, {', '.join('?' for _ in COLUMNS)}, ?)",
+                (str(meeting_id), *values.values(), json.dumps(data, sort_keys=True)),
+            )
+        else:
+            data = json.loads(row["data"] or "{}")
+            data.update(data_fields)
+            assignments = [f"{column} = ?" for column in column_fields] + ["data = ?"]
+            conn.execute(
+                f"UPDATE meetings SET {', '.join(assignments)} WHERE meeting_id = ?",
+                (*column_fields.values(), json.dumps(data, sort_keys=True), str(meeting_id)),
+            )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return get_meeting(meeting_id, conn=conn)
+
+
+def _update_data(meeting_id, mutate, conn=None):
+    """Applies mutate(data) to an existing meeting's `data` in one transaction."""
+    conn = conn or connect()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute("SELECT data FROM meetings WHERE meeting_id = ?", (str(meeting_id),)).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown meeting {meeting_id}")
+        data = json.loads(row["data"] or "{}")
+        mutate(data)
+        conn.execute(
+            "UPDATE meetings SET data = ? WHERE meeting_id = ?",
+            (json.dumps(data, sort_keys=True), str(meeting_id)),
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return get_meeting(meeting_id, conn=conn)
+
+
+def set_occurrences(meeting_id, occurrences, conn=None):
+    """
+    Stores the occurrences of a recurring meeting. What was already recorded
+    per occurrence (recording UUID, transcript post) is kept for occurrences
+    that still exist.
+    """
+    def mutate(data):
+        known = {o["occurrence_id"]: o for o in data.get("occurrences", [])}
+        data["occurrences"] = sorted(
+            ({**known.get(o["occurrence_id"], {}), **o} for o in occurrences),
+            key=lambda o: o.get("start_time") or "",
+        )
+    return _update_data(meeting_id, mutate, conn=conn)
+
+
+def get_occurrence(meeting_id, occurrence_id, conn=None):
+    entry = get_meeting(meeting_id, conn=conn) or {}
+    for occurrence in entry.get("occurrences", []):
+        if occurrence["occurrence_id"] == str(occurrence_id):
+            return occurrence
+    return None
+
+
+def update_occurrence(meeting_id, occurrence_id, conn=None, **fields):
+    """Merges fields into one occurrence of a recurring meeting."""
+    def mutate(data):
+        for occurrence in data.get("occurrences", []):
+            if occurrence["occurrence_id"] == str(occurrence_id):
+                occurrence.update(fields)
+                return
+        raise KeyError(f"Unknown occurrence {occurrence_id} of meeting {meeting_id}")
+    return _update_data(meeting_id, mutate, conn=conn)
+
+
+def get_transcript_post(meeting_id, occurrence_id=None, conn=None):
+    """
+    Returns the recorded transcript post of a meeting (or of one occurrence
+    of a recurring meeting) as {"topic_id", "post_id", "content_hash"}, or
+    None if none was recorded.
+    """
+    entry = get_meeting(meeting_id, conn=conn)
+    if not entry:
+        return None
+    record = entry if occurrence_id is None else get_occurrence(meeting_id, occurrence_id, conn=conn)
+    if not record or not record.get("transcript_post_id"):
+        return None
+    return {
+        "topic_id": entry.get("discourse_topic_id"),
+        "post_id": record["transcript_post_id"],
+        "content_hash": record.get("transcript_content_hash"),
+    }
+
+
+def record_transcript_post(meeting_id, topic_id, post_id, content_hash=None, occurrence_id=None, conn=None):
+    """Records that the transcript of a meeting (or occurrence) was posted to a topic."""
+    if occurrence_id is not None:
+        return update_occurrence(
+            meeting_id,
+            occurrence_id,
+            conn=conn,
+            transcript_post_id=post_id,
+            transcript_content_hash=content_hash,
+        )
+    return upsert_meeting(
+        meeting_id,
+        conn=conn,
+        discourse_topic_id=topic_id,
+        transcript_post_id=post_id,
+        transcript_content_hash=content_hash,
+    )
+
+
+def replace_meeting(meeting_id, conn=None, **fields):
+    """
+    Overwrites a meeting with exactly the given fields: unlike
+    upsert_meeting(), fields left out are cleared.
+    """
+    conn = conn or connect()
+    if "youtube_video_id" in fields:
+        fields["youtube_video_id"] = _normalize_video_id(fields["youtube_video_id"])
+    values = [fields.get(column) for column in COLUMNS]
+    data = {k: v for k, v in fields.items() if k not in COLUMNS and k != "meeting_id"}
+    conn.execute(
+        f"INSERT OR REPLACE INTO meetings (meeting_id, {', '.join(COLUMNS)}, data) "
+        f"VALUES (?, {', '.join('?' for _ in COLUMNS)}, ?)",
+        (str(meeting_id), *values, json.dumps(data, sort_keys=True)),
+    )
+    return get_meeting(meeting_id, conn=conn)
+
+
+def delete_meeting(meeting_id, conn=None):
+    conn = conn or connect()
+    conn.execute("DELETE FROM meetings WHERE meeting_id = ?", (str(meeting_id),))
+
+
+def normalize_entry(entry):
+    """Normalizes the old mapping formats (bare topic ID int/str, dict)."""
+    if isinstance(entry, dict):
+        fields = dict(entry)
+        fields.pop("meeting_id", None)
+    else:
+        fields = {"discourse_topic_id": entry}
+    topic_id = fields.get("discourse_topic_id")
+    if topic_id is not None:
+        try:
+            fields["discourse_topic_id"] = int(topic_id)
+        except (TypeError, ValueError):
+            fields["discourse_topic_id"] = None
+    fields["youtube_video_id"] = _normalize_video_id(fields.get("youtube_video_id"))
+    return fields
+
+
+def import_legacy_json(path=MAPPING_FILE, conn=None):
+    """
+    Imports meeting_topic_mapping.json (old bare-int/string entries included).
+    Existing rows are updated with the snapshot's values.
+
+    :return: Number of imported meetings
+    """
+    conn = conn or connect()
+    with open(path, "r") as f:
+        mapping = json.load(f)
+    for meeting_id, entry in mapping.items():
+        upsert_meeting(meeting_id, conn=conn, **normalize_entry(entry))
+    with open(path, "rb") as f:
+        _set_meta(conn, "snapshot_sha256", hashlib.sha256(f.read()).hexdigest())
+    return len(mapping)
+
+
+def export_json(path=MAPPING_FILE, conn=None):
+    """
+    Writes the meetings table as the git-committed JSON snapshot, in the same
+    shape as the legacy mapping file.
+
+    :return: The path written
+    """
+    conn = conn or connect()
+    snapshot = {}
+    for meeting_id, entry in all_meetings(conn=conn).items():
+        entry.pop("meeting_id")
+        snapshot[meeting_id] = {
+            key: value for key, value in entry.items()
+            if value is not None or key in ("discourse_topic_id", "youtube_video_id")
+        }
+    content = json.dumps(snapshot, indent=2, sort_keys=True) + "\n"
+    with open(path, "w") as f:
+        f.write(content)
+    _set_meta(conn, "snapshot_sha256", hashlib.sha256(content.encode()).hexdigest())
+    return path
+
+
+def _set_meta(conn, key, value):
+    conn.execute(
+        "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+        (key, value),
+    )
+
+
+def _get_meta(conn, key):
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row["value"] if row else None
+
+
+def _sync_from_snapshot(conn, mapping_file):
+    if not mapping_file or not os.path.exists(mapping_file):
+        return
+    with open(mapping_file, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    if digest != _get_meta(conn, "snapshot_sha256"):
+        count = import_legacy_json(mapping_file, conn=conn)
+        print(f"Imported {count} meetings from {mapping_file}")
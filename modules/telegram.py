@@ -1,5 +1,11 @@
 import os
-import requests
+import time
+import queue
+import atexit
+import threading
+from collections import deque
+from concurrent.futures import Future, wait as wait_futures
+from modules import http_client
 
 ZOOM_CLIENT_ID = os.environ.get("ZOOM_CLIENT_ID")
 ZOOM_CLIENT_SECRET = os.environ.get("ZOOM_CLIENT_SECRET")
@@ -9,22 +15,195 @@ DISCOURSE_API_KEY = os.environ.get("DISCOURSE_API_KEY")
 DISCOURSE_API_USERNAME = os.environ.get("DISCOURSE_API_USERNAME")
 DISCOURSE_BASE_URL = os.environ.get("DISCOURSE_BASE_URL")
 
+# Telegram Bot API limits (https://core.telegram.org/bots/faq#my-bot-is-hitting-limits-how-do-i-avoid-this)
+MAX_MESSAGE_LENGTH = 4096
+PER_CHAT_INTERVAL = 1.0      # seconds between messages to the same chat
+GROUP_PER_MINUTE = 20        # messages per minute to a group or channel
+GLOBAL_PER_SECOND = 30       # messages per second across all chats
+MAX_RETRIES = 5
+DEFAULT_RETRY_AFTER = 5
+FLUSH_TIMEOUT = 600          # seconds the exit handler waits for queued messages
 
-def send_message(text: str):
+
+def split_message(text: str, limit: int = MAX_MESSAGE_LENGTH):
+    """
+    Splits text into parts of at most `limit` characters, breaking between
+    paragraphs where possible, then between lines, then between words, and
+    only cutting inside a word as a last resort.
+    """
+    if len(text) <= limit:
+        return [text]
+    parts = []
+    current = ""
+    for piece, sep in _pieces(text, limit):
+        candidate = f"{current}{sep}{piece}" if current else piece
+        if len(candidate) <= limit:
+            current = candidate
+        else:
+            parts.append(current)
+            current = piece
+    parts.append(current)
+    # Telegram rejects empty or whitespace-only messages
+    return [part for part in parts if part.strip()]
+
+
+def _pieces(text, limit):
+    """Yields (piece, separator before it) with every piece at most `limit` long."""
+    for separator in ("\n\n", "\n", " "):
+        if separator in text:
+            break
+    else:
+        for offset in range(0, len(text), limit):
+            yield text[offset:offset + limit], ""
+        return
+    for i, chunk in enumerate(text.split(separator)):
+        sep = separator if i else ""
+        if len(chunk) <= limit:
+            yield chunk, sep
+        else:
+            for j, (piece, inner_sep) in enumerate(_pieces(chunk, limit)):
+                yield piece, sep if j == 0 else inner_sep
+
+
+def _is_group(chat_id) -> bool:
+    # Groups, supergroups and channels have negative IDs or an @username
+    chat_id = str(chat_id)
+    return chat_id.startswith("-") or chat_id.startswith("@")
+
+
+class Pacer:
+    """
+    Spaces out sends to stay within Telegram's flood limits: one message per
+    second per chat, 20 per minute per group and 30 per second overall.
+    A 429 pauses the chat for the `retry_after` Telegram asks for.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next_send = {}
+        self._group_sends = {}
+        self._global_sends = deque()
+
+    def reserve(self, chat_id) -> float:
+        """Reserves the earliest allowed send slot for chat_id; returns the seconds to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            at = max(now, self._next_send.get(chat_id, now))
+            if len(self._global_sends) >= GLOBAL_PER_SECOND:
+                at = max(at, self._global_sends[-GLOBAL_PER_SECOND] + 1.0)
+            group_sends = None
+            if _is_group(chat_id):
+                group_sends = self._group_sends.setdefault(chat_id, deque())
+                if len(group_sends) >= GROUP_PER_MINUTE:
+                    at = max(at, group_sends[-GROUP_PER_MINUTE] + 60.0)
+                group_sends.append(at)
+                while len(group_sends) > GROUP_PER_MINUTE:
+                    group_sends.popleft()
+            self._global_sends.append(at)
+            while len(self._global_sends) > GLOBAL_PER_SECOND:
+                self._global_sends.popleft()
+            self._next_send[chat_id] = at + PER_CHAT_INTERVAL
+            return at - now
+
+    def block(self, chat_id, seconds):
+        with self._lock:
+            self._next_send[chat_id] = max(self._next_send.get(chat_id, 0), time.monotonic() + seconds)
+
+
+class SendQueue:
     """
-    Sends a message to a Telegram channel or group.
+    Delivers messages from a background thread, in order, split to
+    Telegram's length limit and paced by a Pacer. Each queued message
+    returns a Future; flush() (also run at exit) waits for what is queued.
     """
-    token = os.environ["TELEGRAM_BOT_TOKEN"]
-    chat_id = os.environ["TELEGRAM_CHAT_ID"]
 
-    url = f"https://api.telegram.org/bot{token}/sendMessage"
-    data = {
-        "chat_id": chat_id,
-        "text": text,
-       # "parse_mode": "MarkdownV2",
-    }
+    def __init__(self, pacer=None):
+        self.pacer = pacer or Pacer()
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def put(self, text, chat_id=None, token=None, **params) -> Future:
+        future = Future()
+        token = token or os.environ["TELEGRAM_BOT_TOKEN"]
+        chat_id = chat_id or os.environ["TELEGRAM_CHAT_ID"]
+        with self._lock:
+            self._pending.add(future)
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="telegram-send", daemon=True)
+                self._worker.start()
+        future.add_done_callback(self._done)
+        self._queue.put((future, token, chat_id, text, params))
+        return future
+
+    def _done(self, future):
+        with self._lock:
+            self._pending.discard(future)
+
+    def flush(self, timeout=FLUSH_TIMEOUT):
+        """Waits until every queued message is sent (or failed); returns the number left unsent."""
+        with self._lock:
+            pending = list(self._pending)
+        if not pending:
+            return 0
+        print(f"Flushing {len(pending)} queued Telegram message(s)")
+        _, not_done = wait_futures(pending, timeout=timeout)
+        if not_done:
+            print(f"{len(not_done)} Telegram message(s) still unsent after {timeout}s")
+        return len(not_done)
+
+    def _run(self):
+        while True:
+            future, token, chat_id, text, params = self._queue.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = None
+                for part in split_message(text):
+                    result = self._send(token, chat_id, part, params)
+                future.set_result(result)
+            except Exception as e:
+                print(f"Error sending Telegram message to chat {chat_id}: {e}")
+                future.set_exception(e)
+
+    def _send(self, token, chat_id, text, params):
+        url = f"https://api.telegram.org/bot{token}/sendMessage"
+        data = {"chat_id": chat_id, "text": text, **params}
+        for attempt in range(1, MAX_RETRIES + 1):
+            delay = self.pacer.reserve(chat_id)
+            if delay > 0:
+                time.sleep(delay)
+            resp = http_client.post(url, data=data)
+            if resp.status_code != 429 or attempt == MAX_RETRIES:
+                resp.raise_for_status()
+                return resp.json()
+            retry_after = _retry_after(resp)
+            print(f"Telegram flood limit hit for chat {chat_id}, retrying in {retry_after}s")
+            self.pacer.block(chat_id, retry_after)
 
-    resp = requests.post(url, data=data)
-    resp.raise_for_status()
 
-    return resp.json()
+def _retry_after(resp):
+    try:
+        return float(resp.json().get("parameters", {}).get("retry_after", DEFAULT_RETRY_AFTER))
+    except ValueError:
+        return DEFAULT_RETRY_AFTER
+
+
+send_queue = SendQueue()
+atexit.register(send_queue.flush)
+
+
+def send_message(text: str, wait: bool = True, chat_id=None):
+    """
+    Sends a message to a Telegram channel or group. Text longer than
+    Telegram's limit goes out as several messages, split between paragraphs.
+
+    :param wait: False queues the message and returns its Future at once;
+                 queued messages are still delivered before the process exits.
+    :return: API response of the (last) message sent
+    """
+    future = send_queue.put(text, chat_id=chat_id)
+    if not wait:
+        return future
+    return future.result()
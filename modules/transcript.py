@@ -1,69 +1,48 @@
 import os
 import json
-from modules import zoom, discourse
+import hashlib
+from modules import zoom, discourse, store, vtt, search_index
+from modules.transcript_archive import archive
 import requests
 
-MAPPING_FILE = "meeting_topic_mapping.json"
-
-def load_meeting_topic_mapping():
-    if os.path.exists(MAPPING_FILE):
-        with open(MAPPING_FILE, "r") as f:
-            return json.load(f)
-    return {}
-
-def save_meeting_topic_mapping(mapping):
-    with open(MAPPING_FILE, "w") as f:
-        json.dump(mapping, f)
-
-def post_zoom_transcript_to_discourse(meeting_id: str):
+def post_zoom_transcript_to_discourse(meeting_id: str, recording_uuid: str = None, occurrence_id: str = None):
     """
     Posts the Zoom meeting recording link and summary to Discourse.
+
+    For an occurrence of a recurring meeting, pass the UUID of its recording
+    instance and its occurrence ID: the meeting ID alone only resolves to the
+    latest instance.
     """
-    # Load the mapping to find the corresponding Discourse topic ID
-    mapping = load_meeting_topic_mapping()
-    entry = mapping.get(str(meeting_id))  # Ensure string key lookup
-    
-    # Handle both old and new format
-    if isinstance(entry, dict):
-        discourse_topic_id = entry.get("discourse_topic_id")
-        # Add fallback for legacy entries without issue_title
-        meeting_topic = entry.get("issue_title", f"Meeting {meeting_id}")  
-    else:  # Legacy string format
-        discourse_topic_id = entry
-        
+    # Look up the corresponding Discourse topic ID
+    entry = store.get_meeting(meeting_id) or {}
+    discourse_topic_id = entry.get("discourse_topic_id")
+    # Add fallback for legacy entries without issue_title
+    meeting_topic = entry.get("issue_title") or f"Meeting {meeting_id}"
+
     if not discourse_topic_id:
         raise ValueError(f"No Discourse topic mapping found for meeting ID {meeting_id}")
 
-    # Check existing posts
-    if discourse.check_if_transcript_posted(discourse_topic_id, meeting_id):
-        print(f"Transcript already posted for meeting {meeting_id}")
+    # Check existing posts: local index first, topic scan only as a fallback
+    label = meeting_id if occurrence_id is None else f"{meeting_id} (occurrence {occurrence_id})"
+    if store.get_transcript_post(meeting_id, occurrence_id=occurrence_id):
+        print(f"Transcript already posted for meeting {label}")
+        return discourse_topic_id
+    existing_post = discourse.find_transcript_post(discourse_topic_id, meeting_id, occurrence_id=occurrence_id)
+    if existing_post:
+        print(f"Transcript already posted for meeting {label}")
+        store.record_transcript_post(meeting_id, discourse_topic_id, existing_post.get("id"),
+                                     occurrence_id=occurrence_id)
         return discourse_topic_id
 
     # Get recording details
-    recording_data = zoom.get_meeting_recording(meeting_id)
+    recording_data = zoom.get_meeting_recording(recording_uuid or meeting_id)
     meeting_uuid = recording_data.get('uuid', '')
     
     # Get summary using properly encoded UUID
     summary_data = zoom.get_meeting_summary(meeting_uuid=meeting_uuid)
     print(f"Summary data for meeting {meeting_id}: {json.dumps(summary_data, indent=2)}")
     
-    # Process summary data
-    if summary_data:
-        # Extract detailed summaries
-        summary_content = ""
-        if summary_data.get("summary_details"):
-            summaries = [detail.get("summary", "") for detail in summary_data["summary_details"]]
-            summary_content = "\n\n".join(summaries)
-        
-        # Format next steps
-        next_steps = ""
-        if summary_data.get("next_steps"):
-            steps = [f"- {step}" for step in summary_data["next_steps"]]
-            next_steps = "\n\n**Next Steps:**\n" + "\n".join(steps)
-        
-        final_summary = f"{summary_content}{next_steps}"
-    else:
-        final_summary = "No summary available yet"
+    final_summary = format_summary(summary_data) if summary_data else "No summary available yet"
     print(f"Final summary text: {final_summary}")
     
     # Extract proper share URL and passcode (new format)
@@ -88,19 +67,80 @@ def post_zoom_transcript_to_discourse(meeting_id: str):
     if transcript_url:
         post_content += f"\n- [Download Transcript]({transcript_url})"
 
-    discourse.create_post(
+    # Marker used to find this post again if the local index is lost
+    post_content += f"\n- {discourse.transcript_marker(meeting_id, occurrence_id)}"
+
+    post = discourse.create_post(
         topic_id=discourse_topic_id,
         body=post_content
     )
+    store.record_transcript_post(
+        meeting_id,
+        discourse_topic_id,
+        post.get("id"),
+        hashlib.sha256(post_content.encode("utf-8")).hexdigest(),
+        occurrence_id=occurrence_id
+    )
     
-    print(f"Posted recording links for meeting {meeting_id} to topic {discourse_topic_id}")
+    print(f"Posted recording links for meeting {label} to topic {discourse_topic_id}")
+
+    index_transcript(meeting_id, transcript_url, summary=final_summary if summary_data else None,
+                     title=meeting_topic, start_time=recording_data.get('start_time'),
+                     occurrence_id=occurrence_id)
 
     # Now, send the same content to Telegram
     try:
         import modules.telegram as telegram  # Ensure telegram module is available
-        telegram.send_message(post_content)
-        print("Message sent to Telegram successfully.")
+        # Queued so a backfill of many meetings is not held up by Telegram's pacing
+        telegram.send_message(post_content, wait=False)
+        print("Message queued for Telegram.")
     except Exception as e:
         print(f"Error sending message to Telegram: {e}")
     
     return discourse_topic_id
+
+
+def format_summary(summary_data):
+    """Formats Zoom's meeting summary (detailed summaries and next steps) as Markdown."""
+    # Extract detailed summaries
+    summary_content = ""
+    if summary_data.get("summary_details"):
+        summaries = [detail.get("summary", "") for detail in summary_data["summary_details"]]
+        summary_content = "\n\n".join(summaries)
+
+    # Format next steps
+    next_steps = ""
+    if summary_data.get("next_steps"):
+        steps = [f"- {step}" for step in summary_data["next_steps"]]
+        next_steps = "\n\n**Next Steps:**\n" + "\n".join(steps)
+
+    return f"{summary_content}{next_steps}"
+
+
+def transcript_cues(meeting_id, transcript_url=None, occurrence_id=None):
+    """
+    Yields a meeting's transcript cues from the local archive. A transcript
+    not archived yet is downloaded from `transcript_url` once and archived
+    first; without either, nothing is yielded.
+    """
+    if not archive.has(meeting_id, occurrence_id):
+        if not transcript_url:
+            return
+        chunks = zoom.iter_zoom_file_chunks(transcript_url, zoom.get_access_token())
+        count = archive.write(meeting_id, vtt.parse_stream(chunks), occurrence_id=occurrence_id)
+        print(f"Archived {count} transcript cues for meeting {meeting_id}")
+    yield from archive.iter_cues(meeting_id, occurrence_id)
+
+
+def index_transcript(meeting_id, transcript_url, summary=None, title=None, start_time=None, occurrence_id=None):
+    """
+    Archives a meeting's transcript and adds its cues and summary to the
+    local search index. Failures are reported but never stop the caller.
+    """
+    try:
+        cues = transcript_cues(meeting_id, transcript_url, occurrence_id=occurrence_id)
+        count = search_index.index_meeting(meeting_id, cues, summary=summary, title=title,
+                                           start_time=start_time, occurrence_id=occurrence_id)
+        print(f"Indexed {count} transcript cues for meeting {meeting_id}")
+    except Exception as e:
+        print(f"Error indexing transcript for meeting {meeting_id}: {e}")
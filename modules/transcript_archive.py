@@ -0,0 +1,197 @@
+import os
+import mmap
+import base64
+import zlib
+import struct
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from modules import vtt
+
+ARCHIVE_DIR = os.environ.get("ACDBOT_TRANSCRIPT_ARCHIVE_DIR", "transcript_archive")
+
+# Cues per compressed block: small enough that a range read inflates a few
+# KB, large enough for zlib to find the repetition in speaker names
+BLOCK_CUES = 256
+COMPRESSION_LEVEL = 6
+
+# File layout: [block 0] ... [block n-1] [index] [footer]
+#   block:  zlib-compressed lines of `start_ms \t end_ms \t speaker \t text \n`
+#   index:  per block, (first start_ms, offset, compressed length)
+#   footer: (index offset, block count, magic)
+_INDEX_ENTRY = struct.Struct("<qQI")
+_FOOTER = struct.Struct("<QI4s")
+MAGIC = b"ACT1"
+
+
+class ArchiveFormatError(ValueError):
+    pass
+
+
+def _encode_cue(cue):
+    text = cue.text.replace("\t", " ").replace("\n", " ")
+    speaker = (cue.speaker or "").replace("\t", " ").replace("\n", " ")
+    return f"{cue.start_ms}\t{cue.end_ms}\t{speaker}\t{text}\n"
+
+
+def _encode_name(value):
+    return base64.urlsafe_b64encode(str(value).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_block(data):
+    cues = []
+    for line in zlib.decompress(data).decode("utf-8").split("\n"):
+        if not line:
+            continue
+        start_ms, end_ms, speaker, text = line.split("\t", 3)
+        cues.append(vtt.Cue(int(start_ms), int(end_ms), speaker or None, text))
+    return cues
+
+
+class TranscriptReader:
+    """
+    Random access to one archived transcript. The file is memory-mapped and
+    only the blocks overlapping a requested range are decompressed.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ArchiveFormatError(f"Empty transcript archive file {path}")
+        if len(self._map) < _FOOTER.size:
+            self.close()
+            raise ArchiveFormatError(f"Truncated transcript archive file {path}")
+        index_offset, block_count, magic = _FOOTER.unpack_from(self._map, len(self._map) - _FOOTER.size)
+        if magic != MAGIC:
+            self.close()
+            raise ArchiveFormatError(f"Not a transcript archive file: {path}")
+        self.first_starts = array("q")
+        self._offsets = array("Q")
+        self._lengths = array("I")
+        for i in range(block_count):
+            first_start, offset, length = _INDEX_ENTRY.unpack_from(self._map, index_offset + i * _INDEX_ENTRY.size)
+            self.first_starts.append(first_start)
+            self._offsets.append(offset)
+            self._lengths.append(length)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __len__(self):
+        return len(self.first_starts)
+
+    def block(self, i):
+        offset = self._offsets[i]
+        return _decode_block(self._map[offset:offset + self._lengths[i]])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield from self.block(i)
+
+    def range(self, start_ms, end_ms):
+        """Cues starting within [start_ms, end_ms)."""
+        # The block before the first one starting at/after start_ms may hold earlier matches
+        lo = max(bisect_right(self.first_starts, start_ms) - 1, 0)
+        hi = bisect_left(self.first_starts, end_ms)
+        cues = []
+        for i in range(lo, hi):
+            cues.extend(c for c in self.block(i) if start_ms <= c.start_ms < end_ms)
+        return cues
+
+
+class TranscriptArchive:
+    """
+    On-disk archive of meeting transcripts, one block-compressed file per
+    meeting (or occurrence), so a transcript is downloaded from Zoom once
+    and outlives Zoom's recording retention.
+    """
+
+    def __init__(self, directory=ARCHIVE_DIR, block_cues=BLOCK_CUES):
+        self.directory = directory
+        self.block_cues = block_cues
+        self._lock = threading.Lock()
+
+    def path(self, meeting_id, occurrence_id=None):
+        # IDs are encoded so recording UUIDs ("/", "//" prefixes) can't escape
+        # the directory; "." is outside the base64 alphabet, so names don't collide
+        parts = [meeting_id] if occurrence_id is None else [meeting_id, occurrence_id]
+        name = ".".join(_encode_name(part) for part in parts)
+        return os.path.join(self.directory, f"{name}.vtt.z")
+
+    def has(self, meeting_id, occurrence_id=None):
+        return os.path.exists(self.path(meeting_id, occurrence_id))
+
+    def write(self, meeting_id, cues, occurrence_id=None):
+        """
+        Archives cues (in start time order, e.g. straight from
+        vtt.parse_stream), compressing one block at a time. The file is only
+        put in place once complete.
+
+        :return: Number of cues written
+        """
+        path = self.path(meeting_id, occurrence_id)
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        index = []
+        count = 0
+        try:
+            with open(tmp_path, "wb") as f:
+                block, first_start = [], None
+
+                def flush():
+                    data = zlib.compress("".join(block).encode("utf-8"), COMPRESSION_LEVEL)
+                    index.append((first_start, f.tell(), len(data)))
+                    f.write(data)
+
+                for cue in cues:
+                    if not block:
+                        first_start = cue.start_ms
+                    block.append(_encode_cue(cue))
+                    count += 1
+                    if len(block) >= self.block_cues:
+                        flush()
+                        block = []
+                if block:
+                    flush()
+
+                index_offset = f.tell()
+                for entry in index:
+                    f.write(_INDEX_ENTRY.pack(*entry))
+                f.write(_FOOTER.pack(index_offset, len(index), MAGIC))
+            with self._lock:
+                os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return count
+
+    def open(self, meeting_id, occurrence_id=None):
+        """Returns a TranscriptReader; use it as a context manager."""
+        return TranscriptReader(self.path(meeting_id, occurrence_id))
+
+    def iter_cues(self, meeting_id, occurrence_id=None):
+        """Yields all archived cues of a meeting, one block in memory at a time."""
+        with self.open(meeting_id, occurrence_id) as reader:
+            yield from reader
+
+    def read_range(self, meeting_id, start_ms, end_ms, occurrence_id=None):
+        with self.open(meeting_id, occurrence_id) as reader:
+            return reader.range(start_ms, end_ms)
+
+    def load(self, meeting_id, occurrence_id=None):
+        """Returns a meeting's archived cues as a vtt.CueArray."""
+        return vtt.CueArray(self.iter_cues(meeting_id, occurrence_id))
+
+
+archive = TranscriptArchive()
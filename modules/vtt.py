@@ -0,0 +1,144 @@
+import re
+import codecs
+from array import array
+from bisect import bisect_left, bisect_right
+
+# `00:01:02.345 --> 00:01:05.000` (hours optional), cue settings ignored
+_TIMING_RE = re.compile(
+    r"^(?:(\d+):)?(\d{2}):(\d{2})[.,](\d{3})\s+-->\s+(?:(\d+):)?(\d{2}):(\d{2})[.,](\d{3})"
+)
+# Zoom prefixes each cue with the speaker's display name: `Jane Doe: text`
+_SPEAKER_RE = re.compile(r"^([^:\n]{1,80}?):\s+(.*)$", re.DOTALL)
+
+
+class Cue:
+    """One transcript cue; times are in milliseconds from the start of the recording."""
+
+    __slots__ = ("start_ms", "end_ms", "speaker", "text")
+
+    def __init__(self, start_ms, end_ms, speaker, text):
+        self.start_ms = start_ms
+        self.end_ms = end_ms
+        self.speaker = speaker
+        self.text = text
+
+    def __repr__(self):
+        return f"Cue({self.start_ms}, {self.end_ms}, {self.speaker!r}, {self.text!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, Cue) and all(getattr(self, s) == getattr(other, s) for s in self.__slots__)
+
+
+class CueArray:
+    """
+    Columnar storage for many cues: start/end times and speaker codes live in
+    typed arrays, speaker names are interned once, and only the text is kept
+    as one string per cue. Cues are expected in start time order, which is
+    how Zoom writes them.
+    """
+
+    __slots__ = ("starts", "ends", "speaker_codes", "speakers", "texts", "_speaker_index")
+
+    def __init__(self, cues=()):
+        self.starts = array("q")
+        self.ends = array("q")
+        self.speaker_codes = array("i")
+        self.speakers = []  # code -> name; code -1 means no speaker
+        self.texts = []
+        self._speaker_index = {}
+        for cue in cues:
+            self.append(cue)
+
+    def append(self, cue):
+        code = -1
+        if cue.speaker is not None:
+            code = self._speaker_index.get(cue.speaker)
+            if code is None:
+                code = self._speaker_index[cue.speaker] = len(self.speakers)
+                self.speakers.append(cue.speaker)
+        self.starts.append(cue.start_ms)
+        self.ends.append(cue.end_ms)
+        self.speaker_codes.append(code)
+        self.texts.append(cue.text)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, i):
+        code = self.speaker_codes[i]
+        return Cue(self.starts[i], self.ends[i], self.speakers[code] if code >= 0 else None, self.texts[i])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def between(self, start_ms, end_ms):
+        """Cues starting within [start_ms, end_ms)."""
+        lo = bisect_left(self.starts, start_ms)
+        hi = bisect_right(self.starts, end_ms - 1)
+        return [self[i] for i in range(lo, hi)]
+
+
+def _to_ms(hours, minutes, seconds, millis):
+    return ((int(hours or 0) * 60 + int(minutes)) * 60 + int(seconds)) * 1000 + int(millis)
+
+
+def _make_cue(start_ms, end_ms, lines):
+    text = " ".join(line.strip() for line in lines if line.strip())
+    speaker = None
+    match = _SPEAKER_RE.match(text)
+    if match:
+        speaker, text = match.group(1).strip(), match.group(2)
+    return Cue(start_ms, end_ms, speaker, text)
+
+
+def iter_cues(lines):
+    """
+    Parses WebVTT from an iterable of lines and yields Cue objects as soon
+    as each cue is complete, so the whole file is never held in memory.
+    Cue identifiers, NOTE/STYLE blocks and cue settings are skipped.
+    """
+    timing = None
+    text_lines = []
+    for line in lines:
+        line = line.rstrip("\r\n").lstrip("\ufeff")
+        if not line.strip():
+            if timing is not None:
+                yield _make_cue(timing[0], timing[1], text_lines)
+            timing = None
+            text_lines = []
+            continue
+        if timing is None:
+            match = _TIMING_RE.match(line)
+            if match:
+                g = match.groups()
+                timing = (_to_ms(*g[:4]), _to_ms(*g[4:]))
+            # Anything before the timing line (WEBVTT header, cue number, NOTE) is ignored
+            continue
+        text_lines.append(line)
+    if timing is not None:
+        yield _make_cue(timing[0], timing[1], text_lines)
+
+
+def iter_lines(chunks, encoding="utf-8"):
+    """Turns an iterable of byte chunks into lines, decoding incrementally."""
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    pending = ""
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        lines = pending.split("\n")
+        pending = lines.pop()
+        yield from lines
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def parse_stream(chunks, encoding="utf-8"):
+    """Yields the cues of a WebVTT byte stream (e.g. `response.iter_content()`)."""
+    return iter_cues(iter_lines(chunks, encoding))
+
+
+def load_cues(chunks, encoding="utf-8"):
+    """Parses a WebVTT byte stream into a CueArray."""
+    return CueArray(parse_stream(chunks, encoding))
@@ -1,10 +1,99 @@
 from googleapiclient.discovery import build
 import os
+import json
+import threading
 
 YOUTUBE_API_KEY = os.environ.get("YOUTUBE_API_KEY")
+VIDEO_CACHE_FILE = os.environ.get("YOUTUBE_VIDEO_CACHE_FILE", "youtube_video_cache.json")
+
+# videos().list and playlistItems().list accept at most 50 IDs / results per call
+MAX_RESULTS = 50
+VIDEO_PARTS = "snippet,contentDetails,liveStreamingDetails"
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """
+    Returns the YouTube Data API client, built once per process from the
+    discovery document bundled with google-api-python-client.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = build('youtube', 'v3', developerKey=YOUTUBE_API_KEY,
+                            static_discovery=True, cache_discovery=False)
+        return _client
+
+
+class VideoCache:
+    """
+    Videos already listed for a channel, persisted to `cache_file` so the
+    next listing only walks the uploads playlist until it reaches a page of
+    known videos.
+    """
+
+    def __init__(self, cache_file=VIDEO_CACHE_FILE):
+        self.cache_file = cache_file
+        self._lock = threading.Lock()
+        self._data = None
+
+    def _load(self):
+        if self._data is not None:
+            return self._data
+        self._data = {"uploads_playlists": {}, "videos": {}}
+        if self.cache_file and os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, "r") as f:
+                    self._data.update(json.load(f))
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable YouTube video cache file: {e}")
+        return self._data
+
+    def _save(self):
+        if not self.cache_file:
+            return
+        try:
+            with open(f"{self.cache_file}.tmp", "w") as f:
+                json.dump(self._data, f)
+            os.replace(f"{self.cache_file}.tmp", self.cache_file)
+        except OSError as e:
+            print(f"Unable to persist YouTube video cache file: {e}")
+
+    def uploads_playlist(self, channel_id):
+        with self._lock:
+            return self._load()["uploads_playlists"].get(channel_id)
+
+    def set_uploads_playlist(self, channel_id, playlist_id):
+        with self._lock:
+            self._load()["uploads_playlists"][channel_id] = playlist_id
+            self._save()
+
+    def videos(self, channel_id):
+        """Cached videos of a channel, newest first."""
+        with self._lock:
+            videos = [v for v in self._load()["videos"].values()
+                      if v.get("snippet", {}).get("channelId") == channel_id]
+        return sorted(videos, key=lambda v: v.get("snippet", {}).get("publishedAt", ""), reverse=True)
+
+    def has(self, video_id):
+        with self._lock:
+            return video_id in self._load()["videos"]
+
+    def put(self, videos):
+        with self._lock:
+            data = self._load()
+            for video in videos:
+                data["videos"][video["id"]] = video
+            self._save()
+
+
+video_cache = VideoCache()
+
 
 def get_channel_id_by_custom_url(custom_url):
-    youtube = build('youtube', 'v3', developerKey=YOUTUBE_API_KEY)
+    youtube = get_client()
 
     response = youtube.channels().list(
         part='id',
@@ -28,54 +117,90 @@ def get_channel_id_by_custom_url(custom_url):
         else:
             raise Exception("Channel not found")
 
-def get_channel_videos(channel_id):
-    youtube = build('youtube', 'v3', developerKey=YOUTUBE_API_KEY)
-
-    videos = []
-    next_page_token = None
 
-    while True:
-        res = youtube.search().list(
-            part='snippet',
-            channelId=channel_id,
-            maxResults=50,
-            pageToken=next_page_token,
-            order='date',
-            type='video'
-        ).execute()
+def get_uploads_playlist_id(channel_id, cache=video_cache):
+    playlist_id = cache.uploads_playlist(channel_id)
+    if playlist_id:
+        return playlist_id
 
-        videos.extend(res['items'])
-        next_page_token = res.get('nextPageToken')
+    response = get_client().channels().list(
+        part='contentDetails',
+        id=channel_id
+    ).execute()
+    items = response.get('items', [])
+    if not items:
+        raise Exception("Channel not found")
+    playlist_id = items[0]['contentDetails']['relatedPlaylists']['uploads']
+    cache.set_uploads_playlist(channel_id, playlist_id)
+    return playlist_id
 
-        if not next_page_token:
-            break
 
+def get_videos(video_ids, part=VIDEO_PARTS):
+    """Fetches video resources with one videos().list call per 50 IDs."""
+    youtube = get_client()
+    videos = []
+    for offset in range(0, len(video_ids), MAX_RESULTS):
+        res = youtube.videos().list(
+            part=part,
+            id=",".join(video_ids[offset:offset + MAX_RESULTS]),
+            maxResults=MAX_RESULTS
+        ).execute()
+        videos.extend(res.get('items', []))
     return videos
 
-def get_live_streams(channel_id):
-    youtube = build('youtube', 'v3', developerKey=YOUTUBE_API_KEY)
 
-    live_streams = []
+def iter_new_upload_ids(channel_id, cache=video_cache):
+    """
+    Yields the IDs of uploads not in the cache, walking the channel's uploads
+    playlist (newest first, 1 quota unit per page) and stopping after the
+    first page that holds only known videos.
+    """
+    youtube = get_client()
+    playlist_id = get_uploads_playlist_id(channel_id, cache=cache)
     next_page_token = None
 
     while True:
-        res = youtube.search().list(
-            part='snippet',
-            channelId=channel_id,
-            eventType='live',
-            type='video',
-            order='date',
-            maxResults=50,
+        res = youtube.playlistItems().list(
+            part='contentDetails',
+            playlistId=playlist_id,
+            maxResults=MAX_RESULTS,
             pageToken=next_page_token
         ).execute()
 
-        live_streams.extend(res['items'])
+        new_ids = [item['contentDetails']['videoId'] for item in res.get('items', [])
+                   if not cache.has(item['contentDetails']['videoId'])]
+        yield from new_ids
         next_page_token = res.get('nextPageToken')
 
-        if not next_page_token:
+        if not next_page_token or not new_ids:
             break
 
-    return live_streams
+
+def get_channel_videos(channel_id, cache=video_cache):
+    """
+    Returns the channel's videos (videos().list resources), newest first.
+    Only uploads not seen by a previous call are fetched.
+    """
+    new_ids = list(iter_new_upload_ids(channel_id, cache=cache))
+    if new_ids:
+        cache.put(get_videos(new_ids))
+    return cache.videos(channel_id)
+
+
+def get_live_streams(channel_id, cache=video_cache):
+    """
+    Returns the channel's videos that are live right now. Only new uploads
+    and videos that were live or upcoming at the last listing are refreshed.
+    """
+    videos = get_channel_videos(channel_id, cache=cache)
+    candidate_ids = [v['id'] for v in videos
+                     if v.get('snippet', {}).get('liveBroadcastContent') in ('live', 'upcoming')]
+    if not candidate_ids:
+        return []
+    refreshed = get_videos(candidate_ids)
+    cache.put(refreshed)
+    return [v for v in refreshed if v['snippet'].get('liveBroadcastContent') == 'live']
+
 
 if __name__ == "__main__":
     custom_url = "EthereumProtocol"
@@ -85,13 +210,13 @@ if __name__ == "__main__":
     videos = get_channel_videos(channel_id)
     print("Videos:")
     for video in videos:
-        video_id = video['id']['videoId']
+        video_id = video['id']
         title = video['snippet']['title']
         print(f"{title}: https://www.youtube.com/watch?v={video_id}")
 
     live_streams = get_live_streams(channel_id)
     print("\nLive Streams:")
     for stream in live_streams:
-        stream_id = stream['id']['videoId']
+        stream_id = stream['id']
         title = stream['snippet']['title']
-        print(f"{title}: https://www.youtube.com/watch?v={stream_id}") 
\ No newline at end of file
+        print(f"{title}: https://www.youtube.com/watch?v={stream_id}")
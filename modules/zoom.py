@@ -1,21 +1,224 @@
 import requests
+from modules import http_client, downloader
 import os
-from datetime import datetime, timedelta
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
 import json
 
-account_id=os.environ["ZOOM_ACCOUNT_ID"]
-client_id=os.environ["ZOOM_CLIENT_ID"]
-client_secret=os.environ["ZOOM_CLIENT_SECRET"]
-
 auth_token_url = "https://zoom.us/oauth/token"
 api_base_url = "https://api.zoom.us/v2"
 
-def create_meeting(topic, start_time, duration):
+# Recordings listing limits: Zoom caps page_size at 300 and the from/to range at one month
+RECORDINGS_PAGE_SIZE = 300
+RECORDINGS_MAX_RANGE_DAYS = 30
+RECORDINGS_STATE_FILE = os.environ.get("ZOOM_RECORDINGS_STATE_FILE", "zoom_recordings_state.json")
+
+
+class ZoomTokenProvider:
+    """
+    Caches the Server-to-Server OAuth (account credentials) token.
+
+    The token is reused until it is within `refresh_margin` seconds of the
+    `expires_in` returned by Zoom, then fetched again. Access is guarded by a
+    lock so concurrent callers share a single refresh. When `cache_file` is
+    set, the token is also persisted there so consecutive CLI invocations in
+    the same job reuse it.
+    """
+
+    def __init__(self, account_id=None, client_id=None, client_secret=None,
+                 cache_file=None, refresh_margin=300):
+        self._account_id = account_id
+        self._client_id = client_id
+        self._client_secret = client_secret
+        self.cache_file = cache_file
+        self.refresh_margin = refresh_margin
+        self._lock = threading.Lock()
+        self._access_token = None
+        self._expires_at = 0.0
+
+    @property
+    def account_id(self):
+        return self._account_id or os.environ["ZOOM_ACCOUNT_ID"]
+
+    @property
+    def client_id(self):
+        return self._client_id or os.environ["ZOOM_CLIENT_ID"]
+
+    @property
+    def client_secret(self):
+        return self._client_secret or os.environ["ZOOM_CLIENT_SECRET"]
+
+    def get_token(self, force_refresh=False):
+        with self._lock:
+            if not force_refresh:
+                if self._is_fresh():
+                    return self._access_token
+                if self._load_from_file() and self._is_fresh():
+                    return self._access_token
+            self._fetch_token()
+            return self._access_token
+
+    def invalidate(self):
+        """Drops the cached token, e.g. after Zoom answered 401."""
+        with self._lock:
+            self._access_token = None
+            self._expires_at = 0.0
+            if self.cache_file and os.path.exists(self.cache_file):
+                try:
+                    os.remove(self.cache_file)
+                except OSError as e:
+                    print(f"Unable to remove Zoom token cache file: {e}")
+
+    def _is_fresh(self):
+        return bool(self._access_token) and time.time() < self._expires_at - self.refresh_margin
+
+    def _fetch_token(self):
+        data = {
+            "grant_type": "account_credentials",
+            "account_id": self.account_id,
+            "client_secret": self.client_secret
+        }
+        requested_at = time.time()
+        response = http_client.post(auth_token_url,
+                                    auth=(self.client_id, self.client_secret),
+                                    data=data)
+        if response.status_code != 200:
+            print("Unable to get access token")
+            response.raise_for_status()
+
+        response_data = response.json()
+        self._access_token = response_data["access_token"]
+        # Zoom tokens are valid for one hour unless stated otherwise
+        self._expires_at = requested_at + int(response_data.get("expires_in", 3600))
+        self._save_to_file()
+
+    def _load_from_file(self):
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return False
+        try:
+            with open(self.cache_file, "r") as f:
+                cached = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable Zoom token cache file: {e}")
+            return False
+        # Never hand out a token that was issued for other credentials
+        if cached.get("account_id") != self.account_id or cached.get("client_id") != self.client_id:
+            return False
+        self._access_token = cached.get("access_token")
+        self._expires_at = float(cached.get("expires_at", 0))
+        return True
+
+    def _save_to_file(self):
+        if not self.cache_file:
+            return
+        payload = {
+            "account_id": self.account_id,
+            "client_id": self.client_id,
+            "access_token": self._access_token,
+            "expires_at": self._expires_at,
+        }
+        tmp_path = f"{self.cache_file}.tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self.cache_file)
+        except OSError as e:
+            print(f"Unable to persist Zoom token cache file: {e}")
+
+
+token_provider = ZoomTokenProvider(cache_file=os.environ.get("ZOOM_TOKEN_CACHE_FILE"))
+
+
+class RecordingCache:
+    """
+    Per-run cache of `/meetings/{id}/recordings` responses.
+
+    Entries are stored under the requested key and the UUID of the returned
+    recording instance, never under the meeting ID of a by-UUID lookup: for
+    a recurring meeting that ID resolves to the latest occurrence, not to
+    this one. Entries expire after `ttl` seconds (download URLs in the
+    payload are short-lived). When `cache_file` is set, entries are also
+    persisted there so the poller and the uploader can share them within
+    one job.
+    """
+
+    def __init__(self, ttl=900, cache_file=None):
+        self.ttl = ttl
+        self.cache_file = cache_file
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._loaded = False
+
+    def get(self, key):
+        with self._lock:
+            self._load_from_file()
+            entry = self._entries.get(str(key))
+            if entry is None:
+                return None
+            if time.time() - entry["fetched_at"] > self.ttl:
+                self._entries.pop(str(key), None)
+                return None
+            return entry["data"]
+
+    def put(self, key, data):
+        entry = {"fetched_at": time.time(), "data": data}
+        keys = {str(key)}
+        if data.get("uuid"):
+            keys.add(str(data["uuid"]))
+        with self._lock:
+            self._load_from_file()
+            for k in keys:
+                self._entries[k] = entry
+            self._save_to_file()
+
+    def invalidate(self, key=None):
+        """Drops one meeting (by ID or UUID), or everything when key is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                entry = self._entries.pop(str(key), None)
+                if entry is not None:
+                    self._entries = {k: v for k, v in self._entries.items() if v["data"] != entry["data"]}
+            self._save_to_file()
+
+    def _load_from_file(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, "r") as f:
+                self._entries.update(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable Zoom recording cache file: {e}")
+
+    def _save_to_file(self):
+        if not self.cache_file:
+            return
+        now = time.time()
+        live = {k: v for k, v in self._entries.items() if now - v["fetched_at"] <= self.ttl}
+        try:
+            fd = os.open(f"{self.cache_file}.tmp", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump(live, f)
+            os.replace(f"{self.cache_file}.tmp", self.cache_file)
+        except OSError as e:
+            print(f"Unable to persist Zoom recording cache file: {e}")
+
 
-    access_token = get_access_token()
+recording_cache = RecordingCache(
+    ttl=int(os.environ.get("ZOOM_RECORDING_CACHE_TTL", 900)),
+    cache_file=os.environ.get("ZOOM_RECORDING_CACHE_FILE")
+)
+
+def _create_meeting(topic, start_time, duration, recurrence=None):
 
     headers = {
-        "Authorization": f"Bearer {access_token}",
         "Content-Type": "application/json"
     }
     
@@ -43,9 +246,13 @@ def create_meeting(topic, start_time, duration):
             },
         }
     }
-    resp = requests.post(f"{api_base_url}/users/me/meetings", 
-                            headers=headers, 
-                            json=payload)
+    if recurrence:
+        payload["type"] = 8  # Recurring meeting with fixed time
+        payload["timezone"] = "UTC"
+        payload["recurrence"] = build_recurrence(recurrence, start_time)
+    resp = api_request("POST", f"{api_base_url}/users/me/meetings",
+                       headers=headers,
+                       json=payload)
     
     if resp.status_code!=201:
         print("Unable to generate meeting link")
@@ -62,125 +269,367 @@ def create_meeting(topic, start_time, duration):
                 "status":1
     }
     print(content)
+    return response_data
+
+
+def create_meeting(topic, start_time, duration):
+    response_data = _create_meeting(topic, start_time, duration)
     return response_data["join_url"], response_data["id"]
 
-def get_access_token():
-    data = {
-    "grant_type": "account_credentials",
-    "account_id": account_id,
-    "client_secret": client_secret
-    }
-    response = requests.post(auth_token_url, 
-                                auth=(client_id, client_secret), 
-                                data=data)
-    
-    if response.status_code!=200:
-        print("Unable to get access token")
-        response.raise_for_status()
-    else:
-        response_data = response.json()
-        return response_data["access_token"]
 
-def get_meeting_recording(meeting_id):
-    access_token = get_access_token()
-    headers = {
-        "Authorization": f"Bearer {access_token}"
+def create_recurring_meeting(topic, start_time, duration, recurrence):
+    """
+    Creates one recurring meeting (type 8) for a whole series.
+
+    :param recurrence: As returned by issue_parser.parse_recurrence()
+    :return: (join_url, meeting_id, occurrences) where occurrences are
+             {"occurrence_id", "start_time", "duration"} dicts
+    """
+    response_data = _create_meeting(topic, start_time, duration, recurrence=recurrence)
+    return response_data["join_url"], response_data["id"], _occurrences(response_data)
+
+
+RECURRENCE_TYPES = {"daily": 1, "weekly": 2, "monthly": 3}
+# Zoom's limits for `repeat_interval`
+MAX_REPEAT_INTERVALS = {"daily": 90, "weekly": 12, "monthly": 3}
+
+
+def validate_recurrence(recurrence):
+    """Raises ValueError when a parsed recurrence spec exceeds Zoom's limits."""
+    limit = MAX_REPEAT_INTERVALS[recurrence["frequency"]]
+    if not 1 <= recurrence["interval"] <= limit:
+        raise ValueError(
+            f"Invalid recurrence interval {recurrence['interval']}: "
+            f"{recurrence['frequency']} meetings repeat at most every {limit} units"
+        )
+
+
+def build_recurrence(recurrence, start_time):
+    """Zoom `recurrence` object for a parsed recurrence spec starting at `start_time`."""
+    validate_recurrence(recurrence)
+    start_dt = datetime.fromisoformat(start_time.replace("Z", "+00:00"))
+    zoom_recurrence = {
+        "type": RECURRENCE_TYPES[recurrence["frequency"]],
+        "repeat_interval": recurrence["interval"],
+        "end_times": recurrence["count"],
     }
-    url = f"{api_base_url}/meetings/{meeting_id}/recordings"
+    if recurrence["frequency"] == "weekly":
+        # Zoom numbers weekdays from 1 (Sunday) to 7 (Saturday)
+        zoom_recurrence["weekly_days"] = str((start_dt.weekday() + 1) % 7 + 1)
+    elif recurrence["frequency"] == "monthly":
+        zoom_recurrence["monthly_day"] = start_dt.day
+    return zoom_recurrence
 
-    response = requests.get(url, headers=headers)
-    if response.status_code != 200:
-        error_details = response.json()
-        print(f"Error fetching meeting recording: {response.status_code} {response.reason} - {error_details}")
-        return None
 
-    return response.json()
+def _occurrences(meeting_data):
+    return [
+        {
+            "occurrence_id": str(occurrence["occurrence_id"]),
+            "start_time": occurrence.get("start_time"),
+            "duration": occurrence.get("duration"),
+        }
+        for occurrence in meeting_data.get("occurrences", [])
+    ]
 
-def get_meeting_transcript(meeting_id):
+
+def get_meeting_occurrences(meeting_id):
+    """Returns the occurrences of a recurring meeting, past ones included."""
+    resp = api_request("GET", f"{api_base_url}/meetings/{meeting_id}",
+                       params={"show_previous_occurrences": "true"})
+    if resp.status_code != 200:
+        print(f"Unable to get meeting {meeting_id}: {resp.text}")
+        resp.raise_for_status()
+    return _occurrences(resp.json())
+
+
+def match_occurrence(occurrences, recording_start, tolerance=timedelta(hours=12)):
     """
-    Fetches the transcript file content for a given meeting ID.
+    Returns the occurrence whose scheduled start is closest to a recording's
+    start time (calls rarely start on the minute), or None when no occurrence
+    is within `tolerance`.
+    """
+    if not recording_start:
+        return None
+    started = datetime.fromisoformat(recording_start.replace("Z", "+00:00"))
+    best = None
+    best_delta = tolerance
+    for occurrence in occurrences:
+        if not occurrence.get("start_time"):
+            continue
+        scheduled = datetime.fromisoformat(occurrence["start_time"].replace("Z", "+00:00"))
+        delta = abs(started - scheduled)
+        if delta <= best_delta:
+            best, best_delta = occurrence, delta
+    return best
 
-    :param meeting_id: The Zoom meeting ID
-    :return: Transcript text content
+def update_meeting(meeting_id, topic=None, start_time=None, duration=None, recurrence=None,
+                   clear_recurrence=False):
     """
-    access_token = get_access_token()
+    Reschedules/renames an existing meeting (PATCH /meetings/{id}); only the
+    given fields are sent. The join URL and meeting ID stay the same.
+    Passing `recurrence` (with `start_time`) turns it into, or updates, a
+    recurring series; `clear_recurrence` turns a series back into a single
+    scheduled meeting.
+    """
+    payload = {}
+    if recurrence is not None:
+        payload["type"] = 8
+        payload["timezone"] = "UTC"
+        payload["recurrence"] = build_recurrence(recurrence, start_time)
+    elif clear_recurrence:
+        payload["type"] = 2
+    if topic is not None:
+        payload["topic"] = topic
+    if start_time is not None:
+        payload["start_time"] = start_time
+    if duration is not None:
+        payload["duration"] = duration
+
     headers = {
-        "Authorization": f"Bearer {access_token}"
+        "Content-Type": "application/json"
     }
-    url = f"{api_base_url}/meetings/{meeting_id}/recordings"
-    response = requests.get(url, headers=headers)
+    resp = api_request("PATCH", f"{api_base_url}/meetings/{meeting_id}",
+                       headers=headers,
+                       json=payload)
+    if resp.status_code != 204:
+        print(f"Unable to update meeting {meeting_id}: {resp.text}")
+        resp.raise_for_status()
+
+def get_access_token(force_refresh=False):
+    """
+    Returns a valid Zoom access token, reusing the cached one when possible.
+    """
+    return token_provider.get_token(force_refresh=force_refresh)
+
+def api_request(method, url, headers=None, **kwargs):
+    """
+    Sends a Zoom API request with the cached access token. A 401 means the
+    token was revoked or expired early: it is dropped and the request is
+    retried once with a fresh one.
+    """
+    for attempt in range(2):
+        request_headers = dict(headers or {}, Authorization=f"Bearer {get_access_token()}")
+        resp = http_client.request(method, url, headers=request_headers, **kwargs)
+        if resp.status_code != 401 or attempt:
+            return resp
+        print("Zoom rejected the access token, fetching a new one")
+        token_provider.invalidate()
+
+def _encode_meeting_id(meeting_id):
+    """
+    Meeting IDs are used as-is; UUIDs that start with '/' or contain '//'
+    must be double URL-encoded per the Zoom API docs.
+    """
+    meeting_id = str(meeting_id)
+    if meeting_id.startswith("/") or "//" in meeting_id:
+        return requests.utils.quote(requests.utils.quote(meeting_id, safe=''), safe='')
+    return requests.utils.quote(meeting_id, safe='')
+
+def get_meeting_recording(meeting_id, use_cache=True, raise_on_error=False):
+    """
+    Fetches the recording metadata of a meeting (by meeting ID or UUID).
+
+    Responses are kept in `recording_cache` so the transcript, summary and
+    upload paths hit the recordings endpoint once per meeting per run.
+
+    :param use_cache: Set to False to always ask Zoom (e.g. while waiting for a recording)
+    :param raise_on_error: Raise instead of returning None on a non-200 response
+    """
+    if use_cache:
+        cached = recording_cache.get(meeting_id)
+        if cached is not None:
+            return cached
+
+    url = f"{api_base_url}/meetings/{_encode_meeting_id(meeting_id)}/recordings"
+
+    response = api_request("GET", url)
     if response.status_code != 200:
-        print(f"Error fetching meeting recordings: {response.status_code} {response.text}")
-        response.raise_for_status()
+        print(f"Error fetching meeting recording: {response.status_code} {response.reason} - {response.text}")
+        if raise_on_error:
+            response.raise_for_status()
+        return None
+
     data = response.json()
+    recording_cache.put(meeting_id, data)
+    return data
+
+def get_transcript_file(meeting_id):
+    """
+    Returns the TRANSCRIPT entry of a meeting's (or recording instance UUID's)
+    recording files, or None when Zoom has no transcript for it.
+    """
+    data = get_meeting_recording(meeting_id, raise_on_error=True)
     recording_files = data.get('recording_files', [])
 
     # Find the transcript file
-    transcript_file = None
     for file in recording_files:
         if file.get('file_type') == 'TRANSCRIPT':
-            transcript_file = file
-            break
+            if not file.get('download_url'):
+                raise ValueError("Transcript download URL not found.")
+            return file
+
+    print(f"No transcript found for meeting {meeting_id} - available files: {recording_files}")
+    return None
 
+def get_meeting_transcript(meeting_id):
+    """
+    Fetches the transcript file content for a given meeting ID.
+
+    :param meeting_id: The Zoom meeting ID
+    :return: Transcript text content
+    """
+    transcript_file = get_transcript_file(meeting_id)
     if not transcript_file:
-        print(f"No transcript found for meeting {meeting_id} - available files: {recording_files}")
         return None
 
-    download_url = transcript_file.get('download_url')
-    if not download_url:
-        raise ValueError("Transcript download URL not found.")
-
     # Download the transcript file
-    transcript_content = download_zoom_file(download_url, access_token)
+    transcript_content = download_zoom_file(transcript_file['download_url'], get_access_token())
     return transcript_content
 
-def download_zoom_file(download_url, access_token):
+def iter_zoom_file_chunks(download_url, access_token, chunk_size=64 * 1024):
+    """Streams a Zoom file as byte chunks without holding it in memory."""
+    headers = {"Authorization": f"Bearer {access_token}"}
+    with http_client.get(download_url, headers=headers, stream=True) as resp:
+        if resp.status_code != 200:
+            print(f"Error downloading file: {resp.status_code} {resp.text}")
+            resp.raise_for_status()
+        yield from resp.iter_content(chunk_size=chunk_size)
+
+def download_zoom_file(download_url, access_token, dest_path=None):
     """
     Downloads a file from Zoom using the access token.
 
+    Goes through modules.downloader, so large files are fetched in parallel
+    ranges when Zoom's CDN supports them.
+
     :param download_url: The URL to the file
     :param access_token: Zoom access token
-    :return: Content of the file
+    :param dest_path: Optional path to write the file to instead of returning it
+    :return: Content of the file, or dest_path when given
     """
-    response = requests.get(download_url, headers={"Authorization": f"Bearer {access_token}"})
-    if response.status_code != 200:
-        print(f"Error downloading file: {response.status_code} {response.text}")
-        response.raise_for_status()
-    return response.content.decode('utf-8')
+    headers = {"Authorization": f"Bearer {access_token}"}
+    if dest_path:
+        path = dest_path
+    else:
+        with tempfile.NamedTemporaryFile(delete=False) as tmp:
+            path = tmp.name
+    try:
+        downloader.download_file(download_url, path, headers=headers)
+        if dest_path:
+            return dest_path
+        with open(path, "rb") as f:
+            return f.read().decode('utf-8')
+    except requests.HTTPError as e:
+        print(f"Error downloading file: {e.response.status_code} {e.response.text}")
+        raise
+    finally:
+        if not dest_path and os.path.exists(path):
+            os.unlink(path)
+
+def iter_recordings(from_date=None, to_date=None, page_size=RECORDINGS_PAGE_SIZE):
+    """
+    Yields cloud recordings (one dict per meeting instance) between from_date
+    and to_date, following `next_page_token` until every page is read.
+
+    :param from_date: Start of the window (date or datetime, UTC). Defaults to 7 days ago.
+    :param to_date: End of the window (date or datetime, UTC). Defaults to today.
+    :param page_size: Records per page (Zoom allows at most 300)
+    """
+    to_date = to_date or datetime.utcnow()
+    from_date = from_date or (to_date - timedelta(days=7))
+    to_day = to_date.date() if isinstance(to_date, datetime) else to_date
+    window_start = from_date.date() if isinstance(from_date, datetime) else from_date
+
+    # Zoom rejects ranges longer than a month, so walk the window in slices
+    while window_start <= to_day:
+        window_end = min(window_start + timedelta(days=RECORDINGS_MAX_RANGE_DAYS - 1), to_day)
+        next_page_token = ""
+        while True:
+            params = {
+                "page_size": page_size,
+                "from": window_start.strftime("%Y-%m-%d"),
+                "to": window_end.strftime("%Y-%m-%d"),
+            }
+            if next_page_token:
+                params["next_page_token"] = next_page_token
+            response = api_request("GET", f"{api_base_url}/users/me/recordings", params=params)
+            if response.status_code != 200:
+                print(f"Error fetching recordings: {response.status_code} {response.text}")
+                response.raise_for_status()
+            data = response.json()
+            yield from data.get("meetings", [])
+            next_page_token = data.get("next_page_token")
+            if not next_page_token:
+                break
+        window_start = window_end + timedelta(days=1)
 
 def get_recordings_list():
     """
-    Retrieves a list of cloud recordings for the user.
+    Retrieves the list of cloud recordings for the user over the last 7 days.
     """
-    access_token = get_access_token()
-    headers = {
-        "Authorization": f"Bearer {access_token}"
-    }
-    params = {
-        "page_size": 100,
-        "from": (datetime.utcnow() - timedelta(days=7)).strftime("%Y-%m-%d"),  # Adjust time range as needed
-        "to": datetime.utcnow().strftime("%Y-%m-%d")
-    }
-    response = requests.get(f"{api_base_url}/users/me/recordings", headers=headers, params=params)
-    if response.status_code != 200:
-        print(f"Error fetching recordings: {response.status_code} {response.text}")
-        response.raise_for_status()
-    data = response.json()
-    return data.get("meetings", [])
+    return list(iter_recordings())
+
+def get_recording_end_time(meeting):
+    """
+    Returns the end of a recording-list entry as an aware UTC datetime, using
+    `end_time` when present and the latest `recording_end` otherwise.
+    """
+    end_time_str = meeting.get("end_time")
+    if not end_time_str:
+        ends = [f.get("recording_end") for f in meeting.get("recording_files", []) if f.get("recording_end")]
+        end_time_str = max(ends) if ends else None
+    if not end_time_str:
+        return None
+    return datetime.strptime(end_time_str, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+
+def load_recordings_high_water(state_file=RECORDINGS_STATE_FILE):
+    """
+    Returns the persisted recordings high-water mark, or None on the first run.
+    """
+    if not state_file or not os.path.exists(state_file):
+        return None
+    try:
+        with open(state_file, "r") as f:
+            value = json.load(f).get("high_water_end_time")
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable recordings state file: {e}")
+        return None
+    if not value:
+        return None
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+
+def save_recordings_high_water(end_time, state_file=RECORDINGS_STATE_FILE):
+    """
+    Persists the end time up to which every recording has been handled.
+    """
+    with open(state_file, "w") as f:
+        json.dump({"high_water_end_time": end_time.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")}, f, indent=2)
+
+def iter_new_recordings(high_water=None, overlap=timedelta(hours=6), lookback=timedelta(days=7)):
+    """
+    Yields only the recordings that ended after `high_water - overlap`.
+
+    Without a high-water mark (first run) the last `lookback` is scanned. The
+    overlap re-reads a margin before the mark so recordings that Zoom lists
+    late are not missed.
+    """
+    now = datetime.now(timezone.utc)
+    since = (high_water - overlap) if high_water else (now - lookback)
+    for meeting in iter_recordings(from_date=since, to_date=now):
+        end_time = get_recording_end_time(meeting)
+        if end_time is None or end_time >= since:
+            yield meeting
 
 def get_meeting_summary(meeting_uuid: str) -> dict:
     """Temporary workaround for summary endpoint"""
     try:
-        # First try with server-to-server token
-        access_token = get_access_token()
-        headers = {"Authorization": f"Bearer {access_token}"}
         encoded_uuid = requests.utils.quote(meeting_uuid, safe='')
         
         print(f"Attempting summary with UUID: {encoded_uuid}")  # Debug
         
-        response = requests.get(
-            f"https://api.zoom.us/v2/meetings/{encoded_uuid}/meeting_summary",
-            headers=headers
+        response = api_request(
+            "GET",
+            f"https://api.zoom.us/v2/meetings/{encoded_uuid}/meeting_summary"
         )
         
         print(f"API Response: {response.status_code}")  # Debug
@@ -0,0 +1,110 @@
+"""
+Counts the TCP connections opened during a simulated poller run, once with
+bare `requests` calls and once through the pooled sessions of
+modules.http_client.
+
+Three local stub servers stand in for Zoom, Discourse and Telegram. For every
+meeting the simulated run issues the same calls the poller does: token,
+recording metadata, summary, topic posts, create post and Telegram message.
+
+Usage:
+    python scripts/bench_http_connections.py --meetings 20
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import http_client  # noqa: E402
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        body = json.dumps({"access_token": "stub", "expires_in": 3600, "post_stream": {"posts": []}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _reply
+    do_POST = _reply
+    do_PUT = _reply
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CountingServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.connections = 0
+        self._count_lock = threading.Lock()
+
+    def process_request(self, request, client_address):
+        with self._count_lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+def simulate_poller_run(client, zoom_url, discourse_url, telegram_url, meetings):
+    for meeting_id in range(meetings):
+        client.post(f"{zoom_url}/oauth/token", data={"grant_type": "account_credentials"})
+        client.get(f"{zoom_url}/v2/meetings/{meeting_id}/recordings")
+        client.get(f"{zoom_url}/v2/meetings/{meeting_id}/meeting_summary")
+        client.get(f"{discourse_url}/t/{meeting_id}/posts.json")
+        client.post(f"{discourse_url}/posts.json", data=json.dumps({"raw": "summary"}))
+        client.post(f"{telegram_url}/botTOKEN/sendMessage", data={"text": "summary"})
+
+
+def run(client, meetings):
+    servers = [CountingServer() for _ in range(3)]
+    for server in servers:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        started = time.perf_counter()
+        simulate_poller_run(client, *(s.url for s in servers), meetings=meetings)
+        elapsed = time.perf_counter() - started
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+    return sum(s.connections for s in servers), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark connections opened per simulated poller run.")
+    parser.add_argument("--meetings", type=int, default=20, help="Number of meetings to simulate")
+    args = parser.parse_args()
+
+    requests_per_run = args.meetings * 6
+    bare_connections, bare_elapsed = run(requests, args.meetings)
+    pooled_connections, pooled_elapsed = run(http_client, args.meetings)
+    http_client.close_all()
+
+    print(f"Simulated poller run: {args.meetings} meetings, {requests_per_run} requests")
+    print(f"  bare requests : {bare_connections:4d} connections, {bare_elapsed * 1000:8.1f} ms")
+    print(f"  http_client   : {pooled_connections:4d} connections, {pooled_elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,57 +1,10 @@
 import os
-import json
 import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 import pytz
-from modules import zoom, transcript
-from github import Github, InputGitAuthor
-
-MAPPING_FILE = "meeting_topic_mapping.json"
-
-def load_meeting_topic_mapping():
-    if os.path.exists(MAPPING_FILE):
-        with open(MAPPING_FILE, "r") as f:
-            return json.load(f)
-    return {}
-
-def save_meeting_topic_mapping(mapping):
-    with open(MAPPING_FILE, "w") as f:
-        json.dump(mapping, f, indent=2)
-
-def commit_mapping_file():
-    commit_message = "Update meeting-topic mapping"
-    branch = os.environ.get("GITHUB_REF_NAME", "main")
-    token = os.environ["GITHUB_TOKEN"]
-    repo_name = os.environ["GITHUB_REPOSITORY"]
-    g = Github(token)
-    repo = g.get_repo(repo_name)
-    author = InputGitAuthor(
-        name="GitHub Actions Bot",
-        email="actions@github.com"
-    )
-    file_path = MAPPING_FILE
-    with open(file_path, "r") as f:
-        file_content = f.read()
-    try:
-        contents = repo.get_contents(file_path, ref=branch)
-        repo.update_file(
-            path=contents.path,
-            message=commit_message,
-            content=file_content,
-            sha=contents.sha,
-            branch=branch,
-            author=author,
-        )
-        print(f"Updated {file_path} in the repository.")
-    except Exception:
-        repo.create_file(
-            path=file_path,
-            message=commit_message,
-            content=file_content,
-            branch=branch,
-            author=author,
-        )
-        print(f"Created {file_path} in the repository.")
+from modules import zoom, transcript, discourse, http_client, store, mapping_commit
+
 
 def is_meeting_eligible(meeting_end_time):
     """
@@ -61,12 +14,87 @@ def is_meeting_eligible(meeting_end_time):
     time_difference = now_utc - meeting_end_time
     return time_difference >= timedelta(hours=4)
 
+def advance_high_water(latest_end_time, pending_end_times):
+    """
+    Moves the recordings high-water mark up to the newest recording seen, but
+    never past one that still needs handling (not yet eligible or failed), so
+    that it is listed again on the next run.
+    """
+    new_mark = min(pending_end_times) if pending_end_times else latest_end_time
+    if new_mark is None:
+        return
+    zoom.save_recordings_high_water(new_mark)
+    print(f"Recordings high-water mark set to {new_mark.isoformat()}")
+
+def process_meeting(meeting_id, topic, recording_uuid=None, occurrence_id=None):
+    """
+    Posts the transcript of one meeting (or one occurrence of a recurring
+    meeting) and returns its new mapping entry.
+    """
+    if occurrence_id is not None:
+        print(f"Processing meeting {meeting_id} occurrence {occurrence_id}: {topic}")
+        # Attribute this recording instance to its occurrence
+        store.update_occurrence(meeting_id, occurrence_id, uuid=recording_uuid)
+    else:
+        print(f"Processing meeting {meeting_id}: {topic}")
+    # Get actual topic ID from successful transcript post
+    topic_id = transcript.post_zoom_transcript_to_discourse(
+        meeting_id,
+        recording_uuid=recording_uuid,
+        occurrence_id=occurrence_id
+    )
+    entry = {"discourse_topic_id": topic_id}
+    # The Zoom topic ("Issue N: ...") is only a fallback for the issue title handle_issue stores
+    if not (store.get_meeting(meeting_id) or {}).get("issue_title"):
+        entry["issue_title"] = topic
+    return entry
+
+def process_meetings(meetings_to_process, workers=1):
+    """
+    Processes the eligible meetings, in parallel when workers > 1.
+    Items are (meeting_id, topic, end_time, recording_uuid, occurrence_id).
+    Returns ({(meeting_id, occurrence_id): mapping entry},
+             {(meeting_id, occurrence_id): exception}).
+    """
+    results = {}
+    errors = {}
+    if workers <= 1:
+        for meeting_id, topic, _, recording_uuid, occurrence_id in meetings_to_process:
+            try:
+                results[(meeting_id, occurrence_id)] = process_meeting(meeting_id, topic, recording_uuid, occurrence_id)
+            except Exception as e:
+                errors[(meeting_id, occurrence_id)] = e
+        return results, errors
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(process_meeting, meeting_id, topic, recording_uuid, occurrence_id): (meeting_id, occurrence_id)
+            for meeting_id, topic, _, recording_uuid, occurrence_id in meetings_to_process
+        }
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                errors[key] = e
+    return results, errors
+
 def validate_meeting_id(meeting_id):
     return str(meeting_id).strip()
 
 def main():
     parser = argparse.ArgumentParser(description="Poll Zoom for recordings and post transcripts.")
     parser.add_argument("--force_meeting_id", help="Force processing of a specific Zoom meeting ID")
+    parser.add_argument("--full_scan", action="store_true",
+                        help="Ignore the high-water mark and scan the last 7 days of recordings")
+    parser.add_argument("--overlap_hours", type=float, default=6,
+                        help="Hours re-scanned before the high-water mark (default 6)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of meetings processed in parallel (default 1)")
+    parser.add_argument("--zoom_concurrency", type=int, default=4,
+                        help="Max concurrent Zoom API requests when --workers > 1 (default 4)")
+    parser.add_argument("--discourse_concurrency", type=int, default=2,
+                        help="Max concurrent Discourse requests when --workers > 1 (default 2)")
     args = parser.parse_args()
 
     if args.force_meeting_id:
@@ -74,9 +102,8 @@ def main():
         print(f"Force processing meeting {meeting_id}")
         try:
             # Get discourse_topic_id BEFORE processing
-            mapping = load_meeting_topic_mapping()
-            entry = mapping.get(meeting_id)
-            discourse_topic_id = entry.get("discourse_topic_id") if isinstance(entry, dict) else entry
+            entry = store.get_meeting(meeting_id) or {}
+            discourse_topic_id = entry.get("discourse_topic_id")
             
             if not discourse_topic_id:
                 raise ValueError(f"No Discourse topic mapping found for meeting {meeting_id}")
@@ -84,74 +111,98 @@ def main():
             # Process transcript with verified ID
             transcript.post_zoom_transcript_to_discourse(meeting_id)
             
-            # Update mapping with proper format
-            mapping[meeting_id] = {
-                "discourse_topic_id": discourse_topic_id,
-                "issue_title": entry.get("issue_title", f"Meeting {meeting_id}"),
-                "youtube_video_id": None
-            }
-            save_meeting_topic_mapping(mapping)
-            commit_mapping_file()
+            # Backfill the title for legacy entries
+            store.upsert_meeting(
+                meeting_id,
+                issue_title=entry.get("issue_title") or f"Meeting {meeting_id}"
+            )
+            mapping_commit.request_commit(f"Backfill mapping for meeting {meeting_id}")
+            mapping_commit.flush()
             
         except Exception as e:
             print(f"Error processing meeting {meeting_id}: {e}")
         return
 
-    # Load processed meetings from mapping file
-    mapping = load_meeting_topic_mapping()
-    processed_meetings = set(mapping.keys())
-
-    # Fetch recordings from Zoom
-    recordings = zoom.get_recordings_list()
+    # Fetch only the recordings that ended since the last run's high-water mark
+    high_water = None if args.full_scan else zoom.load_recordings_high_water()
+    if high_water:
+        print(f"Listing recordings since high-water mark {high_water.isoformat()} (overlap {args.overlap_hours}h)")
+    recordings = zoom.iter_new_recordings(
+        high_water=high_water,
+        overlap=timedelta(hours=args.overlap_hours)
+    )
     meetings_to_process = []
+    latest_end_time = high_water
+    pending_end_times = []  # recordings that must be listed again next run
 
     for meeting in recordings:
         meeting_id = str(meeting.get("id"))
-        end_time_str = meeting.get("end_time")
-        if not meeting_id or not end_time_str:
+        meeting_end_time = zoom.get_recording_end_time(meeting)
+        if not meeting_id or not meeting_end_time:
             continue  # Skip if essential data is missing
-
-        # Check if already processed (both formats)
-        existing_entry = mapping.get(meeting_id)
-        if existing_entry:
-            # Handle dictionary format
-            if isinstance(existing_entry, dict) and existing_entry.get("discourse_topic_id"):
-                print(f"Meeting {meeting_id} has already been processed.")
+        latest_end_time = max(latest_end_time, meeting_end_time) if latest_end_time else meeting_end_time
+
+        # Check if already processed (legacy formats are normalized on import)
+        existing_entry = store.get_meeting(meeting_id)
+        recording_uuid = None
+        occurrence_id = None
+        if existing_entry and existing_entry.get("occurrences"):
+            # Recurring series: every occurrence gets its own transcript post
+            occurrence = zoom.match_occurrence(existing_entry["occurrences"], meeting.get("start_time"))
+            if occurrence is None:
+                print(f"Recording {meeting.get('uuid')} of meeting {meeting_id} matches no scheduled occurrence.")
                 continue
-            # Handle legacy string format
-            elif isinstance(existing_entry, (int, str)):
-                print(f"Meeting {meeting_id} has already been processed.")
+            if occurrence.get("transcript_post_id"):
+                print(f"Meeting {meeting_id} occurrence {occurrence['occurrence_id']} has already been processed.")
                 continue
+            recording_uuid = meeting.get("uuid")
+            occurrence_id = occurrence["occurrence_id"]
+        elif existing_entry and existing_entry.get("discourse_topic_id"):
+            print(f"Meeting {meeting_id} has already been processed.")
+            continue
 
-        # Parse end time
-        meeting_end_time = datetime.strptime(end_time_str, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=pytz.utc)
         if is_meeting_eligible(meeting_end_time):
-            meetings_to_process.append((meeting_id, meeting.get("topic")))
+            meetings_to_process.append(
+                (meeting_id, meeting.get("topic"), meeting_end_time, recording_uuid, occurrence_id)
+            )
         else:
             print(f"Meeting {meeting_id} is not yet eligible for processing.")
+            pending_end_times.append(meeting_end_time)
 
     if not meetings_to_process:
         print("No new meetings to process. Exiting.")
+        advance_high_water(latest_end_time, pending_end_times)
         return
 
-    for meeting_id, topic in meetings_to_process:
-        print(f"Processing meeting {meeting_id}: {topic}")
-        try:
-            # Get actual topic ID from successful transcript post
-            topic_id = transcript.post_zoom_transcript_to_discourse(meeting_id)
-            
-            # Update mapping with new format
-            mapping[meeting_id] = {
-                "discourse_topic_id": topic_id,
-                "issue_title": topic,
-                "youtube_video_id": None
-            }
-        except Exception as e:
-            print(f"Error processing meeting {meeting_id}: {e}")
+    if args.workers > 1:
+        discourse_base_url = os.environ.get("DISCOURSE_BASE_URL", "https://ethereum-magicians.org")
+        http_client.set_host_concurrency(zoom.api_base_url, args.zoom_concurrency)
+        http_client.set_host_concurrency(discourse_base_url, args.discourse_concurrency)
+    end_times = {
+        (meeting_id, occurrence_id): end_time
+        for meeting_id, _, end_time, _, occurrence_id in meetings_to_process
+    }
+
+    results, errors = process_meetings(meetings_to_process, workers=args.workers)
+
+    # Store every successful update, then export and commit the snapshot once
+    for (meeting_id, _), entry in results.items():
+        store.upsert_meeting(meeting_id, **entry)
+    for key, error in errors.items():
+        print(f"Error processing meeting {key[0]}: {error}")
+        pending_end_times.append(end_times[key])
+    print(f"Processed {len(results)} meeting(s), {len(errors)} failed.")
+    metrics = discourse.scheduler.metrics()
+    print(
+        f"Discourse API: {metrics['requests']} request(s), {metrics['queued']} queued, "
+        f"{metrics['waited_ms']:.0f} ms waited, {metrics['rate_limited']} rate limited"
+    )
 
-    # Save and commit the updated mapping file
-    save_meeting_topic_mapping(mapping)
-    commit_mapping_file()
+    # Save and commit the updated mapping file (a single commit for the whole run)
+    if results:
+        mapping_commit.request_commit(f"Post transcripts for {len(results)} meeting(s)")
+    mapping_commit.flush()
+    advance_high_water(latest_end_time, pending_end_times)
 
 if __name__ == "__main__":
     main()
@@ -7,7 +7,7 @@ def send_recording_email(meeting_id, recipient_email):
     wait_time = 300  # 5 minutes in seconds
 
     for attempt in range(max_attempts):
-        recording_info = get_meeting_recording(meeting_id)
+        recording_info = get_meeting_recording(meeting_id, use_cache=False)
         if recording_info and recording_info.get('recording_files'):
             for file in recording_info['recording_files']:
                 if file.get('file_type') == 'MP4':
@@ -1,7 +1,6 @@
 import os
 import time
 import tempfile
-import requests
 import argparse
 import google.oauth2.credentials
 import google_auth_oauthlib.flow
@@ -11,11 +10,10 @@ from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from modules import zoom, transcript, discourse
+from modules import zoom, transcript, discourse, media_stream, resumable_upload, store, mapping_commit
 from github import Github
 from google.auth.transport.requests import Request
 import json
-import subprocess
 from modules.zoom import (
     get_meeting_recording,
     get_access_token,
@@ -27,9 +25,6 @@ from google.oauth2 import service_account
 SCOPES = ["https://www.googleapis.com/auth/youtube.upload"]
 CLIENT_SECRETS_FILE = "client_secrets.json"
 
-# Add these functions at the top of the file
-MAPPING_FILE = "meeting_topic_mapping.json"
-
 def get_authenticated_service():
     # Initialize credentials from environment variables
     creds = Credentials(
@@ -46,14 +41,11 @@ def get_authenticated_service():
 
 def video_exists(youtube, meeting_id):
     """Check if video for this meeting ID already exists in mapping"""
-    mapping = load_meeting_topic_mapping()
-    video_id = mapping.get(meeting_id, {}).get("youtube_video_id")
-    if video_id is None or str(video_id).lower() in ("none", "null", ""):
-        return False
-    return True
+    entry = store.get_meeting(meeting_id) or {}
+    return entry.get("youtube_video_id") is not None
 
-def download_zoom_recording(meeting_id):
-    """Download Zoom recording MP4 file to temp location"""
+def get_mp4_recording_file(meeting_id):
+    """Return the MP4 entry of the meeting's recording files, if any"""
     recording_info = get_meeting_recording(meeting_id)
     
     if not recording_info or 'recording_files' not in recording_info:
@@ -61,29 +53,57 @@ def download_zoom_recording(meeting_id):
 
     for file in recording_info['recording_files']:
         if file.get('file_type') == 'MP4' and file.get('download_url'):
-            download_url = file['download_url']
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".mp4")
-            
-            headers = {
-                "Authorization": f"Bearer {get_access_token()}",
-                "Content-Type": "application/json"
-            }
-            
-            response = requests.get(download_url, headers=headers, stream=True)
-            if response.status_code == 200:
-                for chunk in response.iter_content(chunk_size=1024*1024):
-                    if chunk:
-                        temp_file.write(chunk)
-                temp_file.close()
-                return temp_file.name
+            return file
     return None
 
-def upload_recording(meeting_id):
+def download_zoom_recording(meeting_id):
+    """Download Zoom recording MP4 file to temp location"""
+    file = get_mp4_recording_file(meeting_id)
+    if not file:
+        return None
+
+    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".mp4")
+    temp_file.close()
+    try:
+        return zoom.download_zoom_file(file['download_url'], get_access_token(), dest_path=temp_file.name)
+    except Exception as e:
+        print(f"Error downloading recording for meeting {meeting_id}: {e}")
+        os.unlink(temp_file.name)
+        return None
+
+def stream_zoom_recording(meeting_id, chunk_size, checkpoint=None):
+    """
+    Return a media body that pipes the Zoom MP4 download straight into the
+    YouTube resumable upload, without staging the file on disk.
+    When `checkpoint` holds an unfinished upload of the same file, the download
+    starts at the offset that run reached.
+    """
+    file = get_mp4_recording_file(meeting_id)
+    if not file:
+        return None
+
+    start = 0
+    saved = checkpoint.load(meeting_id) if checkpoint else None
+    if saved and saved.get("resumable_uri") and saved.get("size") == file.get('file_size'):
+        start = saved["progress"]
+
+    headers = {
+        "Authorization": f"Bearer {get_access_token()}"
+    }
+    return media_stream.zoom_to_upload(
+        file['download_url'],
+        headers=headers,
+        size=file.get('file_size'),
+        chunksize=chunk_size,
+        start=start
+    )
+
+def upload_recording(meeting_id, stream=False, chunk_size=resumable_upload.DEFAULT_CHUNK_SIZE):
     youtube = get_authenticated_service()
-    mapping = load_meeting_topic_mapping()
+    entry = store.get_meeting(meeting_id) or {}
     
     # Use stored issue title from mapping
-    video_title = mapping.get(meeting_id, {}).get("issue_title", f"Meeting {meeting_id}")
+    video_title = entry.get("issue_title") or f"Meeting {meeting_id}"
     video_description = (
         f"Recording of {video_title}\n\n"
         f"Original Zoom Meeting ID: {meeting_id}"
@@ -93,8 +113,15 @@ def upload_recording(meeting_id):
         print(f"YouTube video already exists for meeting {meeting_id}")
         return
 
-    video_path = download_zoom_recording(meeting_id)
-    if not video_path:
+    chunk_size = resumable_upload.align_chunk_size(chunk_size)
+    checkpoint = resumable_upload.UploadCheckpoint()
+    if stream:
+        video_path = None
+        media = stream_zoom_recording(meeting_id, chunk_size, checkpoint=checkpoint)
+    else:
+        video_path = download_zoom_recording(meeting_id)
+        media = googleapiclient.http.MediaFileUpload(video_path, chunksize=chunk_size, resumable=True) if video_path else None
+    if not media:
         print(f"No MP4 recording available for meeting {meeting_id}")
         return
 
@@ -113,24 +140,23 @@ def upload_recording(meeting_id):
             }
         }
 
-        media = googleapiclient.http.MediaFileUpload(video_path, chunksize=-1, resumable=True)
-        response = youtube.videos().insert(
+        insert_request = youtube.videos().insert(
             part="snippet,status",
             body=request_body,
             media_body=media
-        ).execute()
+        )
+        response = resumable_upload.execute_resumable(insert_request, checkpoint=checkpoint, key=meeting_id)
 
         # Update mapping with YouTube video ID
-        mapping[meeting_id] = mapping.get(meeting_id, {})
-        mapping[meeting_id]["youtube_video_id"] = response['id']
-        save_meeting_topic_mapping(mapping)
-        commit_mapping_file()
+        entry = store.upsert_meeting(meeting_id, youtube_video_id=response['id'])
+        mapping_commit.request_commit(f"Add YouTube video for meeting {meeting_id}")
+        mapping_commit.flush()
         
         youtube_link = f"https://youtu.be/{response['id']}"
         print(f"Uploaded YouTube video: {youtube_link}")
 
         # Post to Discourse (if applicable)
-        discourse_topic_id = mapping[meeting_id].get("discourse_topic_id")
+        discourse_topic_id = entry.get("discourse_topic_id")
         if discourse_topic_id:
             discourse.create_post(
                 topic_id=discourse_topic_id,
@@ -153,47 +179,21 @@ def upload_recording(meeting_id):
     except HttpError as e:
         print(f"YouTube API error: {e}")
     finally:
-        os.unlink(video_path)  # Clean up temp file
+        if video_path:
+            os.unlink(video_path)  # Clean up temp file
+        else:
+            media.close()
 
 def main():
     parser = argparse.ArgumentParser(description="Upload Zoom recording to YouTube")
     parser.add_argument("--meeting_id", required=True, help="Zoom meeting ID to process")
+    parser.add_argument("--stream", action="store_true",
+                        help="Pipe the Zoom download straight into the YouTube upload instead of staging it on disk")
+    parser.add_argument("--chunk_size_mb", type=int, default=32,
+                        help="Resumable upload chunk size in MiB (default 32)")
     args = parser.parse_args()
     
-    upload_recording(args.meeting_id)
-
-def load_meeting_topic_mapping():
-    if os.path.exists(MAPPING_FILE):
-        with open(MAPPING_FILE, "r") as f:
-            return json.load(f)
-    return {}
-
-def save_meeting_topic_mapping(mapping):
-    with open(MAPPING_FILE, "w") as f:
-        json.dump(mapping, f, indent=2)
-
-def commit_mapping_file():
-    """Commit and push changes to the mapping file"""
-    try:
-        # Configure git user (required in CI)
-        subprocess.run(
-            ["git", "config", "--global", "user.email", "actions@github.com"],
-            check=True
-        )
-        subprocess.run(
-            ["git", "config", "--global", "user.name", "GitHub Actions"],
-            check=True
-        )
-        
-        # Commit and push
-        subprocess.run(["git", "add", MAPPING_FILE], check=True)
-        subprocess.run(
-            ["git", "commit", "-m", f"Update YouTube video mapping"],
-            check=True
-        )
-        subprocess.run(["git", "push"], check=True)
-    except subprocess.CalledProcessError as e:
-        print(f"Failed to commit mapping file: {e}")
+    upload_recording(args.meeting_id, stream=args.stream, chunk_size=args.chunk_size_mb * 1024 * 1024)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
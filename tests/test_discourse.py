@@ -0,0 +1,234 @@
+import sys
+import time
+import pathlib
+import threading
+import unittest
+from unittest import mock
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from modules import discourse
+
+
+def transcript_post(post_number, meeting_id, occurrence_id=None):
+    marker = discourse.transcript_marker(meeting_id, occurrence_id)
+    return {
+        "id": 1000 + post_number,
+        "post_number": post_number,
+        "raw": f"Transcript\n\n- {marker}",
+        "cooked": f"<p>Transcript</p><ul><li>{marker}</li></ul>",
+    }
+
+
+class TestFindTranscriptPost(unittest.TestCase):
+
+    def find(self, posts, meeting_id, occurrence_id=None):
+        with mock.patch.object(discourse, "iter_topic_posts", return_value=iter(posts)):
+            return discourse.find_transcript_post(1, meeting_id, occurrence_id=occurrence_id)
+
+    def test_meeting_marker_ignores_occurrence_posts(self):
+        posts = [
+            transcript_post(2, "123", occurrence_id="1700000000000"),
+            transcript_post(3, "1234"),
+        ]
+        self.assertIsNone(self.find(posts, "123"))
+        posts.append(transcript_post(4, "123"))
+        self.assertEqual(self.find(posts, "123")["post_number"], 4)
+
+    def test_occurrence_marker(self):
+        posts = [
+            transcript_post(2, "123", occurrence_id="1700000000000"),
+            transcript_post(3, "123", occurrence_id="1700000600000"),
+        ]
+        self.assertEqual(self.find(posts, "123", "1700000600000")["post_number"], 3)
+        self.assertIsNone(self.find(posts, "123", "170000000000"))
+
+    def test_first_post_is_skipped(self):
+        self.assertIsNone(self.find([transcript_post(1, "123")], "123"))
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def response(status_code=200, headers=None, body=None):
+    resp = mock.Mock(status_code=status_code, headers=headers or {})
+    resp.json.return_value = body or {}
+    return resp
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.bucket = discourse.TokenBucket(rate=1.0, capacity=2, clock=self.clock, sleep=self.clock.sleep)
+
+    def test_burst_then_refill_at_rate(self):
+        self.assertEqual(self.bucket.acquire(), 0)
+        self.assertEqual(self.bucket.acquire(), 0)
+        self.assertAlmostEqual(self.bucket.acquire(), 1.0)
+        self.clock.now += 0.5
+        self.assertAlmostEqual(self.bucket.acquire(), 0.5)
+        # Idle time refills the bucket up to its capacity only
+        self.clock.now += 60
+        self.assertEqual(self.bucket.acquire(), 0)
+        self.assertEqual(self.bucket.acquire(), 0)
+        self.assertGreater(self.bucket.acquire(), 0)
+
+    def test_block_pauses_and_slows_down(self):
+        self.bucket.block(5)
+        self.assertEqual(self.bucket.rate, 0.5)
+        self.assertAlmostEqual(self.bucket.acquire(), 5.0)
+        for _ in range(20):
+            self.bucket.recover()
+        self.assertEqual(self.bucket.rate, 1.0)
+
+    def test_rate_never_drops_below_a_sixteenth(self):
+        for _ in range(10):
+            self.bucket.block(0)
+        self.assertEqual(self.bucket.rate, 1.0 / 16)
+
+
+class TestRequestScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        bucket = discourse.TokenBucket(rate=1.0, capacity=5, clock=self.clock, sleep=self.clock.sleep)
+        self.scheduler = discourse.RequestScheduler(bucket=bucket, max_retries=2)
+
+    def test_429_waits_for_retry_after_and_retries(self):
+        responses = [response(429, {"Retry-After": "30"}), response(200)]
+        with mock.patch.object(discourse.http_client, "request", side_effect=responses) as request:
+            resp = self.scheduler.get("https://forum.example/t/1.json")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(request.call_count, 2)
+        self.assertEqual(self.clock.sleeps, [30])
+        metrics = self.scheduler.metrics()
+        self.assertEqual(metrics["requests"], 2)
+        self.assertEqual(metrics["rate_limited"], 1)
+        self.assertEqual(metrics["waited_ms"], 30000)
+        self.assertEqual(metrics["queued"], 1)
+
+    def test_gives_up_after_max_retries(self):
+        with mock.patch.object(discourse.http_client, "request", return_value=response(429)) as request:
+            resp = self.scheduler.post("https://forum.example/posts.json")
+        self.assertEqual(resp.status_code, 429)
+        self.assertEqual(request.call_count, 3)
+        self.assertEqual(self.scheduler.metrics()["rate_limited"], 3)
+
+    def test_writes_are_sent_one_at_a_time(self):
+        entered, release = threading.Event(), threading.Event()
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def request(method, url, **kwargs):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            entered.set()
+            release.wait(5)
+            with lock:
+                active[0] -= 1
+            return response(200)
+
+        with mock.patch.object(discourse.http_client, "request", side_effect=request):
+            first = threading.Thread(target=self.scheduler.post, args=("https://forum.example/posts.json",))
+            first.start()
+            entered.wait(5)
+            second = threading.Thread(target=self.scheduler.put, args=("https://forum.example/posts/1.json",))
+            second.start()
+            time.sleep(0.05)
+            release.set()
+            first.join(5)
+            second.join(5)
+        self.assertEqual(peak[0], 1)
+        self.assertEqual(self.scheduler.metrics()["queued"], 1)
+
+
+class TestRetryAfter(unittest.TestCase):
+
+    def test_header_body_and_default(self):
+        self.assertEqual(discourse._retry_after(response(429, {"Retry-After": "12"})), 12.0)
+        self.assertEqual(discourse._retry_after(response(429, {"Retry-After": "0"})), 1.0)
+        self.assertEqual(discourse._retry_after(response(429, body={"extras": {"wait_seconds": 7}})), 7.0)
+        self.assertEqual(discourse._retry_after(response(429, {"Retry-After": "soon"})), discourse.DEFAULT_RETRY_AFTER)
+
+
+class FakeForum:
+    """Serves /t/{id}.json (first posts plus the stream) and /t/{id}/posts.json batches."""
+
+    def __init__(self, post_count, embedded=3, deleted=()):
+        self.posts = {i: {"id": i, "post_number": i, "raw": f"post {i}"}
+                      for i in range(1, post_count + 1) if i not in deleted}
+        self.stream = list(range(1, post_count + 1))
+        self.embedded = embedded
+        self.requests = []
+
+    def get(self, url, headers=None, params=None):
+        self.requests.append((url, params, headers.get("If-None-Match")))
+        if headers.get("If-None-Match") == "etag-1":
+            return response(304)
+        if url.endswith("/posts.json"):
+            ids = [post_id for _, post_id in params]
+            body = {"post_stream": {"posts": [self.posts[i] for i in ids if i in self.posts]}}
+        else:
+            embedded = [self.posts[i] for i in self.stream[:self.embedded]]
+            body = {"post_stream": {"posts": embedded, "stream": self.stream}}
+        return response(200, {"ETag": "etag-1"}, body)
+
+
+class TestTopicPosts(unittest.TestCase):
+
+    def setUp(self):
+        patches = [
+            mock.patch.dict("os.environ", {"DISCOURSE_API_KEY": "key", "DISCOURSE_API_USERNAME": "bot",
+                                           "DISCOURSE_BASE_URL": "https://forum.example"}),
+            mock.patch.object(discourse, "topic_cache", discourse.TopicCache()),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def posts(self, forum, **kwargs):
+        with mock.patch.object(discourse.scheduler, "get", side_effect=forum.get):
+            return list(discourse.iter_topic_posts(1, **kwargs))
+
+    def test_whole_stream_in_order(self):
+        forum = FakeForum(post_count=12, deleted=(7,))
+        posts = self.posts(forum, batch_size=4, workers=2)
+        self.assertEqual([p["id"] for p in posts], [1, 2, 3, 4, 5, 6, 8, 9, 10, 11, 12])
+        batches = [[post_id for _, post_id in params] for url, params, _ in forum.requests if params]
+        self.assertEqual(sorted(batches), [[4, 5, 6, 7], [8, 9, 10, 11], [12]])
+
+    def test_stops_fetching_when_the_caller_stops(self):
+        forum = FakeForum(post_count=200)
+        with mock.patch.object(discourse.scheduler, "get", side_effect=forum.get):
+            for post in discourse.iter_topic_posts(1, batch_size=20, workers=1):
+                if post["id"] == 5:
+                    break
+        # The topic, plus at most the batch being fetched ahead
+        self.assertLessEqual(len(forum.requests), 3)
+
+    def test_not_modified_reuses_the_cached_topic(self):
+        forum = FakeForum(post_count=3)
+        first = self.posts(forum)
+        second = self.posts(forum)
+        self.assertEqual(first, second)
+        self.assertEqual([etag for _, _, etag in forum.requests], [None, "etag-1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
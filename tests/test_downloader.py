@@ -0,0 +1,148 @@
+import os
+import sys
+import re
+import pathlib
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import requests
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from modules import downloader
+
+CONTENT = bytes(range(256)) * 400  # 102400 bytes
+
+
+class FakeResponse:
+
+    def __init__(self, status_code, body=b"", headers=None, fail_after=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+        self.fail_after = fail_after
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error", response=self)
+
+    def iter_content(self, chunk_size=1):
+        for offset in range(0, len(self.body), chunk_size):
+            if self.fail_after is not None and offset >= self.fail_after:
+                raise requests.ConnectionError("connection reset")
+            yield self.body[offset:offset + chunk_size]
+
+
+class FakeServer:
+    """Serves CONTENT, honouring Range headers unless told otherwise."""
+
+    def __init__(self, content=CONTENT, ranges=True, reject_ranges=False, drop_first_range=False):
+        self.content = content
+        self.ranges = ranges
+        self.reject_ranges = reject_ranges
+        self.drop_first_range = drop_first_range
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def get(self, url, headers=None, stream=False):
+        range_header = (headers or {}).get("Range")
+        with self._lock:
+            self.requests.append(range_header)
+            ranged_requests = sum(1 for r in self.requests if r and not r.startswith("bytes=0-"))
+        if range_header is None or not self.ranges:
+            return FakeResponse(200, self.content)
+        if self.reject_ranges:
+            return FakeResponse(416, headers={"Content-Range": f"bytes */{len(self.content)}"})
+        start, end = re.match(r"bytes=(\d+)-(\d+)", range_header).groups()
+        start, end = int(start), min(int(end), len(self.content) - 1)
+        body = self.content[start:end + 1]
+        headers = {"Content-Range": f"bytes {start}-{end}/{len(self.content)}"}
+        if self.drop_first_range and ranged_requests == 1 and start > 0:
+            # The first segment request is cut off halfway
+            return FakeResponse(206, body, headers, fail_after=len(body) // 2)
+        return FakeResponse(206, body, headers)
+
+
+class TestDownloadFile(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.dest = os.path.join(self.tmp_dir.name, "recording.mp4")
+        sleep = mock.patch.object(downloader.time, "sleep")
+        sleep.start()
+        self.addCleanup(sleep.stop)
+
+    def download(self, server, **kwargs):
+        kwargs.setdefault("min_segment_size", 10000)
+        kwargs.setdefault("segments", 4)
+        with mock.patch.object(downloader.http_client, "get", side_effect=server.get), \
+                mock.patch.object(downloader, "CHUNK_SIZE", 4096):
+            downloader.download_file("https://zoom.example/rec", self.dest, **kwargs)
+        with open(self.dest, "rb") as f:
+            return f.read()
+
+    def test_split(self):
+        self.assertEqual(downloader._split(10, 100, 4), [(10, 32), (33, 55), (56, 78), (79, 99)])
+        self.assertEqual(downloader._split(98, 100, 4), [(98, 98), (99, 99)])
+
+    def test_ranges_are_assembled_in_place(self):
+        server = FakeServer()
+        self.assertEqual(self.download(server), CONTENT)
+        # Probe plus four segments
+        self.assertEqual(len(server.requests), 5)
+        self.assertEqual(server.requests[0], "bytes=0-9999")
+
+    def test_small_file_is_fetched_by_the_probe(self):
+        server = FakeServer(content=CONTENT[:5000])
+        self.assertEqual(self.download(server), CONTENT[:5000])
+        self.assertEqual(len(server.requests), 1)
+
+    def test_interrupted_segment_resumes_where_it_stopped(self):
+        server = FakeServer(drop_first_range=True)
+        self.assertEqual(self.download(server, segments=1), CONTENT)
+        first, retry = server.requests[1:]
+        self.assertEqual(first, f"bytes=10000-{len(CONTENT) - 1}")
+        resumed_at = int(re.match(r"bytes=(\d+)-", retry).group(1))
+        self.assertGreater(resumed_at, 10000)
+
+    def test_server_without_ranges_streams_once(self):
+        server = FakeServer(ranges=False)
+        self.assertEqual(self.download(server), CONTENT)
+        self.assertEqual(len(server.requests), 1)
+
+    def test_rejected_range_falls_back_to_single_stream(self):
+        server = FakeServer(reject_ranges=True)
+        self.assertEqual(self.download(server), CONTENT)
+        self.assertEqual(server.requests, ["bytes=0-9999", None])
+
+    def test_segment_without_range_support_falls_back_to_single_stream(self):
+        server = FakeServer()
+        real_get = server.get
+
+        def get(url, headers=None, stream=False):
+            range_header = (headers or {}).get("Range")
+            if range_header and not range_header.startswith("bytes=0-"):
+                # e.g. a CDN node that ignores Range
+                server.requests.append(range_header)
+                return FakeResponse(200, CONTENT)
+            return real_get(url, headers=headers, stream=stream)
+
+        server.get = get
+        self.assertEqual(self.download(server, segments=2), CONTENT)
+        self.assertIsNone(server.requests[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import sys
+import pathlib
+import unittest
+from unittest import mock
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from modules import gcal
+
+CALENDAR_ID = "calendar@example.com"
+
+
+class FakeBatch:
+
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        self.service.batches.append([request_id for request_id, _ in self.requests])
+        for request_id, (kind, kwargs) in self.requests:
+            if kwargs.get("eventId") == "missing":
+                error = HttpError(httplib2.Response({"status": "404"}), b"not found")
+                self.callback(request_id, None, error)
+            else:
+                self.callback(request_id, {"id": kwargs.get("eventId", f"new{request_id}"), "kind": kind}, None)
+
+
+class FakeCalendar:
+    """Just enough of the Calendar API client to record batched requests."""
+
+    def __init__(self):
+        self.batches = []
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+    def events(self):
+        return mock.Mock(insert=lambda **kwargs: ("insert", kwargs),
+                         patch=lambda **kwargs: ("patch", kwargs))
+
+
+def event(index, **extra):
+    return dict(summary=f"Call #{index}", start_dt="2025-01-02T14:00:00Z", duration_minutes=90, **extra)
+
+
+class TestBatchUpsertEvents(unittest.TestCase):
+
+    def setUp(self):
+        self.service = FakeCalendar()
+        patch = mock.patch.object(gcal, "_get_service", return_value=self.service)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_events_are_sent_in_batches(self):
+        results = gcal.batch_upsert_events([event(i) for i in range(120)], CALENDAR_ID)
+        self.assertEqual([len(batch) for batch in self.service.batches], [50, 50, 20])
+        self.assertEqual([r["id"] for r in results], [f"new{i}" for i in range(120)])
+
+    def test_patches_and_failures_keep_their_position(self):
+        events = [event(0), event(1, event_id="evt1"), event(2, event_id="missing"), event(3)]
+        with mock.patch("builtins.print"):
+            results = gcal.batch_upsert_events(events, CALENDAR_ID, batch_size=3)
+        self.assertEqual(self.service.batches, [["0", "1", "2"], ["3"]])
+        self.assertEqual([results[i]["kind"] for i in (0, 1, 3)], ["insert", "patch", "insert"])
+        self.assertEqual(results[1]["id"], "evt1")
+        self.assertIsInstance(results[2], HttpError)
+
+    def test_no_events_sends_nothing(self):
+        self.assertEqual(gcal.batch_upsert_events([], CALENDAR_ID), [])
+        self.assertEqual(self.service.batches, [])
+
+
+class TestGetService(unittest.TestCase):
+
+    def test_service_is_built_once(self):
+        patches = [
+            mock.patch.object(gcal, "_service", None),
+            mock.patch.dict("os.environ", {"GCAL_SERVICE_ACCOUNT_KEY": "{}"}),
+            mock.patch.object(gcal.service_account.Credentials, "from_service_account_info"),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        with mock.patch.object(gcal, "build", return_value=FakeCalendar()) as build:
+            first = gcal._get_service()
+            self.assertIs(gcal._get_service(), first)
+        build.assert_called_once()
+        self.assertTrue(build.call_args.kwargs["static_discovery"])
+
+
+if __name__ == "__main__":
+    unittest.main()
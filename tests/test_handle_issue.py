@@ -0,0 +1,223 @@
+import os
+import sys
+import json
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+import requests
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from modules import store, zoom, gcal, discourse, mapping_commit
+from scripts import handle_issue
+
+REPO = "ethereum/pm"
+SINGLE_BODY = "[Jan 16, 2025, 14:00 UTC]\n- Duration in minutes 90"
+SERIES_BODY = SINGLE_BODY + "\n- Recurrence: every week, 4 occurrences"
+
+
+class FakeIssue:
+
+    def __init__(self, body):
+        self.number = 7
+        self.title = "ACDT #1"
+        self.body = body
+        self.html_url = f"https://github.com/{REPO}/issues/7"
+        self.comments = []
+        self.comment_scans = 0
+
+    def create_comment(self, body):
+        self.comments.append(body)
+
+    def get_comments(self):
+        self.comment_scans += 1
+        return [mock.Mock(body=body) for body in self.comments]
+
+
+class TestHandleIssue(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        mapping_file = os.path.join(self.tmp_dir.name, "mapping.json")
+        with open(mapping_file, "w") as f:
+            json.dump({}, f)
+        patches = [
+            mock.patch.object(store, "DB_FILE", os.path.join(self.tmp_dir.name, "state.db")),
+            mock.patch.object(store, "MAPPING_FILE", mapping_file),
+            mock.patch.dict(os.environ, {"GITHUB_TOKEN": "token"}),
+            mock.patch.object(mapping_commit, "request_commit"),
+            mock.patch.object(mapping_commit, "flush"),
+            mock.patch.object(discourse, "update_topic", return_value={"first_post_id": 11}),
+            mock.patch("modules.telegram.send_message"),
+            mock.patch.object(zoom, "get_access_token", return_value="token"),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.addCleanup(store.close)
+
+    def run_issue(self, issue):
+        gh = mock.Mock()
+        gh.get_repo.return_value.get_issue.return_value = issue
+        with mock.patch.object(handle_issue, "Github", return_value=gh):
+            handle_issue.handle_github_issue(issue.number, REPO)
+
+    def test_recurring_series_made_single(self):
+        recurrence = {"frequency": "weekly", "interval": 1, "count": 4}
+        store.upsert_meeting(
+            "999",
+            discourse_topic_id=500,
+            issue_number=7,
+            repo=REPO,
+            first_post_id=11,
+            calendar_event_id="evt1",
+            recurrence=recurrence,
+            sync_hashes={
+                "title": handle_issue.content_hash("ACDT #1"),
+                "body": handle_issue.content_hash(SERIES_BODY),
+                "schedule": handle_issue.content_hash(["2025-01-16T14:00:00Z", 90, recurrence]),
+            },
+            synced_at="2025-01-01T00:00:00Z",
+        )
+        store.set_occurrences("999", [
+            {"occurrence_id": "1737036000000", "start_time": "2025-01-16T14:00:00Z", "duration": 90},
+            {"occurrence_id": "1737640800000", "start_time": "2025-01-23T14:00:00Z", "duration": 90},
+        ])
+
+        service = mock.MagicMock()
+        service.events.return_value.patch.return_value.execute.return_value = {"id": "evt1"}
+        with mock.patch.object(zoom.http_client, "request", return_value=mock.Mock(status_code=204)) as zoom_patch, \
+                mock.patch.object(gcal, "_get_service", return_value=service):
+            self.run_issue(FakeIssue(SINGLE_BODY))
+
+        payload = zoom_patch.call_args.kwargs["json"]
+        self.assertEqual(payload["type"], 2)
+        self.assertNotIn("recurrence", payload)
+        self.assertEqual(service.events.return_value.patch.call_args.kwargs["body"]["recurrence"], [])
+
+        entry = store.get_meeting("999")
+        self.assertIsNone(entry["recurrence"])
+        self.assertEqual(entry["occurrences"], [])
+        self.assertEqual(entry["calendar_event_id"], "evt1")
+
+    def test_format_error_between_series_and_single_keeps_recurrence(self):
+        recurrence = {"frequency": "weekly", "interval": 1, "count": 4}
+        store.upsert_meeting("999", discourse_topic_id=500, issue_number=7, repo=REPO, first_post_id=11,
+                             calendar_event_id="evt1", recurrence=recurrence, synced_at="2025-01-01T00:00:00Z")
+        store.set_occurrences("999", [
+            {"occurrence_id": "1737036000000", "start_time": "2025-01-16T14:00:00Z", "duration": 90},
+        ])
+
+        # 1. The body is edited into something unparseable: nothing changes on Zoom
+        with mock.patch.object(zoom, "update_meeting") as update_meeting:
+            self.run_issue(FakeIssue("Date to be decided"))
+        update_meeting.assert_not_called()
+        self.assertEqual(store.get_meeting("999")["recurrence"], recurrence)
+
+        # 2. Then into a single meeting: the series is still cleared everywhere
+        service = mock.MagicMock()
+        service.events.return_value.patch.return_value.execute.return_value = {"id": "evt1"}
+        with mock.patch.object(zoom.http_client, "request", return_value=mock.Mock(status_code=204)) as zoom_patch, \
+                mock.patch.object(gcal, "_get_service", return_value=service):
+            self.run_issue(FakeIssue(SINGLE_BODY))
+        self.assertEqual(zoom_patch.call_args.kwargs["json"]["type"], 2)
+        self.assertEqual(service.events.return_value.patch.call_args.kwargs["body"]["recurrence"], [])
+        entry = store.get_meeting("999")
+        self.assertIsNone(entry["recurrence"])
+        self.assertEqual(entry["occurrences"], [])
+
+    def test_title_only_edit_renames_zoom_meeting_and_event(self):
+        store.upsert_meeting(
+            "999", discourse_topic_id=500, issue_number=7, repo=REPO, first_post_id=11,
+            calendar_event_id="evt1", synced_at="2025-01-01T00:00:00Z",
+            sync_hashes={
+                "title": handle_issue.content_hash("Old title"),
+                "body": handle_issue.content_hash(SINGLE_BODY),
+                "schedule": handle_issue.content_hash(["2025-01-16T14:00:00Z", 90, None]),
+            },
+        )
+        with mock.patch.object(zoom, "update_meeting") as update_meeting, \
+                mock.patch.object(gcal, "update_event") as update_event:
+            self.run_issue(FakeIssue(SINGLE_BODY))
+        update_meeting.assert_called_once_with("999", topic="Issue 7: ACDT #1")
+        self.assertEqual(update_event.call_args.kwargs["summary"], "ACDT #1")
+        self.assertNotIn("start_dt", update_event.call_args.kwargs)
+
+    def test_interval_beyond_zoom_limit_is_a_format_error(self):
+        issue = FakeIssue(SINGLE_BODY + "\n- Recurrence: every 5 months, 4 occurrences")
+        with mock.patch.object(discourse, "create_topic", return_value={"topic_id": 500, "id": 11}), \
+                mock.patch.object(zoom, "create_recurring_meeting") as create:
+            self.run_issue(issue)
+        create.assert_not_called()
+        self.assertTrue(any("Invalid recurrence interval 5" in c for c in issue.comments))
+
+    def test_failed_zoom_create_adds_no_calendar_event_until_retried(self):
+        issue = FakeIssue(SINGLE_BODY)
+        with mock.patch.object(discourse, "create_topic", return_value={"topic_id": 500, "id": 11}), \
+                mock.patch.object(zoom, "create_meeting", side_effect=RuntimeError("Zoom is down")), \
+                mock.patch.object(gcal, "insert_event") as insert_event:
+            self.run_issue(issue)
+        insert_event.assert_not_called()
+        self.assertTrue(any("Error creating Zoom meeting" in c for c in issue.comments))
+        self.assertEqual(store.find_by_issue(7, repo=REPO), [])
+
+        # The next event retries the whole schedule and records both IDs
+        with mock.patch.object(discourse, "create_topic", return_value={"topic_id": 500, "id": 11}), \
+                mock.patch.object(zoom, "create_meeting", return_value=("https://zoom.us/j/1", 1)), \
+                mock.patch.object(gcal, "insert_event", return_value={"id": "evt1"}) as insert_event:
+            self.run_issue(issue)
+        insert_event.assert_called_once()
+        self.assertEqual(store.get_meeting("1")["calendar_event_id"], "evt1")
+
+    def test_meeting_deleted_on_zoom_keeps_calendar_event(self):
+        store.upsert_meeting("999", discourse_topic_id=500, issue_number=7, repo=REPO,
+                             calendar_event_id="evt1", synced_at="2025-01-01T00:00:00Z")
+        not_found = requests.HTTPError(response=mock.Mock(status_code=404))
+        with mock.patch.object(zoom, "update_meeting", side_effect=not_found), \
+                mock.patch.object(zoom, "create_meeting", return_value=("https://zoom.us/j/1000", 1000)), \
+                mock.patch.object(gcal, "insert_event") as insert_event, \
+                mock.patch.object(gcal, "update_event", return_value={"id": "evt1"}) as update_event:
+            self.run_issue(FakeIssue(SINGLE_BODY))
+        insert_event.assert_not_called()
+        self.assertEqual(update_event.call_args.args[0], "evt1")
+        self.assertIn("https://zoom.us/j/1000", update_event.call_args.kwargs["description"])
+        self.assertEqual(store.get_meeting("1000")["calendar_event_id"], "evt1")
+
+    def test_stored_topic_skips_the_comment_scan(self):
+        store.upsert_meeting("999", discourse_topic_id=500, issue_number=7, repo=REPO, first_post_id=11,
+                             calendar_event_id="evt1", synced_at="2025-01-01T00:00:00Z")
+        issue = FakeIssue(SINGLE_BODY)
+        with mock.patch.object(zoom, "update_meeting"), \
+                mock.patch.object(gcal, "update_event", return_value={"id": "evt1"}):
+            self.run_issue(issue)
+        self.assertEqual(issue.comment_scans, 0)
+        self.assertEqual(discourse.update_topic.call_args.kwargs["topic_id"], 500)
+        self.assertEqual(discourse.update_topic.call_args.kwargs["first_post_id"], 11)
+
+    def test_cold_start_reads_the_topic_from_comments_once(self):
+        issue = FakeIssue(SINGLE_BODY)
+        issue.comments.append("**Discourse Topic ID:** 777")
+        with mock.patch.object(discourse, "create_topic") as create_topic, \
+                mock.patch.object(zoom, "create_meeting", return_value=("https://zoom.us/j/1", 1)), \
+                mock.patch.object(gcal, "insert_event", return_value={"id": "evt1"}):
+            self.run_issue(issue)
+        create_topic.assert_not_called()
+        self.assertEqual(discourse.update_topic.call_args.kwargs["topic_id"], 777)
+        self.assertEqual(store.get_meeting("1")["discourse_topic_id"], 777)
+        self.assertEqual(issue.comment_scans, 1)
+
+        # Later edits find the topic in the store
+        issue.body = SINGLE_BODY + "\n\nAgenda: EIP-7702"
+        with mock.patch.object(zoom, "update_meeting"), mock.patch.object(gcal, "update_event"):
+            self.run_issue(issue)
+        self.assertEqual(issue.comment_scans, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import sys
+import time
+import pathlib
+import threading
+import unittest
+from unittest import mock
+
+import requests
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from modules import http_client
+
+
+class TestHttpClient(unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(http_client.close_all)
+
+    def test_one_session_per_host(self):
+        session = http_client.get_session("https://api.zoom.us/v2/users/me")
+        self.assertIs(http_client.get_session("https://API.zoom.us/v2/meetings/1"), session)
+        self.assertIsNot(http_client.get_session("https://ethereum-magicians.org/posts.json"), session)
+        http_client.close_all()
+        self.assertIsNot(http_client.get_session("https://api.zoom.us/v2/users/me"), session)
+
+    def test_retries_transient_errors_but_not_posts(self):
+        session = http_client.get_session("https://api.zoom.us/v2/users/me")
+        retry = session.get_adapter("https://api.zoom.us/").max_retries
+        self.assertEqual(retry.total, http_client.RETRY_TOTAL)
+        self.assertEqual(tuple(retry.status_forcelist), http_client.RETRY_STATUS_FORCELIST)
+        self.assertTrue(retry.is_retry("GET", 503))
+        self.assertFalse(retry.is_retry("POST", 503))
+
+    def test_default_timeout(self):
+        with mock.patch.object(requests.Session, "request", return_value=mock.Mock(status_code=200)) as request:
+            http_client.get("https://api.zoom.us/v2/users/me")
+            http_client.post("https://api.zoom.us/v2/users/me/meetings", timeout=5)
+        self.assertEqual(request.call_args_list[0].kwargs["timeout"], http_client.DEFAULT_TIMEOUT)
+        self.assertEqual(request.call_args_list[1].kwargs["timeout"], 5)
+
+    def test_host_concurrency_cap(self):
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def request(method, url, **kwargs):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            return mock.Mock(status_code=200)
+
+        http_client.set_host_concurrency("https://api.telegram.org", 1)
+        self.addCleanup(http_client.set_host_concurrency, "https://api.telegram.org", None)
+        with mock.patch.object(requests.Session, "request", side_effect=request):
+            threads = [
+                threading.Thread(target=http_client.post, args=("https://api.telegram.org/bot1/sendMessage",))
+                for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(5)
+        self.assertEqual(peak[0], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+import os
+import sys
+import json
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+from github import GithubException
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from modules import store, mapping_commit
+
+BASE = {
+    "111": {"discourse_topic_id": 1, "youtube_video_id": None, "calendar_event_id": "evt1"},
+    "222": {"discourse_topic_id": 2, "youtube_video_id": None},
+}
+
+
+def snapshot(mapping):
+    return (json.dumps(mapping, indent=2, sort_keys=True) + "\n").encode("utf-8")
+
+
+class FakeRepo:
+    """Contents API of a repo whose mapping file may move under us."""
+
+    def __init__(self, content):
+        self.content = content
+        self.commits = []
+
+    def get_contents(self, path, ref=None):
+        return mock.Mock(decoded_content=self.content)
+
+    def update_file(self, path, message, content, sha, branch, author):
+        if sha != mapping_commit.git_blob_sha(self.content):
+            raise GithubException(409, {"message": "is at another sha"}, None)
+        self.content = content.encode("utf-8")
+        self.commits.append(content)
+        return {"commit": mock.Mock(sha=f"commit{len(self.commits)}")}
+
+
+class TestMergeSnapshots(unittest.TestCase):
+
+    def test_remote_changes_survive(self):
+        remote = json.loads(json.dumps(BASE))
+        remote["111"]["youtube_video_id"] = "abc"
+        local = json.loads(json.dumps(BASE))
+        local["222"]["issue_title"] = "ACDE #200"
+        merged = mapping_commit.merge_snapshots(BASE, remote, local)
+        self.assertEqual(merged["111"]["youtube_video_id"], "abc")
+        self.assertEqual(merged["222"]["issue_title"], "ACDE #200")
+
+    def test_local_clear_is_kept(self):
+        remote = json.loads(json.dumps(BASE))
+        remote["111"]["youtube_video_id"] = "abc"
+        local = json.loads(json.dumps(BASE))
+        del local["111"]["calendar_event_id"]
+        merged = mapping_commit.merge_snapshots(BASE, remote, local)
+        self.assertNotIn("calendar_event_id", merged["111"])
+        self.assertEqual(merged["111"]["youtube_video_id"], "abc")
+
+    def test_deleted_meetings(self):
+        remote = {"111": BASE["111"], "333": {"discourse_topic_id": 3}}
+        local = {"222": BASE["222"]}
+        merged = mapping_commit.merge_snapshots(BASE, remote, local)
+        # 111 deleted locally, 222 deleted remotely, 333 added remotely
+        self.assertEqual(set(merged), {"333"})
+
+    def test_legacy_entries(self):
+        merged = mapping_commit.merge_snapshots({}, {"444": 4}, {})
+        self.assertEqual(merged, {"444": {"discourse_topic_id": 4}})
+
+
+class TestMappingCommitter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.mapping_file = os.path.join(self.tmp_dir.name, "mapping.json")
+        with open(self.mapping_file, "wb") as f:
+            f.write(snapshot(BASE))
+        patches = [
+            mock.patch.object(store, "DB_FILE", os.path.join(self.tmp_dir.name, "state.db")),
+            mock.patch.object(store, "MAPPING_FILE", self.mapping_file),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.addCleanup(store.close)
+        self.committer = mapping_commit.MappingCommitter(path=self.mapping_file)
+
+    def commit(self, repo):
+        return self.committer._commit(repo, "main")
+
+    def test_unchanged_mapping_is_not_committed(self):
+        repo = FakeRepo(snapshot(BASE))
+        self.committer.request_commit()
+        self.assertIsNone(self.commit(repo))
+        self.assertEqual(repo.commits, [])
+
+    def test_commit_on_top_of_base(self):
+        repo = FakeRepo(snapshot(BASE))
+        self.committer.request_commit()
+        store.upsert_meeting("222", issue_title="ACDE #200")
+        self.assertEqual(self.commit(repo), "commit1")
+        self.assertEqual(json.loads(repo.content)["222"]["issue_title"], "ACDE #200")
+
+    def test_conflict_merges_remote_and_retries(self):
+        remote = json.loads(json.dumps(BASE))
+        remote["111"]["youtube_video_id"] = "abc"
+        remote["333"] = {"discourse_topic_id": 3, "youtube_video_id": None}
+        repo = FakeRepo(snapshot(remote))
+        self.committer.request_commit()
+        store.upsert_meeting("222", issue_title="ACDE #200")
+        store.upsert_meeting("111", calendar_event_id=None)
+
+        self.assertEqual(self.commit(repo), "commit1")
+        committed = json.loads(repo.content)
+        self.assertEqual(committed["111"]["youtube_video_id"], "abc")
+        self.assertNotIn("calendar_event_id", committed["111"])
+        self.assertEqual(committed["222"]["issue_title"], "ACDE #200")
+        self.assertIn("333", committed)
+        # The merge is applied to the store as well
+        self.assertEqual(store.get_meeting("111")["youtube_video_id"], "abc")
+        self.assertIsNone(store.get_meeting("111").get("calendar_event_id"))
+
+    def test_remote_matching_merge_is_not_committed(self):
+        remote = json.loads(json.dumps(BASE))
+        remote["222"]["issue_title"] = "ACDE #200"
+        repo = FakeRepo(snapshot(remote))
+        self.committer.request_commit()
+        store.upsert_meeting("222", issue_title="ACDE #200")
+        self.assertIsNone(self.commit(repo))
+        self.assertEqual(repo.commits, [])
+
+    def test_gives_up_after_max_attempts(self):
+        repo = FakeRepo(snapshot(BASE))
+        repo.update_file = mock.Mock(side_effect=GithubException(409, {"message": "conflict"}, None))
+        self.committer.max_attempts = 2
+        self.committer.request_commit()
+        store.upsert_meeting("222", issue_title="ACDE #200")
+        with self.assertRaises(GithubException):
+            self.commit(repo)
+        self.assertEqual(repo.update_file.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import sys
+import time
+import pathlib
+import unittest
+from unittest import mock
+
+import requests
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from modules import media_stream
+
+CONTENT = bytes(range(256)) * 16  # 4096 bytes
+
+
+class FakeResponse:
+
+    def __init__(self, status_code, chunks, error=None):
+        self.status_code = status_code
+        self.chunks = chunks
+        self.error = error
+        self.produced = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error", response=self)
+
+    def iter_content(self, chunk_size=1):
+        for chunk in self.chunks:
+            self.produced += 1
+            yield chunk
+        if self.error is not None:
+            raise self.error
+
+
+def chunks_of(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestDownloadPipe(unittest.TestCase):
+
+    def pipe(self, response, **kwargs):
+        patch = mock.patch.object(media_stream.http_client, "get", return_value=response)
+        self.get = patch.start()
+        self.addCleanup(patch.stop)
+        pipe = media_stream.DownloadPipe("https://zoom.example/rec.mp4", **kwargs)
+        self.addCleanup(pipe.close)
+        return pipe
+
+    def test_reads_across_chunks_until_eof(self):
+        pipe = self.pipe(FakeResponse(200, chunks_of(CONTENT, 1000)))
+        self.assertEqual(pipe.read(1500), CONTENT[:1500])
+        self.assertEqual(pipe.read(10000), CONTENT[1500:])
+        self.assertEqual(pipe.read(10), b"")
+
+    def test_producer_stops_when_the_buffer_is_full(self):
+        response = FakeResponse(200, chunks_of(CONTENT, 256))
+        pipe = self.pipe(response, max_chunks=2)
+        deadline = time.monotonic() + 2
+        while not pipe._queue.full() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        # Two chunks queued plus the one waiting to be put
+        self.assertEqual(response.produced, 3)
+        self.assertEqual(pipe.read(len(CONTENT)), CONTENT)
+
+    def test_download_error_is_raised_to_the_reader(self):
+        error = requests.ConnectionError("connection reset")
+        pipe = self.pipe(FakeResponse(200, chunks_of(CONTENT[:2000], 1000), error=error))
+        self.assertEqual(pipe.read(1000), CONTENT[:1000])
+        with self.assertRaises(requests.ConnectionError):
+            pipe.read(4096)
+        # A failed download never looks like a complete, shorter file
+        with self.assertRaises(requests.ConnectionError):
+            pipe.read(10)
+
+    def test_http_error_is_raised_to_the_reader(self):
+        pipe = self.pipe(FakeResponse(403, []))
+        with self.assertRaises(requests.HTTPError):
+            pipe.read(10)
+
+    def test_start_offset(self):
+        pipe = self.pipe(FakeResponse(206, chunks_of(CONTENT[1000:], 1000)), start=1000)
+        self.assertEqual(self.get.call_args.kwargs["headers"]["Range"], "bytes=1000-")
+        self.assertEqual(pipe.read(10000), CONTENT[1000:])
+
+    def test_start_offset_ignored_by_server(self):
+        pipe = self.pipe(FakeResponse(200, chunks_of(CONTENT, 700)), start=1000)
+        self.assertEqual(pipe.read(10000), CONTENT[1000:])
+
+
+class FakeReader:
+
+    def __init__(self, data):
+        self.data = data
+        self.position = 0
+
+    def read(self, size):
+        chunk = self.data[self.position:self.position + size]
+        self.position += len(chunk)
+        return chunk
+
+
+class TestStreamingMediaUpload(unittest.TestCase):
+
+    def test_partially_acknowledged_chunk_is_resent(self):
+        media = media_stream.StreamingMediaUpload(FakeReader(CONTENT), size=len(CONTENT), chunksize=1024)
+        self.assertEqual(media.getbytes(0, 1024), CONTENT[:1024])
+        # The server only kept the first 600 bytes
+        self.assertEqual(media.getbytes(600, 1024), CONTENT[600:1624])
+        with self.assertRaises(ValueError):
+            media.getbytes(0, 1024)
+
+    def test_resumed_upload_skips_bytes_the_server_has(self):
+        media = media_stream.StreamingMediaUpload(FakeReader(CONTENT[1000:]), size=len(CONTENT), start=1000)
+        self.assertEqual(media.getbytes(3000, 500), CONTENT[3000:3500])
+
+    def test_json_round_trip(self):
+        media = media_stream.StreamingMediaUpload(FakeReader(CONTENT), size=len(CONTENT), chunksize=1024)
+        media.getbytes(0, 1024)
+        media.getbytes(1024, 1024)
+        restored = media_stream.StreamingMediaUpload.from_json(media.to_json(), FakeReader(CONTENT[1024:]))
+        self.assertEqual((restored.size(), restored.chunksize(), restored.mimetype()),
+                         (len(CONTENT), 1024, "video/mp4"))
+        self.assertEqual(restored.getbytes(1024, 1024), CONTENT[1024:2048])
+
+
+if __name__ == "__main__":
+    unittest.main()
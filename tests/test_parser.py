@@ -9,6 +9,7 @@ project_root = current_dir.parent
 sys.path.insert(0, str(project_root))
 
 from scripts.handle_issue import parse_issue_for_time
+from modules.issue_parser import parse_recurrence
 
 class TestParseIssueForTime(unittest.TestCase):
     
@@ -213,5 +214,68 @@ class TestParseIssueForTime(unittest.TestCase):
                     else:
                         self.fail(f"Unexpected ValueError in {case['description']}: {ve}")
 
+
+class TestExtendedGrammar(unittest.TestCase):
+
+    def test_range_crossing_midnight(self):
+        self.assertEqual(
+            parse_issue_for_time("- Meeting on [Jan 16, 2025, 23:00-01:30 UTC](https://savvytime.com)"),
+            ("2025-01-16T23:00:00Z", 150)
+        )
+
+    def test_full_weekday_prefix(self):
+        self.assertEqual(
+            parse_issue_for_time("- [Wednesday, February 5, 2025, 14:00 UTC]\n- Duration in minutes\n- 60"),
+            ("2025-02-05T14:00:00Z", 60)
+        )
+
+    def test_iso_datetime(self):
+        self.assertEqual(
+            parse_issue_for_time("- Meeting on 2025-03-04T14:00:00Z\n- Duration in minutes\n- 90"),
+            ("2025-03-04T14:00:00Z", 90)
+        )
+        self.assertEqual(
+            parse_issue_for_time("- Meeting on 2025-03-04 14:00-15:00 UTC"),
+            ("2025-03-04T14:00:00Z", 60)
+        )
+
+    def test_duration_followed_by_text(self):
+        # The first line starting with a number after the date/time is the duration
+        self.assertEqual(
+            parse_issue_for_time("- [Jan 16, 2025, 14:00 UTC](https://savvytime.com)\n- 90-minute call"),
+            ("2025-01-16T14:00:00Z", 90)
+        )
+
+    def test_invalid_day(self):
+        with self.assertRaises(ValueError):
+            parse_issue_for_time("- [Feb 30, 2025, 14:00 UTC]\n- 60")
+
+    def test_errors_are_memoized(self):
+        body = "- Meeting on Jan 18, 2025 at 14:00 UTC\n- 60"
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                parse_issue_for_time(body)
+
+
+class TestParseRecurrence(unittest.TestCase):
+
+    def test_recurrence_spec(self):
+        self.assertEqual(
+            parse_recurrence("- Recurrence: every 2 weeks, 6 occurrences"),
+            {"frequency": "weekly", "interval": 2, "count": 6}
+        )
+        self.assertEqual(
+            parse_recurrence("- Every month for 3 calls"),
+            {"frequency": "monthly", "interval": 1, "count": 3}
+        )
+
+    def test_prose_is_not_a_series(self):
+        self.assertIsNone(parse_recurrence("ACD calls happen every 2 weeks on Thursday."))
+
+    def test_too_many_occurrences(self):
+        with self.assertRaises(ValueError):
+            parse_recurrence("every week, 100 occurrences")
+
+
 if __name__ == "__main__":
     unittest.main()
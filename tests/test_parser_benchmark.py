@@ -0,0 +1,85 @@
+import sys
+import random
+import pathlib
+
+import pytest
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+pytest.importorskip("pytest_benchmark")
+
+from modules import issue_parser
+
+CORPUS_SIZE = 5000
+
+# Date/time lines in the shapes used by tests/test_parser.py, plus the extended grammar
+TEMPLATES = [
+    "- We will not have a meeting on [{mon} {day}, {year}, {hh}:00 UTC](https://savvytime.com)\n- Duration in minutes\n- {dur}",
+    "- We will not have a meeting on [{mon} {day}, {year}, {hh}:00-{end}:30 UTC](https://savvytime.com)",
+    "- We will not have a meeting on [{mon_lower} {day} {year} {hh}:00 UTC](https://savvytime.com)\n- Duration in minutes\n- {dur}",
+    "- We will not have a meeting on [Wed {month} {day:02d}, {year}, {hh}:00 UTC](https://savvytime.com)\n-   Duration    in    minutes\n-    {dur}",
+    "- We will not have a meeting on {mon} {day}, {year} at {hh}:00 UTC\n- Duration in minutes\n- {dur}",
+    "- Meeting on {year}-{month_num:02d}-{day:02d}T{hh}:00:00Z\n- Duration in minutes\n- {dur}",
+    "- Meeting on [{mon} {day}, {year}, 23:00-01:00 UTC](https://savvytime.com)",
+]
+
+MONTHS = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+]
+
+AGENDA = "\n\n# Agenda\n\n" + "\n".join(f"- Item {i}: testing the discourse and the telegram bot" for i in range(15))
+
+
+def generate_corpus(size=CORPUS_SIZE, seed=1):
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(size):
+        month_num = rng.randint(1, 12)
+        fields = {
+            "month": MONTHS[month_num - 1],
+            "mon": MONTHS[month_num - 1][:3],
+            "mon_lower": MONTHS[month_num - 1][:3].lower(),
+            "month_num": month_num,
+            "day": rng.randint(1, 28),
+            "year": rng.randint(2024, 2026),
+            "hh": rng.randint(10, 20),
+            "end": rng.randint(21, 22),
+            "dur": rng.choice([45, 60, 90, 120]),
+        }
+        body = f"# Call #{i}\n\n" + rng.choice(TEMPLATES).format(**fields) + AGENDA
+        corpus.append(body)
+    return corpus
+
+
+CORPUS = generate_corpus()
+
+
+def parse_all(corpus):
+    parsed = 0
+    for body in corpus:
+        try:
+            issue_parser.parse_issue_for_time(body)
+            parsed += 1
+        except ValueError:
+            pass
+    return parsed
+
+
+def test_benchmark_corpus_cold(benchmark):
+    def run():
+        issue_parser.clear_cache()
+        return parse_all(CORPUS)
+
+    parsed = benchmark(run)
+    # Only the "at HH:MM" template is rejected
+    assert 0.7 * len(CORPUS) < parsed < len(CORPUS)
+
+
+def test_benchmark_repeated_body_memoized(benchmark):
+    body = CORPUS[0]
+    issue_parser.clear_cache()
+    benchmark(parse_all, [body] * 100)
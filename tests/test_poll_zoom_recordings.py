@@ -0,0 +1,155 @@
+import os
+import sys
+import json
+import pathlib
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from datetime import datetime, timedelta, timezone
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from modules import store, transcript, zoom, http_client, mapping_commit
+from scripts import poll_zoom_recordings
+
+
+class TestProcessMeeting(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        mapping_file = os.path.join(self.tmp_dir.name, "mapping.json")
+        with open(mapping_file, "w") as f:
+            json.dump({}, f)
+        patches = [
+            mock.patch.object(store, "DB_FILE", os.path.join(self.tmp_dir.name, "state.db")),
+            mock.patch.object(store, "MAPPING_FILE", mapping_file),
+            mock.patch.object(transcript, "post_zoom_transcript_to_discourse", return_value=500),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.addCleanup(store.close)
+
+    def test_keeps_issue_title(self):
+        store.upsert_meeting("999", discourse_topic_id=500, issue_title="ACDT #1")
+        entry = poll_zoom_recordings.process_meeting("999", "Issue 7: ACDT #1", "uuid==", None)
+        self.assertEqual(entry, {"discourse_topic_id": 500})
+
+    def test_zoom_topic_as_fallback_title(self):
+        store.upsert_meeting("999", discourse_topic_id=500)
+        entry = poll_zoom_recordings.process_meeting("999", "Issue 7: ACDT #1")
+        self.assertEqual(entry["issue_title"], "Issue 7: ACDT #1")
+
+
+class TestAdvanceHighWater(unittest.TestCase):
+
+    def setUp(self):
+        patch = mock.patch.object(zoom, "save_recordings_high_water")
+        self.save = patch.start()
+        self.addCleanup(patch.stop)
+        self.latest = datetime(2025, 1, 16, 18, 0, tzinfo=timezone.utc)
+
+    def test_moves_to_the_latest_recording(self):
+        poll_zoom_recordings.advance_high_water(self.latest, [])
+        self.save.assert_called_once_with(self.latest)
+
+    def test_never_passes_a_pending_recording(self):
+        pending = [self.latest - timedelta(hours=1), self.latest - timedelta(hours=3)]
+        poll_zoom_recordings.advance_high_water(self.latest, pending)
+        self.save.assert_called_once_with(self.latest - timedelta(hours=3))
+
+    def test_nothing_listed(self):
+        poll_zoom_recordings.advance_high_water(None, [])
+        self.save.assert_not_called()
+
+
+def recording(meeting_id, end_time, topic="Issue 7: ACDT #1"):
+    return {"id": meeting_id, "topic": topic, "end_time": end_time.strftime("%Y-%m-%dT%H:%M:%SZ")}
+
+
+class TestPollRun(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        mapping_file = os.path.join(self.tmp_dir.name, "mapping.json")
+        with open(mapping_file, "w") as f:
+            json.dump({}, f)
+        self.now = datetime.now(timezone.utc).replace(microsecond=0)
+        self.post = mock.Mock(side_effect=self.post_transcript)
+        self.in_flight, self.peak = 0, 0
+        self.lock = threading.Lock()
+        self.both_started = threading.Barrier(2, timeout=5)
+        patches = [
+            mock.patch.object(store, "DB_FILE", os.path.join(self.tmp_dir.name, "state.db")),
+            mock.patch.object(store, "MAPPING_FILE", mapping_file),
+            mock.patch.object(transcript, "post_zoom_transcript_to_discourse", self.post),
+            mock.patch.object(zoom, "load_recordings_high_water", return_value=None),
+            mock.patch.object(zoom, "save_recordings_high_water"),
+            mock.patch.object(mapping_commit, "request_commit"),
+            mock.patch.object(mapping_commit, "flush"),
+            mock.patch.object(http_client, "set_host_concurrency"),
+        ]
+        started = [patch.start() for patch in patches]
+        for patch in patches:
+            self.addCleanup(patch.stop)
+        self.save_high_water = started[4]
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.addCleanup(store.close)
+
+    def post_transcript(self, meeting_id, recording_uuid=None, occurrence_id=None):
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            if meeting_id in ("111", "222"):
+                # Only returns once both meetings are being processed at the same time
+                self.both_started.wait()
+            if meeting_id == "222":
+                raise RuntimeError("Discourse is down")
+            return {"111": 501, "333": 503}[meeting_id]
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def run_poller(self, recordings, workers):
+        argv = ["poll_zoom_recordings.py", "--workers", str(workers)]
+        with mock.patch.object(zoom, "iter_new_recordings", return_value=iter(recordings)), \
+                mock.patch.object(sys, "argv", argv):
+            poll_zoom_recordings.main()
+
+    def test_parallel_run_keeps_failed_and_recent_meetings_pending(self):
+        failed_end = self.now - timedelta(hours=6)
+        recent_end = self.now - timedelta(hours=1)
+        self.run_poller([
+            recording(111, self.now - timedelta(hours=5)),
+            recording(222, failed_end),
+            recording(333, self.now - timedelta(hours=8)),
+            recording(444, recent_end),  # not eligible for another 3 hours
+        ], workers=2)
+
+        self.assertEqual(self.peak, 2)
+        self.assertEqual(store.get_meeting("111")["discourse_topic_id"], 501)
+        self.assertEqual(store.get_meeting("333")["discourse_topic_id"], 503)
+        self.assertIsNone(store.get_meeting("222"))
+        # The mark stops at the oldest recording still to handle: the failed one
+        self.save_high_water.assert_called_once_with(failed_end)
+        mapping_commit.request_commit.assert_called_once()
+
+    def test_process_meetings_collects_errors(self):
+        self.both_started = threading.Barrier(1)
+        items = [
+            ("111", "Issue 7: ACDT #1", None, None, None),
+            ("222", "Issue 8: ACDE #2", None, None, None),
+        ]
+        results, errors = poll_zoom_recordings.process_meetings(items, workers=1)
+        self.assertEqual(list(results), [("111", None)])
+        self.assertIsInstance(errors[("222", None)], RuntimeError)
+
+
+if __name__ == "__main__":
+    unittest.main()
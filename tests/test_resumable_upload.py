@@ -0,0 +1,145 @@
+import os
+import sys
+import json
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from modules import resumable_upload
+
+SIZE = 4 * 1024 * 1024
+SESSION = "https://upload.example/session/1"
+
+
+def http_response(status, **headers):
+    return httplib2.Response(dict(headers, status=str(status)))
+
+
+def fake_request(chunks, server_reply=None):
+    """A resumable HttpRequest whose next_chunk() steps through `chunks`."""
+    request = mock.Mock()
+    request.resumable.size.return_value = SIZE
+    request.resumable_uri = None
+    request.resumable_progress = 0
+    request.postproc = lambda resp, content: json.loads(content)
+    if server_reply is not None:
+        request.http.request.return_value = server_reply
+
+    def next_chunk():
+        step = chunks.pop(0)
+        if isinstance(step, Exception):
+            raise step
+        request.resumable_uri = SESSION
+        if step is None:
+            return None, {"id": "video1"}
+        request.resumable_progress = step
+        return mock.Mock(resumable_progress=step, progress=lambda: step / SIZE), None
+
+    request.next_chunk.side_effect = next_chunk
+    return request
+
+
+class TestUploadCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.checkpoint = resumable_upload.UploadCheckpoint(os.path.join(self.tmp_dir.name, "state.json"))
+
+    def test_save_load_clear(self):
+        self.assertIsNone(self.checkpoint.load(123))
+        self.checkpoint.save(123, SESSION, 1024, SIZE)
+        self.checkpoint.save(456, "other", 0, 10)
+        state = self.checkpoint.load("123")
+        self.assertEqual((state["resumable_uri"], state["progress"], state["size"]), (SESSION, 1024, SIZE))
+        self.checkpoint.clear(123)
+        self.assertIsNone(self.checkpoint.load(123))
+        self.assertIsNotNone(self.checkpoint.load(456))
+
+    def test_unreadable_state_file_is_ignored(self):
+        with open(self.checkpoint.path, "w") as f:
+            f.write("{not json")
+        self.assertIsNone(self.checkpoint.load(123))
+
+    def test_align_chunk_size(self):
+        self.assertEqual(resumable_upload.align_chunk_size(1), 256 * 1024)
+        self.assertEqual(resumable_upload.align_chunk_size(600 * 1024), 512 * 1024)
+
+
+class TestExecuteResumable(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.checkpoint = resumable_upload.UploadCheckpoint(os.path.join(self.tmp_dir.name, "state.json"))
+        sleep = mock.patch.object(resumable_upload.time, "sleep")
+        self.sleep = sleep.start()
+        self.addCleanup(sleep.stop)
+
+    def test_progress_is_checkpointed_and_cleared_when_done(self):
+        saved = []
+        request = fake_request([SIZE // 2, None])
+        with mock.patch.object(self.checkpoint, "save", side_effect=lambda *args: saved.append(args)):
+            response = resumable_upload.execute_resumable(request, checkpoint=self.checkpoint, key=123)
+        self.assertEqual(response, {"id": "video1"})
+        self.assertEqual(saved, [(123, SESSION, SIZE // 2, SIZE)])
+        self.assertIsNone(self.checkpoint.load(123))
+
+    def test_resume_starts_at_the_offset_the_server_reports(self):
+        self.checkpoint.save(123, SESSION, 1024 * 1024, SIZE)
+        request = fake_request([None], server_reply=(http_response(308, range="bytes=0-2097151"), b""))
+        resumable_upload.execute_resumable(request, checkpoint=self.checkpoint, key=123)
+        uri, method = request.http.request.call_args.args
+        self.assertEqual((uri, method), (SESSION, "PUT"))
+        self.assertEqual(request.http.request.call_args.kwargs["headers"]["Content-Range"], f"bytes */{SIZE}")
+        self.assertEqual(request.resumable_progress, 2 * 1024 * 1024)
+
+    def test_resume_of_a_completed_upload(self):
+        self.checkpoint.save(123, SESSION, SIZE, SIZE)
+        request = fake_request([], server_reply=(http_response(200), b'{"id": "video1"}'))
+        response = resumable_upload.execute_resumable(request, checkpoint=self.checkpoint, key=123)
+        self.assertEqual(response, {"id": "video1"})
+        request.next_chunk.assert_not_called()
+        self.assertIsNone(self.checkpoint.load(123))
+
+    def test_expired_session_clears_the_checkpoint(self):
+        self.checkpoint.save(123, SESSION, 1024, SIZE)
+        request = fake_request([], server_reply=(http_response(410), b""))
+        with self.assertRaises(HttpError):
+            resumable_upload.execute_resumable(request, checkpoint=self.checkpoint, key=123)
+        self.assertIsNone(self.checkpoint.load(123))
+
+    def test_checkpoint_for_another_file_is_not_resumed(self):
+        self.checkpoint.save(123, SESSION, 1024, SIZE + 1)
+        request = fake_request([None])
+        resumable_upload.execute_resumable(request, checkpoint=self.checkpoint, key=123)
+        request.http.request.assert_not_called()
+
+    def test_transient_errors_are_retried(self):
+        request = fake_request([
+            ConnectionResetError("reset"),
+            HttpError(http_response(503), b"unavailable"),
+            SIZE // 2,
+            None,
+        ])
+        response = resumable_upload.execute_resumable(request, checkpoint=self.checkpoint, key=123)
+        self.assertEqual(response, {"id": "video1"})
+        self.assertEqual(self.sleep.call_count, 2)
+
+    def test_gives_up_after_max_retries(self):
+        request = fake_request([ConnectionResetError("reset")] * 3)
+        with self.assertRaises(ConnectionResetError):
+            resumable_upload.execute_resumable(request, max_retries=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import sys
+import pathlib
+import tempfile
+import unittest
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from modules import search_index
+from modules.vtt import Cue
+
+
+class TestSearchIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.conn = search_index.connect(db_file=os.path.join(self.tmp_dir.name, "search.db"))
+        search_index.index_meeting("111", [
+            Cue(1000, 4000, "Tim Beiko", "Let's start with EIP-7702 delegation."),
+            Cue(5000, 9000, "Ansgar", "Blob throughput looks fine on devnets."),
+        ], summary="The call covered EIP-7702 and blob throughput.", title="ACDE #200", conn=self.conn)
+        search_index.index_meeting("222", [
+            Cue(2000, 3000, "Alex", "More blobs please, blob count should go up."),
+        ], title="ACDC #150", occurrence_id="1700000000000", conn=self.conn)
+
+    def tearDown(self):
+        search_index.close()
+        self.tmp_dir.cleanup()
+
+    def test_search_ranks_hits(self):
+        hits = search_index.search("blob", conn=self.conn)
+        self.assertEqual(hits[0]["meeting_id"], "222")
+        self.assertEqual(hits[0]["occurrence_id"], "1700000000000")
+        self.assertEqual(hits[0]["start_ms"], 2000)
+        self.assertEqual({h["meeting_id"] for h in hits}, {"111", "222"})
+
+    def test_plain_text_fallback_and_filters(self):
+        hits = search_index.search("EIP-7702", speaker="Tim Beiko", conn=self.conn)
+        self.assertEqual([(h["meeting_id"], h["start_ms"], h["kind"]) for h in hits], [("111", 1000, "cue")])
+        hits = search_index.search("EIP-7702", meeting_id="111", conn=self.conn)
+        self.assertEqual({h["kind"] for h in hits}, {"cue", "summary"})
+        self.assertEqual(hits[0]["title"], "ACDE #200")
+
+    def test_reindex_replaces_documents(self):
+        self.assertTrue(search_index.is_indexed("111", conn=self.conn))
+        self.assertFalse(search_index.is_indexed("222", conn=self.conn))
+        search_index.index_meeting("111", [Cue(0, 1000, None, "Nothing about that")], conn=self.conn)
+        self.assertEqual(search_index.search("delegation", conn=self.conn), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
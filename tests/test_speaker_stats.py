@@ -0,0 +1,51 @@
+import sys
+import pathlib
+import unittest
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from modules import speaker_stats
+from modules.vtt import Cue, CueArray
+
+
+class TestSpeakerStats(unittest.TestCase):
+
+    def setUp(self):
+        self.stats = speaker_stats.compute({
+            "111": CueArray([
+                Cue(0, 10000, "Tim", "Welcome."),
+                Cue(10000, 15000, "Tim", "First item."),
+                Cue(14000, 20000, "Alex", "Quick question"),   # interrupts Tim
+                Cue(20000, 21000, None, "[inaudible]"),
+                Cue(21000, 30000, "Tim", "Sure."),
+            ]),
+            "222": CueArray([
+                Cue(0, 5000, "Alex", "Hi."),
+                Cue(5000, 8000, "Ansgar", "Hello."),
+            ]),
+        })
+
+    def test_meeting_report(self):
+        rows = {r["speaker"]: r for r in self.stats.meeting_report("111")}
+        self.assertEqual(set(rows), {"Tim", "Alex"})
+        self.assertEqual(rows["Tim"]["talk_ms"], 24000)
+        self.assertEqual(rows["Tim"]["turns"], 2)
+        self.assertEqual((rows["Alex"]["interruptions"], rows["Tim"]["interrupted"]), (1, 1))
+        self.assertEqual(rows["Tim"]["interruptions"], 0)
+        self.assertAlmostEqual(rows["Alex"]["interruption_rate"], 1.0)
+
+    def test_season_report(self):
+        rows = {r["speaker"]: r for r in self.stats.season_report()}
+        self.assertEqual(rows["Alex"]["talk_ms"], 11000)
+        self.assertEqual(rows["Alex"]["turns"], 2)
+        self.assertEqual(rows["Alex"]["meetings"], 2)
+        # Turns and interruptions never span two meetings
+        self.assertEqual(rows["Ansgar"]["interruptions"], 0)
+        self.assertIn("Ansgar", speaker_stats.format_report(self.stats.season_report()))
+
+
+if __name__ == "__main__":
+    unittest.main()
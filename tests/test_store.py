@@ -0,0 +1,104 @@
+import os
+import sys
+import json
+import pathlib
+import tempfile
+import unittest
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from modules import store
+
+LEGACY_MAPPING = {
+    "82852682318": {"discourse_topic_id": 22673, "youtube_video_id": "abc123"},
+    "85778393383": {"discourse_topic_id": 22728, "youtube_video_id": "None"},
+    "83575807058": {
+        "discourse_topic_id": 22767,
+        "issue_title": "ACDbot testing - Youtube fix",
+        "youtube_video_id": "73cTi9PcF9Q"
+    },
+    "81111111111": 22800,
+    "82222222222": "22801",
+}
+
+
+class TestStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_file = os.path.join(self.tmp_dir.name, "state.db")
+        self.mapping_file = os.path.join(self.tmp_dir.name, "mapping.json")
+        with open(self.mapping_file, "w") as f:
+            json.dump(LEGACY_MAPPING, f)
+        self.conn = store.connect(db_file=self.db_file, mapping_file=self.mapping_file)
+
+    def tearDown(self):
+        store.close()
+        self.tmp_dir.cleanup()
+
+    def test_legacy_import(self):
+        self.assertEqual(len(store.all_meetings(conn=self.conn)), 5)
+        self.assertEqual(store.get_meeting("81111111111", conn=self.conn)["discourse_topic_id"], 22800)
+        self.assertEqual(store.get_meeting("82222222222", conn=self.conn)["discourse_topic_id"], 22801)
+        self.assertIsNone(store.get_meeting("85778393383", conn=self.conn)["youtube_video_id"])
+        self.assertIsNone(store.get_meeting("99999999999", conn=self.conn))
+
+    def test_indexed_lookups(self):
+        store.upsert_meeting("83575807058", conn=self.conn, issue_number=1234, repo="ethereum/pm")
+        self.assertEqual(store.find_by_topic(22767, conn=self.conn)[0]["meeting_id"], "83575807058")
+        self.assertEqual(store.find_by_issue(1234, repo="ethereum/pm", conn=self.conn)[0]["meeting_id"], "83575807058")
+        self.assertEqual(store.find_by_issue(1234, repo="other/repo", conn=self.conn), [])
+        self.assertEqual(store.find_by_video("abc123", conn=self.conn)["meeting_id"], "82852682318")
+
+    def test_upsert_merges_fields(self):
+        store.upsert_meeting("82852682318", conn=self.conn, issue_title="ACDE #200", calendar_event_id="evt1")
+        store.upsert_meeting("82852682318", conn=self.conn, youtube_video_id="xyz")
+        entry = store.get_meeting("82852682318", conn=self.conn)
+        self.assertEqual(entry["discourse_topic_id"], 22673)
+        self.assertEqual(entry["issue_title"], "ACDE #200")
+        self.assertEqual(entry["calendar_event_id"], "evt1")
+        self.assertEqual(entry["youtube_video_id"], "xyz")
+
+    def test_transcript_post_index(self):
+        self.assertIsNone(store.get_transcript_post("82852682318", conn=self.conn))
+        store.record_transcript_post("82852682318", 22673, 555, "deadbeef", conn=self.conn)
+        self.assertEqual(
+            store.get_transcript_post("82852682318", conn=self.conn),
+            {"topic_id": 22673, "post_id": 555, "content_hash": "deadbeef"}
+        )
+        self.assertEqual(store.get_meeting("82852682318", conn=self.conn)["youtube_video_id"], "abc123")
+
+    def test_occurrences(self):
+        occurrences = [
+            {"occurrence_id": "2", "start_time": "2025-01-30T14:00:00Z", "duration": 90},
+            {"occurrence_id": "1", "start_time": "2025-01-16T14:00:00Z", "duration": 90},
+        ]
+        store.set_occurrences("82852682318", occurrences, conn=self.conn)
+        store.record_transcript_post("82852682318", 22673, 7, "hash", occurrence_id="1", conn=self.conn)
+        self.assertIsNone(store.get_transcript_post("82852682318", conn=self.conn))
+        self.assertEqual(store.get_transcript_post("82852682318", occurrence_id="1", conn=self.conn)["post_id"], 7)
+
+        # Rescheduling keeps what was recorded for the remaining occurrences
+        occurrences[1]["duration"] = 60
+        store.set_occurrences("82852682318", occurrences, conn=self.conn)
+        first = store.get_meeting("82852682318", conn=self.conn)["occurrences"][0]
+        self.assertEqual((first["occurrence_id"], first["duration"], first["transcript_post_id"]), ("1", 60, 7))
+
+    def test_export_round_trip(self):
+        store.upsert_meeting("80000000000", conn=self.conn, discourse_topic_id=1, calendar_event_id="evt")
+        store.export_json(self.mapping_file, conn=self.conn)
+        with open(self.mapping_file) as f:
+            snapshot = json.load(f)
+        self.assertEqual(snapshot["81111111111"], {"discourse_topic_id": 22800, "youtube_video_id": None})
+        self.assertEqual(snapshot["80000000000"]["calendar_event_id"], "evt")
+
+        other_db = os.path.join(self.tmp_dir.name, "other.db")
+        other = store.connect(db_file=other_db, mapping_file=self.mapping_file)
+        self.assertEqual(store.all_meetings(conn=other), store.all_meetings(conn=self.conn))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import sys
+import pathlib
+import unittest
+from unittest import mock
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from modules import telegram
+
+
+class FakeResponse:
+
+    def __init__(self, status_code, payload):
+        self.status_code = status_code
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class TestSplitMessage(unittest.TestCase):
+
+    def test_short_message_unchanged(self):
+        self.assertEqual(telegram.split_message("hello"), ["hello"])
+
+    def test_splits_on_paragraphs(self):
+        paragraphs = [f"Paragraph {i} " + "x" * 40 for i in range(10)]
+        parts = telegram.split_message("\n\n".join(paragraphs), limit=120)
+        self.assertTrue(all(len(part) <= 120 for part in parts))
+        self.assertEqual(parts[0], "\n\n".join(paragraphs[:2]))
+        self.assertEqual("\n\n".join(parts), "\n\n".join(paragraphs))
+
+    def test_oversized_paragraph_falls_back_to_words_then_characters(self):
+        text = "intro\n\n" + " ".join(["word"] * 50) + "\n\n" + "y" * 250
+        parts = telegram.split_message(text, limit=100)
+        self.assertTrue(all(len(part) <= 100 for part in parts))
+        self.assertTrue(parts[0].startswith("intro\n\nword word"))
+        self.assertTrue(all(part.startswith(("intro", "word")) for part in parts[:3]))
+        self.assertEqual("".join(parts[-3:]), "y" * 250)
+
+
+class TestSendQueue(unittest.TestCase):
+
+    def test_parts_sent_in_order_and_429_retried(self):
+        responses = [
+            FakeResponse(200, {"ok": True, "result": {"message_id": 1}}),
+            FakeResponse(429, {"ok": False, "parameters": {"retry_after": 0.01}}),
+            FakeResponse(200, {"ok": True, "result": {"message_id": 2}}),
+        ]
+        send_queue = telegram.SendQueue()
+        with mock.patch.object(telegram.http_client, "post", side_effect=responses) as post, \
+                mock.patch.object(telegram, "PER_CHAT_INTERVAL", 0.01):
+            future = send_queue.put("a" * 3000 + "\n\n" + "b" * 3000, chat_id="42", token="t")
+            self.assertEqual(future.result(timeout=5)["result"]["message_id"], 2)
+        self.assertEqual(send_queue.flush(timeout=1), 0)
+        texts = [call.kwargs["data"]["text"] for call in post.call_args_list]
+        self.assertEqual(texts, ["a" * 3000, "b" * 3000, "b" * 3000])
+
+    def test_pacer_spaces_messages_per_chat(self):
+        pacer = telegram.Pacer()
+        self.assertEqual(pacer.reserve("42"), 0)
+        self.assertAlmostEqual(pacer.reserve("42"), telegram.PER_CHAT_INTERVAL, places=2)
+        self.assertEqual(pacer.reserve("43"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
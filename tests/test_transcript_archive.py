@@ -0,0 +1,64 @@
+import sys
+import pathlib
+import tempfile
+import unittest
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from modules.transcript_archive import TranscriptArchive, ArchiveFormatError
+from modules.vtt import Cue
+
+
+def make_cues(n):
+    return [Cue(i * 1000, i * 1000 + 900, f"Speaker {i % 3}" if i % 5 else None, f"cue\tnumber {i}")
+            for i in range(n)]
+
+
+class TestTranscriptArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.archive = TranscriptArchive(self.tmp_dir.name, block_cues=16)
+        self.cues = make_cues(100)
+        self.assertEqual(self.archive.write("111", iter(self.cues)), 100)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_round_trip(self):
+        loaded = list(self.archive.iter_cues("111"))
+        self.assertEqual(len(loaded), 100)
+        self.assertEqual(loaded[7], Cue(7000, 7900, "Speaker 1", "cue number 7"))
+        self.assertIsNone(loaded[5].speaker)
+        self.assertEqual(len(self.archive.load("111")), 100)
+
+    def test_range_reads_only_overlapping_blocks(self):
+        with self.archive.open("111") as reader:
+            self.assertEqual(len(reader), 7)
+            self.assertEqual([c.start_ms for c in reader.range(15500, 18000)], [16000, 17000])
+            self.assertEqual(reader.range(200000, 300000), [])
+        self.assertEqual(len(self.archive.read_range("111", 0, 100000)), 100)
+
+    def test_occurrences_and_bad_files(self):
+        self.assertFalse(self.archive.has("111", "1700000000000"))
+        self.archive.write("111", self.cues[:3], occurrence_id="1700000000000")
+        self.assertEqual(len(self.archive.load("111", "1700000000000")), 3)
+        with open(self.archive.path("222"), "wb") as f:
+            f.write(b"not an archive at all")
+        with self.assertRaises(ArchiveFormatError):
+            self.archive.open("222")
+
+    def test_path_names_are_encoded(self):
+        # Recording UUIDs can contain "/" and must stay inside the archive
+        path = pathlib.Path(self.archive.path("/ab//c=="))
+        self.assertEqual(path.parent, pathlib.Path(self.tmp_dir.name))
+        self.assertNotEqual(self.archive.path("1_2"), self.archive.path("1", "2"))
+        self.archive.write("/ab//c==", self.cues[:2])
+        self.assertEqual(len(self.archive.load("/ab//c==")), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import sys
+import pathlib
+import unittest
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from modules import vtt
+
+SAMPLE = """WEBVTT
+
+1
+00:00:01.230 --> 00:00:04.560
+Tim Beiko: Good morning everyone,
+welcome to ACDE.
+
+2
+00:00:05.000 --> 00:00:07.250
+Danny Ryan: Thanks Tim.
+
+3
+01:02:03.004 --> 01:02:04.000
+No speaker on this one
+"""
+
+
+class TestVtt(unittest.TestCase):
+
+    def test_parse_cues(self):
+        cues = list(vtt.iter_cues(SAMPLE.splitlines()))
+        self.assertEqual(len(cues), 3)
+        self.assertEqual(cues[0], vtt.Cue(1230, 4560, "Tim Beiko", "Good morning everyone, welcome to ACDE."))
+        self.assertEqual(cues[1].speaker, "Danny Ryan")
+        self.assertEqual((cues[2].start_ms, cues[2].speaker), (3723004, None))
+
+    def test_stream_split_mid_character(self):
+        data = SAMPLE.replace("Thanks Tim.", "Merci Tim, à bientôt.").encode("utf-8")
+        # One byte at a time splits the multi-byte characters across chunks
+        chunks = (data[i:i + 1] for i in range(len(data)))
+        cues = vtt.load_cues(chunks)
+        self.assertEqual(len(cues), 3)
+        self.assertEqual(cues[1].text, "Merci Tim, à bientôt.")
+        self.assertEqual(cues.speakers, ["Tim Beiko", "Danny Ryan"])
+
+    def test_cue_array_between(self):
+        cues = vtt.CueArray(vtt.iter_cues(SAMPLE.splitlines()))
+        self.assertEqual([c.start_ms for c in cues.between(0, 5001)], [1230, 5000])
+        self.assertEqual(cues.between(10000, 20000), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import sys
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from modules import youtube_utils
+
+CHANNEL = "UC123"
+UPLOADS = "UU123"
+
+
+def video(video_id, published_at, live="none"):
+    return {
+        "id": video_id,
+        "snippet": {"channelId": CHANNEL, "publishedAt": published_at, "title": f"Video {video_id}",
+                    "liveBroadcastContent": live},
+    }
+
+
+class FakeYouTube:
+    """Just enough of the YouTube Data API client, counting calls per endpoint."""
+
+    def __init__(self, uploads, page_size=2):
+        self.uploads = uploads  # video resources, newest first
+        self.page_size = page_size
+        self.calls = {"channels": 0, "playlistItems": 0, "videos": []}
+
+    def _execute(self, result):
+        return mock.Mock(execute=mock.Mock(return_value=result))
+
+    def channels(self):
+        def list_(part, id):
+            self.calls["channels"] += 1
+            return self._execute({"items": [{"contentDetails": {"relatedPlaylists": {"uploads": UPLOADS}}}]})
+        return mock.Mock(list=list_)
+
+    def playlistItems(self):
+        def list_(part, playlistId, maxResults, pageToken=None):
+            self.calls["playlistItems"] += 1
+            start = int(pageToken or 0)
+            page = self.uploads[start:start + self.page_size]
+            result = {"items": [{"contentDetails": {"videoId": v["id"]}} for v in page]}
+            if start + self.page_size < len(self.uploads):
+                result["nextPageToken"] = str(start + self.page_size)
+            return self._execute(result)
+        return mock.Mock(list=list_)
+
+    def videos(self):
+        def list_(part, id, maxResults):
+            ids = id.split(",")
+            self.calls["videos"].append(ids)
+            return self._execute({"items": [v for v in self.uploads if v["id"] in ids]})
+        return mock.Mock(list=list_)
+
+
+class TestChannelVideos(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.cache = youtube_utils.VideoCache(os.path.join(self.tmp_dir.name, "videos.json"))
+        self.client = FakeYouTube([
+            video("v5", "2025-01-05T00:00:00Z", live="upcoming"),
+            video("v4", "2025-01-04T00:00:00Z", live="live"),
+            video("v3", "2025-01-03T00:00:00Z"),
+            video("v2", "2025-01-02T00:00:00Z"),
+            video("v1", "2025-01-01T00:00:00Z"),
+        ])
+        patch = mock.patch.object(youtube_utils, "get_client", return_value=self.client)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_first_listing_walks_the_uploads_playlist(self):
+        videos = youtube_utils.get_channel_videos(CHANNEL, cache=self.cache)
+        self.assertEqual([v["id"] for v in videos], ["v5", "v4", "v3", "v2", "v1"])
+        self.assertEqual(self.client.calls["playlistItems"], 3)
+        self.assertEqual(self.client.calls["videos"], [["v5", "v4", "v3", "v2", "v1"]])
+
+    def test_next_listing_stops_at_known_videos(self):
+        youtube_utils.get_channel_videos(CHANNEL, cache=self.cache)
+        self.client.uploads.insert(0, video("v6", "2025-01-06T00:00:00Z"))
+        self.client.calls = {"channels": 0, "playlistItems": 0, "videos": []}
+
+        # A fresh cache object reads what the first listing persisted
+        cache = youtube_utils.VideoCache(self.cache.cache_file)
+        videos = youtube_utils.get_channel_videos(CHANNEL, cache=cache)
+        self.assertEqual(videos[0]["id"], "v6")
+        self.assertEqual(len(videos), 6)
+        self.assertEqual(self.client.calls, {"channels": 0, "playlistItems": 2, "videos": [["v6"]]})
+
+    def test_live_streams_only_refresh_live_and_upcoming_videos(self):
+        live = youtube_utils.get_live_streams(CHANNEL, cache=self.cache)
+        self.assertEqual([v["id"] for v in live], ["v4"])
+        self.assertEqual(self.client.calls["videos"][-1], ["v5", "v4"])
+
+    def test_get_videos_batches_ids(self):
+        youtube_utils.get_videos([f"id{i}" for i in range(120)])
+        self.assertEqual([len(ids) for ids in self.client.calls["videos"]], [50, 50, 20])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import os
+import sys
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+from datetime import date, datetime, timedelta, timezone
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from modules import zoom
+
+
+class TestRecordingCache(unittest.TestCase):
+
+    def test_uuid_lookup_not_cached_under_meeting_id(self):
+        cache = zoom.RecordingCache()
+        older = {"id": 999, "uuid": "older/+uuid==", "share_url": "https://zoom.us/rec/older"}
+        cache.put("older/+uuid==", older)
+        # The meeting ID must still resolve through Zoom (latest occurrence)
+        self.assertIsNone(cache.get(999))
+        self.assertEqual(cache.get("older/+uuid=="), older)
+
+        latest = {"id": 999, "uuid": "latest==", "share_url": "https://zoom.us/rec/latest"}
+        cache.put(999, latest)
+        self.assertEqual(cache.get("999"), latest)
+        self.assertEqual(cache.get("latest=="), latest)
+        self.assertEqual(cache.get("older/+uuid=="), older)
+
+    def test_expiry_and_invalidate(self):
+        cache = zoom.RecordingCache(ttl=-1)
+        cache.put(1, {"id": 1, "uuid": "u1"})
+        self.assertIsNone(cache.get(1))
+        cache = zoom.RecordingCache()
+        cache.put(1, {"id": 1, "uuid": "u1"})
+        cache.invalidate("u1")
+        self.assertIsNone(cache.get(1))
+
+
+def token_response(token, expires_in=3600):
+    return mock.Mock(status_code=200, json=mock.Mock(return_value={"access_token": token, "expires_in": expires_in}))
+
+
+class TestZoomTokenProvider(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.cache_file = os.path.join(self.tmp_dir.name, "zoom_token.json")
+        self.now = 1_000_000.0
+        clock = mock.patch.object(zoom.time, "time", side_effect=lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+        post = mock.patch.object(zoom.http_client, "post",
+                                 side_effect=[token_response("t1"), token_response("t2"), token_response("t3")])
+        self.post = post.start()
+        self.addCleanup(post.stop)
+
+    def provider(self, **kwargs):
+        kwargs.setdefault("cache_file", self.cache_file)
+        return zoom.ZoomTokenProvider("account", "client", "secret", refresh_margin=300, **kwargs)
+
+    def test_token_is_reused_until_the_refresh_margin(self):
+        provider = self.provider()
+        self.assertEqual(provider.get_token(), "t1")
+        self.now += 3600 - 301
+        self.assertEqual(provider.get_token(), "t1")
+        self.assertEqual(self.post.call_count, 1)
+        self.now += 2
+        self.assertEqual(provider.get_token(), "t2")
+        self.assertEqual(self.post.call_count, 2)
+
+    def test_cache_file_is_shared_between_processes(self):
+        self.assertEqual(self.provider().get_token(), "t1")
+        self.assertEqual(self.provider().get_token(), "t1")
+        self.assertEqual(self.post.call_count, 1)
+        # A token issued for other credentials is never reused
+        other = zoom.ZoomTokenProvider("account", "other-client", "secret", cache_file=self.cache_file)
+        self.assertEqual(other.get_token(), "t2")
+
+    def test_invalidate_drops_the_cached_token(self):
+        provider = self.provider()
+        provider.get_token()
+        provider.invalidate()
+        self.assertFalse(os.path.exists(self.cache_file))
+        self.assertEqual(provider.get_token(), "t2")
+
+    def test_api_request_retries_once_after_401(self):
+        provider = self.provider(cache_file=None)
+        unauthorized, ok = mock.Mock(status_code=401), mock.Mock(status_code=200)
+        with mock.patch.object(zoom, "token_provider", provider), \
+                mock.patch.object(zoom.http_client, "request", side_effect=[unauthorized, ok]) as request:
+            self.assertIs(zoom.api_request("GET", "https://api.zoom.us/v2/users/me"), ok)
+        self.assertEqual([c.kwargs["headers"]["Authorization"] for c in request.call_args_list],
+                         ["Bearer t1", "Bearer t2"])
+
+        with mock.patch.object(zoom, "token_provider", provider), \
+                mock.patch.object(zoom.http_client, "request", return_value=unauthorized) as request:
+            self.assertIs(zoom.api_request("GET", "https://api.zoom.us/v2/users/me"), unauthorized)
+        self.assertEqual(request.call_count, 2)
+
+
+def recording(meeting_id, end_time):
+    return {"id": meeting_id, "end_time": end_time.strftime("%Y-%m-%dT%H:%M:%SZ"), "recording_files": []}
+
+
+class TestRecordingsListing(unittest.TestCase):
+
+    def test_pages_and_month_windows(self):
+        pages = {
+            ("2025-01-01", ""): {"meetings": [{"id": 1}], "next_page_token": "p2"},
+            ("2025-01-01", "p2"): {"meetings": [{"id": 2}], "next_page_token": ""},
+            ("2025-01-31", ""): {"meetings": [{"id": 3}]},
+        }
+        windows = []
+
+        def api_request(method, url, params):
+            windows.append((params["from"], params["to"]))
+            data = pages[(params["from"], params.get("next_page_token", ""))]
+            return mock.Mock(status_code=200, json=mock.Mock(return_value=data))
+
+        with mock.patch.object(zoom, "api_request", side_effect=api_request):
+            meetings = list(zoom.iter_recordings(date(2025, 1, 1), date(2025, 2, 10)))
+        self.assertEqual([m["id"] for m in meetings], [1, 2, 3])
+        # Zoom rejects ranges over a month: 30-day slices
+        self.assertEqual(windows, [("2025-01-01", "2025-01-30"), ("2025-01-01", "2025-01-30"),
+                                   ("2025-01-31", "2025-02-10")])
+
+    def test_new_recordings_overlap_the_high_water_mark(self):
+        high_water = datetime.now(timezone.utc) - timedelta(hours=1)
+        listed = [
+            recording(1, high_water - timedelta(hours=7)),  # Zoom lists by day: older ones come back too
+            recording(2, high_water - timedelta(hours=5)),  # within the overlap, listed late
+            recording(3, high_water + timedelta(minutes=30)),
+        ]
+        with mock.patch.object(zoom, "iter_recordings", return_value=iter(listed)) as iter_recordings:
+            new = list(zoom.iter_new_recordings(high_water, overlap=timedelta(hours=6)))
+        self.assertEqual([m["id"] for m in new], [2, 3])
+        self.assertEqual(iter_recordings.call_args.kwargs["from_date"], high_water - timedelta(hours=6))
+
+    def test_high_water_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            state_file = os.path.join(tmp_dir, "state.json")
+            self.assertIsNone(zoom.load_recordings_high_water(state_file))
+            end_time = datetime(2025, 1, 16, 15, 30, tzinfo=timezone.utc)
+            zoom.save_recordings_high_water(end_time, state_file)
+            self.assertEqual(zoom.load_recordings_high_water(state_file), end_time)
+
+
+if __name__ == "__main__":
+    unittest.main()